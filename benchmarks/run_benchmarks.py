@@ -0,0 +1,196 @@
+"""
+Client benchmarks against a local MockNebuIAServer; no NebuIA instance is needed.
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --quick --only search_fanout listing_decode
+
+Every benchmark starts its own mock server with a fixed profile and seed, and
+reports medians over `--repeat` runs. The JSON report (stdout, or --output) has a
+stable layout, `{"meta": {...}, "benchmarks": {name: {metric: value}}}`, so runs
+can be compared to track regressions.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# runnable as a plain script from a checkout, without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+from nebuia_copilot_python.integration import Integrator
+from nebuia_copilot_python.src.mock.server import MockNebuIAServer, MockProfile
+from nebuia_copilot_python.src.models import BatchType, File, SearchParameters, StatusDocument
+from nebuia_copilot_python.src.tracing import CallbackTracer
+
+SEED = 1234
+
+
+def _integrator(server: MockNebuIAServer) -> Integrator:
+    return Integrator(with_base=server.url, key="key", secret="secret")
+
+
+def _median(runs: List[Dict[str, Optional[float]]]) -> Dict[str, Optional[float]]:
+    medians = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        medians[key] = statistics.median(values) if values else None
+    return medians
+
+
+def bench_upload_throughput(quick: bool) -> Dict[str, float]:
+    files_count = 20 if quick else 100
+    profile = MockProfile(latency=0.01, seed=SEED)
+    with MockNebuIAServer(profile) as server:
+        integrator = _integrator(server)
+        files = [File(b"%PDF-1.4 " + b"x" * 50_000, "mock", f"file_{index}.pdf") for index in range(files_count)]
+
+        _, batch_id = integrator.create_batch("sequential", BatchType.EXECUTION)
+        started = time.perf_counter()
+        integrator.append_to_batch(batch_id, files)
+        sequential = time.perf_counter() - started
+
+        run = integrator.run_batch_pipeline("concurrent", files, upload_workers=8, poll_interval=0.05)
+        list(run)
+        return {
+            "files": files_count,
+            "sequential_files_per_second": files_count / sequential,
+            "concurrent_files_per_second": files_count / run.timings.upload,
+        }
+
+
+def bench_listing_decode(quick: bool) -> Dict[str, float]:
+    documents = 500 if quick else 2000
+    page_size = 100
+    with MockNebuIAServer(MockProfile(entities_per_document=30, seed=SEED)) as server:
+        server.seed_documents(documents, StatusDocument.COMPLETE)
+        integrator = _integrator(server)
+        spans = []
+        integrator.set_tracer(CallbackTracer(on_end=spans.append))
+        started = time.perf_counter()
+        for page in range(1, documents // page_size + 1):
+            integrator.get_documents_by_status(StatusDocument.COMPLETE, page=page, limit=page_size)
+        elapsed = time.perf_counter() - started
+        decode = sum(span.phases["decode"] for span in spans)
+        build = sum(span.phases["build"] for span in spans)
+        return {
+            "documents": documents,
+            "documents_per_second": documents / elapsed,
+            "decode_ms_per_page": decode / len(spans) * 1000,
+            "build_ms_per_page": build / len(spans) * 1000,
+            "response_kb_per_page": sum(span.response_bytes for span in spans) / len(spans) / 1024,
+        }
+
+
+def bench_listener_pickup(quick: bool) -> Dict[str, Optional[float]]:
+    samples = 5 if quick else 20
+    interval = 0.5
+    with MockNebuIAServer(MockProfile(latency=0.005, seed=SEED)) as server:
+        integrator = _integrator(server)
+        listener = integrator.listener
+        seeded_at: Dict[str, float] = {}
+        latencies: List[float] = []
+        received = threading.Event()
+
+        def on_document(status, doc):
+            if doc.uuid in seeded_at:
+                latencies.append(time.perf_counter() - seeded_at.pop(doc.uuid))
+                integrator.set_document_status(doc.uuid, StatusDocument.COMPLETE)
+                received.set()
+
+        listener.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=interval, limit_documents=10)
+        listener.set_on_document_handler(on_document)
+        listener.start()
+        try:
+            for _ in range(samples):
+                received.clear()
+                time.sleep(interval * (0.2 + 0.6 * len(latencies) / samples))
+                uuid = server.seed_documents(1, StatusDocument.WAITING_QA)[0]
+                seeded_at[uuid] = time.perf_counter()
+                received.wait(interval * 10)
+        finally:
+            listener.stop(timeout=5)
+        return {
+            "samples": len(latencies),
+            "missed": samples - len(latencies),
+            "interval_seconds": interval,
+            "pickup_p50_seconds": statistics.median(latencies) if latencies else None,
+            "pickup_max_seconds": max(latencies) if latencies else None,
+        }
+
+
+def bench_search_fanout(quick: bool) -> Dict[str, float]:
+    queries = 10
+    with MockNebuIAServer(MockProfile(latency=0.02, jitter=0.01, seed=SEED)) as server:
+        integrator = _integrator(server)
+        searches = [
+            SearchParameters(batch="brain", param=f"query {index}", k=5,
+                             type_search="semantic" if index % 2 else "literal")
+            for index in range(queries)
+        ]
+        started = time.perf_counter()
+        for search in searches:
+            integrator.search_in_brain(search)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        integrator.search_in_brain_many(searches, top_k=10)
+        concurrent = time.perf_counter() - started
+        return {
+            "queries": queries,
+            "sequential_seconds": sequential,
+            "concurrent_seconds": concurrent,
+            "speedup": sequential / concurrent,
+        }
+
+
+BENCHMARKS: Dict[str, Callable[[bool], Dict[str, float]]] = {
+    "upload_throughput": bench_upload_throughput,
+    "listing_decode": bench_listing_decode,
+    "listener_pickup": bench_listener_pickup,
+    "search_fanout": bench_search_fanout,
+}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; medians are reported")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, for smoke runs")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "quick": args.quick,
+        },
+        "benchmarks": {},
+    }
+    for name in args.only or BENCHMARKS:
+        print(f"running {name}...", file=sys.stderr)
+        report["benchmarks"][name] = _median([BENCHMARKS[name](args.quick) for _ in range(args.repeat)])
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,22 @@
 from nebuia_copilot_python.src.extractor.extractor import Extractor
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
 from loguru import logger
 
+from nebuia_copilot_python.src.bulk.bulk import BulkResult, BulkRunner
+from nebuia_copilot_python.src.export.exporter import BatchExporter, ExportState
+from nebuia_copilot_python.src.listener.claim import ClaimConfig
+from nebuia_copilot_python.src.logging_policy import LogPolicy, configure_logging
+from nebuia_copilot_python.src.stats import ClientStats
+from nebuia_copilot_python.src.tracing import MultiTracer, Tracer
+from nebuia_copilot_python.src.transport import Transport
 from nebuia_copilot_python.src.listener.listener_integrator import ListenerIntegrator
 from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.pipeline.pipeline import BatchPipeline, PipelineRun
+from nebuia_copilot_python.src.pipeline.waiter import BatchProgress, BatchWaiter
+from nebuia_copilot_python.src.search.cache import SearchCache
+from nebuia_copilot_python.src.search.searcher import DocumentHit, ScatterResults, Searcher
+from nebuia_copilot_python.src.sync.mirror import DocumentMirror
 from nebuia_copilot_python.src.models import BatchDocumentsResponse, BatchType, Document, DocumentType, EntityDocumentExtractor, EntityTextExtractor, File, Job, ResultsSearch, Search, SearchDocument, SearchParameters, StatusDocument, UploadResult
 
 
@@ -34,6 +46,9 @@ class Integrator:
 
         self.listener = self._create_listener_integrator(self._api_client)
         self._extractor = Extractor(self._api_client)
+        self._searcher = Searcher(self._api_client)
+        self._stats: Optional[ClientStats] = None
+        self._tracer: Optional[Tracer] = None
 
     def _create_listener_integrator(self, api_client: APIClient) -> ListenerIntegrator:
         """
@@ -41,6 +56,135 @@ class Integrator:
         """
         return ListenerIntegrator(api_client)
 
+    def configure_logging(self, level: Optional[str] = None, max_payload_chars: Optional[int] = None,
+                          sample_rate: Optional[float] = None, quiet: Optional[bool] = None) -> LogPolicy:
+        """
+        Adjusts how request and response payloads are logged by the client.
+
+        Payloads (search hits, status updates, upload and batch responses, documents received
+        by the default listener handler) are logged lazily at DEBUG by default, cut to
+        512 characters. Only the arguments given are changed; the policy is process-wide.
+
+        Args:
+            level (Optional[str], optional): Loguru level for payload logs, e.g. "INFO".
+            max_payload_chars (Optional[int], optional): Cap on logged payload text; 0 disables it.
+            sample_rate (Optional[float], optional): Fraction of payloads logged, between 0 and 1.
+            quiet (Optional[bool], optional): Drop payload logs entirely.
+
+        Returns:
+            LogPolicy: The updated policy.
+
+        Example:
+            >>> integrator.configure_logging(level="INFO", sample_rate=0.01)
+        """
+        return configure_logging(level=level, max_payload_chars=max_payload_chars, sample_rate=sample_rate,
+                                 quiet=quiet)
+
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Attaches a tracer to the API client, or detaches it with None.
+
+        Every API call then produces a Span with the endpoint, HTTP status, request and
+        response sizes, and the time spent sending, waiting for the server, downloading,
+        decoding JSON and building the result. To tell waiting from downloading, traced
+        calls read the whole response body before returning. Spans also feed `stats()`
+        when it is enabled, whether or not a tracer is attached.
+
+        Args:
+            tracer (Optional[Tracer]): A Tracer, e.g. `CallbackTracer(on_end=print)` or
+                `OpenTelemetryTracer(trace.get_tracer("nebuia"))`. None detaches it.
+
+        Example:
+            >>> spans = []
+            >>> integrator.set_tracer(CallbackTracer(on_end=spans.append))
+            >>> integrator.get_documents_by_status(StatusDocument.COMPLETE)
+            >>> print(spans[0].name, spans[0].status_code, spans[0].phases)
+        """
+        self._tracer = tracer
+        self._attach_tracers()
+
+    def enable_stats(self) -> ClientStats:
+        """
+        Starts collecting the statistics returned by `stats()`.
+
+        Statistics are built from the same spans as `set_tracer`, so while they are enabled
+        every API call takes the traced path: responses are requested with `stream=True`
+        and their body is read up front, which adds a small cost per call. They are off by
+        default for that reason. Calling it again keeps the collected statistics.
+
+        Returns:
+            ClientStats: The statistics collector.
+        """
+        if self._stats is None:
+            self._stats = ClientStats()
+            self._attach_tracers()
+        return self._stats
+
+    def disable_stats(self):
+        """
+        Stops collecting statistics and drops the collected ones.
+        """
+        self._stats = None
+        self._attach_tracers()
+
+    def _attach_tracers(self):
+        tracers = [tracer for tracer in (self._stats, self._tracer) if tracer is not None]
+        self._api_client.set_tracer(MultiTracer(tracers) if len(tracers) > 1 else next(iter(tracers), None))
+
+    def stats(self, reset: bool = False) -> Dict[str, dict]:
+        """
+        Returns in-process statistics of every API client method called since `enable_stats()`.
+
+        For each method: calls, errors (exceptions and HTTP statuses >= 400), retries,
+        bytes sent and received, latency (count, mean, min, max, p50, p95, p99 in seconds,
+        from an HDR-style histogram within ~1.6%), and total seconds per phase.
+
+        Args:
+            reset (bool, optional): Restart every counter from zero after taking the snapshot.
+                Defaults to False.
+
+        Returns:
+            Dict[str, dict]: Statistics keyed by method name, e.g. "get_documents_by_status".
+                Empty while statistics are disabled.
+
+        Example:
+            >>> integrator.enable_stats()
+            >>> stats = integrator.stats()
+            >>> print(stats["search_in_brain"]["latency"]["p99"], stats["search_in_brain"]["errors"])
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.snapshot(reset=reset)
+
+    def reset_stats(self):
+        """
+        Restarts every API client statistic from zero.
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def set_transport(self, transport: Optional[Transport]):
+        """
+        Replaces the transport that sends the API client's HTTP requests, or restores the default one with None.
+
+        A RecordingTransport captures real traffic (payload sizes, entity counts, latencies)
+        to a cassette file. A ReplayTransport then serves that traffic without any network,
+        with the original latencies or scaled ones, so decoding, listeners and pipelines can
+        be profiled deterministically against realistic data.
+
+        Args:
+            transport (Optional[Transport]): e.g. `RecordingTransport("traffic.jsonl.gz")` or
+                `ReplayTransport("traffic.jsonl.gz", time_scale=0)`. None restores plain requests.
+
+        Example:
+            >>> with RecordingTransport("traffic.jsonl.gz") as recorder:
+            ...     integrator.set_transport(recorder)
+            ...     integrator.get_documents_by_status(StatusDocument.COMPLETE, limit=100)
+            >>> integrator.set_transport(ReplayTransport("traffic.jsonl.gz", time_scale=0.5))
+            >>> integrator.get_documents_by_status(StatusDocument.COMPLETE, limit=100)
+        """
+        self._api_client.set_transport(transport)
+
     def create_batch(self, name_batch: str, batch_type: BatchType):
         """
         Creates a new batch using the provided name and type, and returns the result.
@@ -101,6 +245,75 @@ class Integrator:
         response = self._api_client.append_job(job, batch_id)
         return response
 
+    def run_batch_pipeline(self, name_batch: str, files: List[File], batch_type: BatchType = BatchType.EXECUTION,
+                           upload_workers: int = 4, poll_interval: float = 2.0,
+                           timeout: Optional[float] = None) -> PipelineRun:
+        """
+        Creates a batch, uploads the files, triggers processing and streams back the results.
+
+        Uploads run concurrently and processing is triggered as soon as the last one returns.
+        Iterating over the returned run executes it and yields each document as soon as it
+        reaches COMPLETE/QA_COMPLETE or an error status, so the first results arrive long
+        before the whole batch is done.
+
+        Args:
+            name_batch (str): The name of the batch to be created.
+            files (List[File]): The files to upload.
+            batch_type (BatchType, optional): The type of the batch. Defaults to EXECUTION.
+            upload_workers (int, optional): Concurrent uploads. Defaults to 4.
+            poll_interval (float, optional): Seconds between checks of the batch. Defaults to 2.
+            timeout (Optional[float], optional): Maximum seconds to wait for documents once
+                processing was triggered. Defaults to None (wait for every document).
+
+        Returns:
+            PipelineRun: Iterable of finished documents. After iteration it also holds the
+                batch id, the upload results and per-stage timings.
+
+        Raises:
+            RuntimeError: If the batch cannot be created or processing cannot be triggered.
+
+        Example:
+            >>> run = integrator.run_batch_pipeline("name_batch", files)
+            >>> for document in run:
+            ...     print(document.file_name, document.status_document)
+            >>> print(run.timings.first_result, run.timings.total)
+        """
+        pipeline = BatchPipeline(self._api_client, upload_workers=upload_workers, poll_interval=poll_interval)
+        return pipeline.run(name_batch, files, batch_type=batch_type, timeout=timeout)
+
+    def wait_for_batch(self, batch_id: str, terminal_statuses: Optional[Sequence[StatusDocument]] = None,
+                       timeout: Optional[float] = None,
+                       on_progress: Optional[Callable[[BatchProgress], None]] = None) -> BatchProgress:
+        """
+        Waits until every document of a batch is in one of the terminal statuses.
+
+        Each check first issues concurrent `limit=1` listing queries, used only for their
+        totals; the batch is read (concurrently, page by page) only when one of those totals
+        moved. Checks speed up while documents are finishing and back off while nothing changes.
+
+        Args:
+            batch_id (str): The ID of the batch to wait for.
+            terminal_statuses (Optional[Sequence[StatusDocument]], optional): Statuses considered
+                done. Defaults to COMPLETE, QA_COMPLETE and the error statuses.
+            timeout (Optional[float], optional): Maximum seconds to wait. Defaults to None (no limit).
+            on_progress (Optional[Callable[[BatchProgress], None]], optional): Called with the
+                current progress every time the batch is read.
+
+        Returns:
+            BatchProgress: Document counts per status when the wait ended, with `done`
+                or `timed_out` set accordingly.
+
+        Raises:
+            requests.RequestException: If a listing request fails.
+
+        Example:
+            >>> progress = integrator.wait_for_batch(batch_id, timeout=600,
+            ...                                      on_progress=lambda p: print(f"{p.finished}/{p.total}"))
+            >>> print(progress.done, progress.counts)
+        """
+        waiter = BatchWaiter(self._api_client)
+        return waiter.wait(batch_id, terminal_statuses=terminal_statuses, timeout=timeout, on_progress=on_progress)
+
     def get_document_types(self) -> List[DocumentType]:
         """
         Retrieve all document types available for the current user.
@@ -180,6 +393,79 @@ class Integrator:
         """
         return self._api_client.get_documents_by_batch(batch_id)
 
+    def export_batch_to_jsonl(self, batch_id: str, path: str, compress: Optional[bool] = None,
+                              resume: bool = True, page_size: int = 100) -> ExportState:
+        """
+        Streams every document of a batch, with its entities, to a JSONL file.
+
+        Pages are prefetched in the background and written as they arrive, so memory use does
+        not grow with the batch. An interrupted export to the same path resumes where it stopped.
+
+        Args:
+            batch_id (str): The ID of the batch to export.
+            path (str): The output file. Gzip compressed if it ends with ".gz".
+            compress (Optional[bool], optional): Force or disable gzip compression. Defaults to None.
+            resume (bool, optional): Resume an interrupted export. Defaults to True.
+            page_size (int, optional): Documents per request. Defaults to 100.
+
+        Returns:
+            ExportState: Number of documents written and pages read.
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched. The export can then be resumed.
+
+        Example:
+            >>> state = integrator.export_batch_to_jsonl("66a5271a7a97c83cece5dd0d", "batch.jsonl.gz")
+            >>> print(state.documents)
+        """
+        exporter = BatchExporter(self._api_client, page_size=page_size)
+        return exporter.to_jsonl(batch_id, path, compress=compress, resume=resume)
+
+    def export_batch_to_parquet(self, batch_id: str, directory: str, compression: str = "zstd",
+                                resume: bool = True, page_size: int = 100) -> ExportState:
+        """
+        Streams every document of a batch, with its entities, to a compressed Parquet dataset.
+
+        Requires the optional pyarrow dependency (`pip install nebuia_copilot_python[parquet]`).
+
+        Args:
+            batch_id (str): The ID of the batch to export.
+            directory (str): The output directory, holding one or more part files.
+            compression (str, optional): Parquet compression codec. Defaults to "zstd".
+            resume (bool, optional): Resume an interrupted export. Defaults to True.
+            page_size (int, optional): Documents per request and per row group. Defaults to 100.
+
+        Returns:
+            ExportState: Number of documents written and part files created.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            requests.RequestException: If a page cannot be fetched. The export can then be resumed.
+        """
+        exporter = BatchExporter(self._api_client, page_size=page_size)
+        return exporter.to_parquet(batch_id, directory, compression=compression, resume=resume)
+
+    def create_mirror(self, path: str, page_size: int = 100) -> DocumentMirror:
+        """
+        Opens (or creates) a local SQLite mirror of documents and entities.
+
+        Call `sync()` on the mirror to bring it up to date; queries by status, batch, type
+        or entity are then answered locally without any API request.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            page_size (int, optional): Documents per listing request while syncing. Defaults to 100.
+
+        Returns:
+            DocumentMirror: The mirror.
+
+        Example:
+            >>> mirror = integrator.create_mirror("documents.db")
+            >>> mirror.sync([StatusDocument.COMPLETE])
+            >>> mirror.count(status=StatusDocument.COMPLETE, batch_id="66a5271a7a97c83cece5dd0d")
+        """
+        return DocumentMirror(self._api_client, path, page_size=page_size)
+
     def delete_document(self, uuid: str) -> bool:
         """
         Deletes a document from a batch using its unique identifier (UUID).
@@ -230,6 +516,47 @@ class Integrator:
         """
         return self._api_client.clear_document_by_uuid(uuid=uuid)
 
+    def delete_documents(self, uuids: Iterable[str], max_workers: int = 8, rate: Optional[float] = 20.0,
+                         max_retries: int = 3) -> BulkResult:
+        """
+        Deletes many documents, concurrently and rate limited.
+
+        Args:
+            uuids (Iterable[str]): UUIDs of the documents to delete. Duplicates are deleted once.
+            max_workers (int, optional): Concurrent requests. Defaults to 8.
+            rate (Optional[float], optional): Maximum requests per second, retries included.
+                None disables rate limiting. Defaults to 20.
+            max_retries (int, optional): Retries per document after a transient error
+                (connection error, timeout, 429/5xx). Defaults to 3.
+
+        Returns:
+            BulkResult: One outcome per document, with the number of attempts and the last error.
+
+        Example:
+            >>> result = integrator.delete_documents(uuids)
+            >>> print(len(result.succeeded), result.failed)
+        """
+        runner = BulkRunner(max_workers=max_workers, rate=rate, max_retries=max_retries)
+        return runner.run(lambda uuid: self._api_client.delete_document_from_batch(uuid, raise_for_status=True), uuids)
+
+    def clear_documents(self, uuids: Iterable[str], max_workers: int = 8, rate: Optional[float] = 20.0,
+                        max_retries: int = 3) -> BulkResult:
+        """
+        Clears many documents, concurrently and rate limited.
+
+        Args:
+            uuids (Iterable[str]): UUIDs of the documents to clear. Duplicates are cleared once.
+            max_workers (int, optional): Concurrent requests. Defaults to 8.
+            rate (Optional[float], optional): Maximum requests per second, retries included.
+                None disables rate limiting. Defaults to 20.
+            max_retries (int, optional): Retries per document after a transient error. Defaults to 3.
+
+        Returns:
+            BulkResult: One outcome per document, with the number of attempts and the last error.
+        """
+        runner = BulkRunner(max_workers=max_workers, rate=rate, max_retries=max_retries)
+        return runner.run(lambda uuid: self._api_client.clear_document_by_uuid(uuid, raise_for_status=True), uuids)
+
     def get_documents_by_status_and_batch(self, status: StatusDocument, batchType: BatchType, page: int = 1, limit: int = 10) -> BatchDocumentsResponse:
         return self._api_client.get_documents_by_status_and_batch(status=status, batch_type=batchType, page=page, limit=limit)
 
@@ -293,8 +620,113 @@ class Integrator:
             APIException: If there is an error during the search operation, such as
                 network issues, invalid parameters, or service unavailability.
         """
+        if self._searcher.cache is not None:
+            # same shapes as APIClient.search_in_brain: a list of results, or an empty ResultsSearch
+            return self._searcher.search_brain(search_params) or ResultsSearch(results=[])
         return self._api_client.search_in_brain(search_params=search_params)
 
+    def enable_search_cache(self, max_entries: int = 1024, ttl: Optional[float] = 300.0) -> SearchCache:
+        """
+        Caches the results of `search_in_brain`, `search_in_document` and the fan-out searches built on them.
+
+        Queries are normalized (case, accents and whitespace) before lookup, and a request for
+        k results is answered from a cached request for more. Entries are evicted least
+        recently used first and expire after `ttl` seconds.
+
+        Args:
+            max_entries (int, optional): Maximum cached searches. Defaults to 1024.
+            ttl (Optional[float], optional): Seconds a cached search stays valid; None never
+                expires them. Defaults to 300.
+
+        Returns:
+            SearchCache: The cache, e.g. to read its `hits`/`misses` or `clear()` it.
+        """
+        self._searcher.cache = SearchCache(max_entries=max_entries, ttl=ttl)
+        return self._searcher.cache
+
+    def disable_search_cache(self):
+        """
+        Stops caching search results and drops the cached ones.
+        """
+        self._searcher.cache = None
+
+    def search_in_brain_many(self, search_params: List[SearchParameters], top_k: Optional[int] = None) -> ResultsSearch:
+        """
+        Runs several brain searches concurrently and merges their results.
+
+        The searches may use different `param`, `k` and `type_search` values. Results
+        found by more than one search are kept once per (uuid, source), with the highest
+        score, so the total latency is close to that of the slowest search.
+
+        Args:
+            search_params (List[SearchParameters]): The searches to run.
+            top_k (Optional[int], optional): Keep only the k best results across all
+                searches. Defaults to None (keep every result).
+
+        Returns:
+            ResultsSearch: The merged results, by decreasing score.
+
+        Raises:
+            requests.exceptions.RequestException: If any of the searches fails.
+
+        Example:
+            >>> results = integrator.search_in_brain_many([
+            ...     SearchParameters(batch=brain_id, param="fecha de pago", k=5, type_search="semantic"),
+            ...     SearchParameters(batch=brain_id, param="vencimiento", k=5, type_search="literal"),
+            ... ], top_k=8)
+        """
+        return self._searcher.search_brain_many(search_params, top_k=top_k)
+
+    def search_in_brain_hybrid(self, search_params: SearchParameters, method: str = "rrf",
+                               semantic_weight: float = 0.5, top_k: Optional[int] = None) -> ResultsSearch:
+        """
+        Runs a semantic and a literal search concurrently and fuses them into one ranking.
+
+        With `method="rrf"` (reciprocal-rank fusion) only the positions in each list matter.
+        With `method="weighted"` the semantic `score` and the literal `coincidences` are
+        min-max normalized and summed with weights `semantic_weight` and `1 - semantic_weight`.
+
+        Args:
+            search_params (SearchParameters): The search; its `type_search` is ignored.
+            method (str, optional): "rrf" or "weighted". Defaults to "rrf".
+            semantic_weight (float, optional): Weight of the semantic results. Defaults to 0.5.
+            top_k (Optional[int], optional): Results to keep. Defaults to `search_params.k`.
+
+        Returns:
+            ResultsSearch: The fused results; `score` holds the fused score.
+
+        Raises:
+            ValueError: If `method` is unknown; raised before any search is sent.
+            requests.exceptions.RequestException: If either search fails.
+        """
+        return self._searcher.search_brain_hybrid(search_params, method=method, semantic_weight=semantic_weight,
+                                                  top_k=top_k)
+
+    def search_in_brains(self, search_params: SearchParameters, brains: List[str], top_k: Optional[int] = None,
+                         deadline: Optional[float] = None) -> ScatterResults:
+        """
+        Runs the same search against several brains concurrently and merges the results.
+
+        Args:
+            search_params (SearchParameters): The search; its `batch` is replaced by each brain id.
+            brains (List[str]): The brain ids to search.
+            top_k (Optional[int], optional): Results kept across all brains. Defaults to `search_params.k`.
+            deadline (Optional[float], optional): Seconds each brain has to answer, counted from when
+                its search starts; slower or failing brains are left out of the results. Defaults
+                to None (wait for every brain).
+
+        Returns:
+            ScatterResults: The best results with the brain each one came from, and the
+                brains that failed or missed the deadline.
+
+        Example:
+            >>> template = SearchParameters(batch="", param="monto total", k=5, type_search="semantic")
+            >>> found = integrator.search_in_brains(template, ["brain_a", "brain_b"], deadline=2.0)
+            >>> for hit in found.hits:
+            ...     print(hit.brain, hit.result.score, hit.result.content[:40])
+        """
+        return self._searcher.search_brains(search_params, brains, top_k=top_k, deadline=deadline)
+
     def process_document_in_batch(self, batch_id: str):
         """
         Processes an item within a specified batch.
@@ -315,7 +747,9 @@ class Integrator:
         """
         return self._api_client.process_item(batch_id=batch_id)
 
-    def add_listener(self, status: StatusDocument, batchType: BatchType,  interval: int, limit_documents: int):
+    def add_listener(self, status: StatusDocument, batchType: BatchType,  interval: int, limit_documents: int,
+                     drain: bool = False, max_pages: Optional[int] = None, cycle_budget: Optional[float] = None,
+                     claim: Optional[ClaimConfig] = None, detect_changes: bool = False):
         """
         Add a new listener to the listener manager.
 
@@ -327,6 +761,16 @@ class Integrator:
             batchType (BatchType): The type of batches to get
             interval (int): The time interval (in seconds) between each fetch operation.
             limit_documents (int): The maximum number of documents to fetch in each operation.
+            drain (bool, optional): If True, each poll cycle follows pagination until the
+                backlog is consumed instead of fetching only the first page. Defaults to False.
+            max_pages (Optional[int], optional): Maximum pages fetched per cycle in drain mode.
+            cycle_budget (Optional[float], optional): Maximum seconds spent per cycle in drain mode.
+            claim (Optional[ClaimConfig], optional): Enables claim/lease mode. Each document is
+                moved to `claim.claim_status` before dispatch, so several workers can share the
+                queue without handling the same document twice. Defaults to None.
+            detect_changes (bool, optional): If True, only documents whose status, review date or
+                entities changed since they were last handled are dispatched, and each of them also
+                emits `on_document_changed(status, doc, changed_entities)`. Defaults to False.
 
         Returns:
             Listener: The newly created and started Listener instance.
@@ -358,7 +802,9 @@ class Integrator:
         the results in a loop, printing the file names of received documents. The loop can
         be interrupted with a KeyboardInterrupt, which will stop the listener.
         """
-        return self.listener.add_listener(status=status, batch_type=batchType, interval=interval, limit_documents=limit_documents)
+        return self.listener.add_listener(status=status, batch_type=batchType, interval=interval, limit_documents=limit_documents,
+                                          drain=drain, max_pages=max_pages, cycle_budget=cycle_budget, claim=claim,
+                                          detect_changes=detect_changes)
 
     def set_document_status(self, uuid: str, status: StatusDocument) -> bool:
         """
@@ -383,6 +829,31 @@ class Integrator:
         """
         return self._api_client.set_document_status(uuid=uuid, status=status)
 
+    def set_documents_status(self, uuids: Iterable[str], status: StatusDocument, max_workers: int = 8,
+                             rate: Optional[float] = 20.0, max_retries: int = 3) -> BulkResult:
+        """
+        Sets the same status on many documents, concurrently and rate limited.
+
+        Args:
+            uuids (Iterable[str]): UUIDs of the documents to update. Duplicates are updated once.
+            status (StatusDocument): The new status.
+            max_workers (int, optional): Concurrent requests. Defaults to 8.
+            rate (Optional[float], optional): Maximum requests per second, retries included.
+                None disables rate limiting. Defaults to 20.
+            max_retries (int, optional): Retries per document after a transient error. Defaults to 3.
+
+        Returns:
+            BulkResult: One outcome per document, with the number of attempts and the last error.
+
+        Example:
+            >>> failed = integrator.get_documents_by_status(StatusDocument.ERROR_OCR, limit=500)
+            >>> result = integrator.set_documents_status((doc.uuid for doc in failed.documents),
+            ...                                          StatusDocument.WAITING_PROCESS)
+        """
+        runner = BulkRunner(max_workers=max_workers, rate=rate, max_retries=max_retries)
+        return runner.run(lambda uuid: self._api_client.set_document_status(uuid=uuid, status=status, raise_for_status=True),
+                          uuids)
+
     def extract_entities_from_text(self, extractor: EntityTextExtractor):
         """
         Extracts specified entities from the given text using the provided EntityTextExtractor.
@@ -527,4 +998,54 @@ class Integrator:
             >>> for hit in results.hits[:3]:
             ...     print(f"- {hit.content[:50]}...")
         """
-        return self._api_client.search_in_document(search)
+        return self._searcher.search_document(search)
+
+    def search_in_documents(self, matches: str, uuids: Optional[Iterable[str]] = None, batch_id: Optional[str] = None,
+                            max_results: Optional[int] = None, per_document: int = 10, top_k: Optional[int] = None,
+                            on_partial: Optional[Callable[[str, List[DocumentHit]], None]] = None) -> List[DocumentHit]:
+        """
+        Searches many documents concurrently and returns the best hits across all of them.
+
+        Either `uuids` or `batch_id` must be given. With `batch_id`, the batch is listed page
+        by page while the searches run, so stopping early also saves the remaining listings.
+        Hits are ranked by the number of highlighted terms, then by their rank in their
+        own document.
+
+        Args:
+            matches (str): The text to search for.
+            uuids (Optional[Iterable[str]], optional): Documents to search.
+            batch_id (Optional[str], optional): Search every document of this batch instead.
+            max_results (Optional[int], optional): Stop as soon as this many hits were found.
+                Defaults to None (search every document).
+            per_document (int, optional): Maximum hits per document. Defaults to 10.
+            top_k (Optional[int], optional): Hits returned. Defaults to `max_results`.
+            on_partial (Optional[Callable[[str, List[DocumentHit]], None]], optional): Called with
+                each document's hits as soon as its search completes.
+
+        Returns:
+            List[DocumentHit]: The best hits, by decreasing relevance, with their document uuid.
+
+        Raises:
+            ValueError: If neither `uuids` nor `batch_id` is given, or `max_results` or `top_k` is negative.
+
+        Example:
+            >>> hits = integrator.search_in_documents("clausula de rescision", batch_id=batch_id, max_results=20)
+            >>> for hit in hits:
+            ...     print(hit.uuid, hit.relevance, hit.hit._formatted.content)
+        """
+        if uuids is None:
+            if batch_id is None:
+                raise ValueError("either uuids or batch_id is required")
+            uuids = self._batch_uuids(batch_id)
+        return self._searcher.search_documents(matches, uuids, max_results=max_results, per_document=per_document,
+                                               top_k=top_k, on_partial=on_partial)
+
+    def _batch_uuids(self, batch_id: str, page_size: int = 100):
+        page = 1
+        while True:
+            documents = self._api_client.get_documents_by_batch(batch_id, page=page, limit=page_size)
+            for doc in documents.documents:
+                yield doc.uuid
+            if not documents.documents or page * page_size >= documents.total:
+                return
+            page += 1
@@ -1,14 +1,17 @@
 import json
 import time
-from typing import ChainMap, Dict, List
+from typing import ChainMap, Dict, List, Optional
 import requests
 from loguru import logger
+from nebuia_copilot_python.src.logging_policy import log_payload
 from nebuia_copilot_python.src.models import BatchDocumentsResponse, BatchType, Document, DocumentType, Entity, EntityDocumentExtractor, EntityTextExtractor, File, Formatted, Hit, Job, Meta, Response, Result, ResultsSearch, Search, SearchDocument, SearchParameters, StatusDocument, UploadResult
+from nebuia_copilot_python.src.tracing import TimedBody, Tracer, current_span, traced
+from nebuia_copilot_python.src.transport import Transport, body_size
 from requests_toolbelt import MultipartEncoder
 
 
 class APIClient:
-    def __init__(self, key: str, secret: str, base: str):
+    def __init__(self, key: str, secret: str, base: str, transport: Optional[Transport] = None):
         self.key = key
         self.secret = secret
         self.base_url = base
@@ -16,7 +19,109 @@ class APIClient:
             "key": self.key,
             "secret": self.secret
         }
+        self.tracer: Optional[Tracer] = None
+        self.transport = transport or Transport()
 
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Attaches a tracer that receives one Span per API call, or detaches it with None.
+        """
+        self.tracer = tracer
+
+    def set_transport(self, transport: Optional[Transport]):
+        """
+        Replaces the transport sending the HTTP requests, or restores the default one with None.
+        """
+        self.transport = transport or Transport()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends every HTTP request of the client. When a call is being traced, the response
+        body is read here so that server time and download time can be told apart.
+        """
+        span = current_span() if self.tracer is not None else None
+        if span is None:
+            return self.transport.request(method, url, **kwargs)
+
+        body = kwargs.get("data")
+        if hasattr(body, "read"):
+            body = kwargs["data"] = TimedBody(body)
+        started = time.perf_counter()
+        span.method = method
+        span.url = url
+        span.requests += 1
+        try:
+            response = self.transport.request(method, url, stream=True, **kwargs)
+        except Exception:
+            span.add_phase("wait", time.perf_counter() - started)
+            raise
+        headers_at = time.perf_counter()
+        content = response.content
+        done = time.perf_counter()
+
+        sent_at = getattr(body, "finished_at", None) or started
+        span.add_phase("send", sent_at - started)
+        span.add_phase("wait", headers_at - sent_at)
+        span.add_phase("download", done - headers_at)
+        span.status_code = response.status_code
+        span.request_bytes += body_size(response.request.body)
+        span.response_bytes += len(content)
+        return response
+
+    def _json(self, response: requests.Response):
+        span = current_span() if self.tracer is not None else None
+        if span is None:
+            return response.json()
+        started = time.perf_counter()
+        try:
+            return response.json()
+        finally:
+            span.add_phase("decode", time.perf_counter() - started)
+
+    @staticmethod
+    def parse_document(doc_data: dict) -> Document:
+        """
+        Builds a Document from its JSON representation as returned by the listing endpoints.
+
+        Args:
+            doc_data (dict): The document as decoded from the API response.
+
+        Returns:
+            Document: The parsed document. Entities without a value get 'no_encontrado'.
+
+        Raises:
+            KeyError: If a required field is missing.
+        """
+        entities = None
+
+        if 'entities' in doc_data:
+            entities = [
+                Entity(
+                    id=entity['id'],
+                    key=entity['key'],
+                    value=entity['value'] if "value" in entity else 'no_encontrado',
+                    page=entity['page'],
+                    id_core=entity['id_core'],
+                    is_valid=entity['is_valid']
+                ) for entity in doc_data['entities']
+            ]
+
+        return Document(
+            id=doc_data['id'],
+            batch_id=doc_data['batch_id'],
+            user=doc_data['user'],
+            uuid=doc_data['uuid'],
+            url=doc_data['url'],
+            file_name=doc_data['file_name'],
+            type_document=doc_data['type_document'],
+            status_document=doc_data['status_document'],
+            uploaded=doc_data['uploaded'],
+            reviewed_at=doc_data['reviewed_at'],
+            source_type=doc_data['source_type'],
+            entities=entities
+        )
+
+    @traced
     def extractor_from_text(self, data: EntityTextExtractor):
         """
         Extracts information from text using an external API.
@@ -42,10 +147,11 @@ class APIClient:
         url = f"{self.base_url}/integrator/extractor/from/text"
         payload = json.dumps(data.__dict__)
 
-        response = requests.post(url, headers=self.headers, data=payload)
-        data = response.json()
+        response = self._request("POST", url, headers=self.headers, data=payload)
+        data = self._json(response)
         return data['payload']
 
+    @traced
     def extractor_from_document_uuid(self, uuid: str, data: EntityDocumentExtractor):
         """
         Extracts information from a document identified by UUID using the provided extractor configuration.
@@ -78,10 +184,11 @@ class APIClient:
         url = f"{self.base_url}/integrator/extractor/from/document/{uuid}"
         payload = json.dumps(data.__dict__)
 
-        response = requests.post(url, headers=self.headers, data=payload)
-        data = response.json()
+        response = self._request("POST", url, headers=self.headers, data=payload)
+        data = self._json(response)
         return data['payload']
 
+    @traced
     def search_in_document(self, search: Search) -> SearchDocument:
         """
         Perform a document search using the provided search parameters and return the results.
@@ -105,16 +212,17 @@ class APIClient:
             propagate up.
 
         Note:
-            This function logs the raw response data at the INFO level before processing.
+            This function logs the raw response data through the payload logging policy
+            (DEBUG level by default, see `configure_logging`) before processing.
             If the response cannot be processed as expected, it returns a default 
             SearchDocument with empty results.
         """
         payload = json.dumps(search.__dict__)
         url = f"{self.base_url}/integrator/document/search"
-        response = requests.post(url, headers=self.headers, data=payload)
-        data = response.json()
+        response = self._request("POST", url, headers=self.headers, data=payload)
+        data = self._json(response)
         dict_data = data['payload']
-        logger.info(dict_data)
+        log_payload("search_in_document response", dict_data)
 
         try:
             # Create the SearchDocument instance
@@ -148,7 +256,8 @@ class APIClient:
         except:
             return SearchDocument(query=search.matches, hits=[], estimatedTotalHits=0, processingTimeMs=0, limit=search.max_results)
 
-    def set_document_status(self, uuid: str, status: StatusDocument) -> bool:
+    @traced
+    def set_document_status(self, uuid: str, status: StatusDocument, raise_for_status: bool = False) -> bool:
         """
         Set the status of a document identified by its UUID.
 
@@ -158,6 +267,8 @@ class APIClient:
         Args:
             uuid (str): The UUID of the document whose status is to be updated.
             status (StatusDocument): The new status to be set for the document.
+            raise_for_status (bool, optional): Raise HTTPError on an HTTP error status instead of
+                reading the response body. Defaults to False.
 
         Returns:
             bool: True if the status was successfully updated, False otherwise.
@@ -171,11 +282,14 @@ class APIClient:
             True
         """
         url = f"{self.base_url}/integrator/documents/set/status/{uuid}/{status.value}"
-        response = requests.get(url, headers=self.headers)
-        data = response.json()
-        logger.info(data)
+        response = self._request("GET", url, headers=self.headers)
+        if raise_for_status:
+            response.raise_for_status()
+        data = self._json(response)
+        log_payload("set_document_status response", data)
         return data['status']
 
+    @traced
     def get_document_by_uuid(self, uuid: str) -> Document:
         """
         Retrieves a document by its UUID from the integrator service.
@@ -199,46 +313,17 @@ class APIClient:
         url = f"{self.base_url}/integrator/document/get/by/uuid/{uuid}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url, headers=self.headers)
             response.raise_for_status()
 
-            data = response.json()
-            doc_data = data.get('payload', {})
-
-            entities = None
-            if 'entities' in doc_data:
-                entities = [
-                    Entity(
-                        id=entity['id'],
-                        key=entity['key'],
-                        value=entity['value'],
-                        page=entity['page'],
-                        id_core=entity['id_core'],
-                        is_valid=entity['is_valid']
-                    ) for entity in doc_data['entities']
-                ]
-
-            document = Document(
-                id=doc_data['id'],
-                batch_id=doc_data['batch_id'],
-                user=doc_data['user'],
-                uuid=doc_data['uuid'],
-                url=doc_data['url'],
-                file_name=doc_data['file_name'],
-                type_document=doc_data['type_document'],
-                status_document=doc_data['status_document'],
-                uploaded=doc_data['uploaded'],
-                reviewed_at=doc_data['reviewed_at'],
-                source_type=doc_data['source_type'],
-                entities=entities
-            )
-
-            return document
+            data = self._json(response)
+            return self.parse_document(data.get('payload', {}))
 
         except (KeyError, ValueError) as e:
             logger.error(f"Error parsing response data: {e}")
             raise
 
+    @traced
     def get_documents_by_status(self, status: StatusDocument, page: int = 1, limit: int = 10) -> BatchDocumentsResponse:
         """
         Fetches a batch of documents based on their status from the API.
@@ -266,10 +351,10 @@ class APIClient:
         url = f"{self.base_url}/integrator/documents/by/status/{status.value}?page={page}&limit={limit}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url, headers=self.headers)
             response.raise_for_status()
 
-            data = response.json()
+            data = self._json(response)
             payload = data.get('payload', {})
             documents_data = payload.get('documents', [])
 
@@ -281,35 +366,7 @@ class APIClient:
                 )
 
             for doc_data in documents_data:
-                entities = None
-                
-                if 'entities' in doc_data:
-                    entities = [
-                        Entity(
-                            id=entity['id'],
-                            key=entity['key'],
-                            value=entity['value'] if "value" in entity else  'no_encontrado',
-                            page=entity['page'],
-                            id_core=entity['id_core'],
-                            is_valid=entity['is_valid']
-                        ) for entity in doc_data['entities']
-                    ]
-
-                document = Document(
-                    id=doc_data['id'],
-                    batch_id=doc_data['batch_id'],
-                    user=doc_data['user'],
-                    uuid=doc_data['uuid'],
-                    url=doc_data['url'],
-                    file_name=doc_data['file_name'],
-                    type_document=doc_data['type_document'],
-                    status_document=doc_data['status_document'],
-                    uploaded=doc_data['uploaded'],
-                    reviewed_at=doc_data['reviewed_at'],
-                    source_type=doc_data['source_type'],
-                    entities=entities
-                )
-                documents.append(document)
+                documents.append(self.parse_document(doc_data))
 
             return BatchDocumentsResponse(
                 documents=documents,
@@ -324,6 +381,7 @@ class APIClient:
             logger.error(f"Error parsing response data: {e}")
             raise
 
+    @traced
     def get_documents_by_status_and_batch(self, status: StatusDocument, batch_type: BatchType, page: int = 1, limit: int = 10) -> BatchDocumentsResponse:
         """
         Fetches a batch of documents based on their status and batch type from the API.
@@ -352,10 +410,10 @@ class APIClient:
         url = f"{self.base_url}/integrator/documents/by/{batch_type.value}/status/{status.value}?page={page}&limit={limit}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url, headers=self.headers)
             response.raise_for_status()
 
-            data = response.json()
+            data = self._json(response)
    
             payload = data.get('payload', {})
             documents_data = payload.get('documents', [])
@@ -368,35 +426,7 @@ class APIClient:
                 )
 
             for doc_data in documents_data:
-                entities = None
-                
-                if 'entities' in doc_data:
-                    entities = [
-                        Entity(
-                            id=entity['id'],
-                            key=entity['key'],
-                            value=entity['value'] if "value" in entity else  'no_encontrado',
-                            page=entity['page'],
-                            id_core=entity['id_core'],
-                            is_valid=entity['is_valid']
-                        ) for entity in doc_data['entities']
-                    ]
-
-                document = Document(
-                    id=doc_data['id'],
-                    batch_id=doc_data['batch_id'],
-                    user=doc_data['user'],
-                    uuid=doc_data['uuid'],
-                    url=doc_data['url'],
-                    file_name=doc_data['file_name'],
-                    type_document=doc_data['type_document'],
-                    status_document=doc_data['status_document'],
-                    uploaded=doc_data['uploaded'],
-                    reviewed_at=doc_data['reviewed_at'],
-                    source_type=doc_data['source_type'],
-                    entities=entities
-                )
-                documents.append(document)
+                documents.append(self.parse_document(doc_data))
 
             return BatchDocumentsResponse(
                 documents=documents,
@@ -412,6 +442,7 @@ class APIClient:
             raise
 
 
+    @traced
     def get_documents_by_batch(self, id_batch: str, page: int = 1, limit: int = 10) -> BatchDocumentsResponse:
         """
         Retrieve documents associated with a specific batch ID.
@@ -445,49 +476,22 @@ class APIClient:
         url = f"{self.base_url}/integrator/documents/by/id/batch/{id_batch}?page={page}&limit={limit}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url, headers=self.headers)
             response.raise_for_status()
 
-            data = response.json()
+            data = self._json(response)
             payload = data.get('payload', {})
             documents_data = payload.get('documents', [])
 
+            documents = []
             if not documents_data:
                 return BatchDocumentsResponse(
                     documents=documents,
                     total=payload['total']
                 )
 
-            documents = []
             for doc_data in documents_data:
-                entities = None
-                if 'entities' in doc_data:
-                    entities = [
-                        Entity(
-                            id=entity['id'],
-                            key=entity['key'],
-                            value=entity['value'],
-                            page=entity['page'],
-                            id_core=entity['id_core'],
-                            is_valid=entity['is_valid']
-                        ) for entity in doc_data['entities']
-                    ]
-
-                document = Document(
-                    id=doc_data['id'],
-                    batch_id=doc_data['batch_id'],
-                    user=doc_data['user'],
-                    uuid=doc_data['uuid'],
-                    url=doc_data['url'],
-                    file_name=doc_data['file_name'],
-                    type_document=doc_data['type_document'],
-                    status_document=doc_data['status_document'],
-                    uploaded=doc_data['uploaded'],
-                    reviewed_at=doc_data['reviewed_at'],
-                    source_type=doc_data['source_type'],
-                    entities=entities
-                )
-                documents.append(document)
+                documents.append(self.parse_document(doc_data))
 
             return BatchDocumentsResponse(
                 documents=documents,
@@ -502,7 +506,8 @@ class APIClient:
             logger.error(f"Error parsing response data: {e}")
             raise
 
-    def clear_document_by_uuid(self, uuid: str) -> bool:
+    @traced
+    def clear_document_by_uuid(self, uuid: str, raise_for_status: bool = False) -> bool:
         """
         Clears a document from the system using its unique identifier (UUID).
 
@@ -512,6 +517,8 @@ class APIClient:
 
         Args:
             uuid (str): The unique identifier of the document to be cleared.
+            raise_for_status (bool, optional): Raise HTTPError on an HTTP error status instead of
+                reading the response body. Defaults to False.
 
         Returns:
             bool: True if the document was cleared successfully, False otherwise.
@@ -526,10 +533,13 @@ class APIClient:
             True
         """
         url = f"{self.base_url}/integrator/clear/document/{uuid}"
-        response = requests.get(url, headers=self.headers)
-        data = response.json()
+        response = self._request("GET", url, headers=self.headers)
+        if raise_for_status:
+            response.raise_for_status()
+        data = self._json(response)
         return data['status']
 
+    @traced
     def delete_batch(self, batch_id: str) -> bool:
         """
         Deletes a batch with the specified batch ID.
@@ -550,11 +560,12 @@ class APIClient:
             KeyError: If the 'status' key is not found in the response JSON.
         """
         url = f"{self.base_url}/integrator/delete/batch/{batch_id}"
-        response = requests.delete(url, headers=self.headers)
-        data = response.json()
+        response = self._request("DELETE", url, headers=self.headers)
+        data = self._json(response)
         return data['status']
 
-    def delete_document_from_batch(self, uuid: str) -> bool:
+    @traced
+    def delete_document_from_batch(self, uuid: str, raise_for_status: bool = False) -> bool:
         """
         Deletes a document from a batch using its unique identifier (UUID).
 
@@ -564,6 +575,8 @@ class APIClient:
 
         Args:
             uuid (str): The unique identifier of the document to be deleted.
+            raise_for_status (bool, optional): Raise HTTPError on an HTTP error status instead of
+                reading the response body. Defaults to False.
 
         Returns:
             bool: bool containing information about the success or failure of the deletion operation.
@@ -578,10 +591,13 @@ class APIClient:
             True
         """
         url = f"{self.base_url}/integrator/delete/by/uuid/{uuid}"
-        response = requests.delete(url, headers=self.headers)
-        data = response.json()
+        response = self._request("DELETE", url, headers=self.headers)
+        if raise_for_status:
+            response.raise_for_status()
+        data = self._json(response)
         return data['status']
 
+    @traced
     def get_document_types(self) -> List[DocumentType]:
         """
         Retrieves all document types for the user.
@@ -605,10 +621,10 @@ class APIClient:
         url = f"{self.base_url}/integrator/documents/type/all/user"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url, headers=self.headers)
             response.raise_for_status()
 
-            json_data = response.json()
+            json_data = self._json(response)
             payload = json_data.get('payload', [])
 
             return [
@@ -630,6 +646,7 @@ class APIClient:
             logger.error(f"Error parsing response data: {e}")
             return []
 
+    @traced
     def create_batch(self, name: str, batch_type: BatchType):
         """
         Creates a new batch with the specified name and type.
@@ -656,15 +673,16 @@ class APIClient:
             "batch_type": batch_type.value
         }
 
-        response = requests.post(url, headers=self.headers, data=data)
-        logger.info(response.text)
+        response = self._request("POST", url, headers=self.headers, data=data)
+        log_payload("create_batch response", lambda: response.text)
 
         if response.status_code == 200:
-            json_data = response.json()
+            json_data = self._json(response)
             return Response(json_data['payload'], json_data['status'])
         else:
             response.raise_for_status()
 
+    @traced
     def _upload_file(self, file: File, batch_id: str, max_retries: int = 3, retry_delay: int = 5) -> UploadResult:
         """
         Uploads a file to a specified batch on a remote server.
@@ -709,11 +727,9 @@ class APIClient:
                 headers = {"Content-Type": m.content_type}
                 headers_with_keys = dict(ChainMap(headers, self.headers))
 
-                response = requests.post(
-                    url, data=m, headers=headers_with_keys)
-                response_data = response.json()
-
-                print(response_data)
+                response = self._request("POST", url, data=m, headers=headers_with_keys)
+                response_data = self._json(response)
+                log_payload("upload response", response_data)
 
                 if response_data['status']:
                     return UploadResult(True, file_name, uuid=response_data.get('payload', 'successful')[0])
@@ -729,6 +745,7 @@ class APIClient:
 
         return UploadResult(False, file_name, error_message="max retries reached")
 
+    @traced
     def append_job(self, job: Job, batch_id: str, max_retries: int = 1, retry_delay: int = 5) -> Dict[str, List[UploadResult]]:
         """
         Processes a job by uploading all files associated with it to a specified batch.
@@ -759,12 +776,14 @@ class APIClient:
 
         return results
 
-    def search_in_brain(self, search_params: SearchParameters) -> ResultsSearch:
+    @traced
+    def search_in_brain(self, search_params: SearchParameters, timeout: Optional[float] = None) -> ResultsSearch:
         """
         Sends a search request to the API with the given search parameters and returns the results.
 
         Args:
             search_params (SearchParameters): The parameters for the search operation.
+            timeout (Optional[float]): Seconds to wait for the server. None waits indefinitely.
 
         Returns:
             ResultsResponse: The response containing the search results.
@@ -775,10 +794,10 @@ class APIClient:
         url = f"{self.base_url}/integrator/search/brain"
 
         payload = json.dumps(search_params.__dict__)
-        response = requests.post(url, headers=self.headers, data=payload)
+        response = self._request("POST", url, headers=self.headers, data=payload, timeout=timeout)
         response.raise_for_status()  # Raise an exception for HTTP errors
 
-        response_data = response.json()
+        response_data = self._json(response)
 
         if not response_data['status']:
             return ResultsSearch(results=[])
@@ -790,6 +809,7 @@ class APIClient:
         results = [Result(**result_data) for result_data in results]
         return results
 
+    @traced
     def process_item(self, batch_id: str) -> bool:
         """
         Processes an item within a specified batch.
@@ -815,8 +835,8 @@ class APIClient:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, headers=headers, data={})
-        response_data = response.json()
+        response = self._request("POST", url, headers=headers, data={})
+        response_data = self._json(response)
 
         if response.status_code == 200:
             return response_data['status']
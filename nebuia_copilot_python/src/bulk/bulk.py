@@ -0,0 +1,173 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+from loguru import logger
+
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` acquisitions per second on average,
+    with bursts of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+@dataclass
+class BulkOutcome:
+    """
+    Result of a bulk operation for a single document.
+
+    Attributes:
+        uuid (str): The document UUID.
+        success (bool): True if the API reported the operation as successful.
+        attempts (int): Requests sent for this document, retries included.
+        error (Optional[str]): The last error, if the operation raised.
+    """
+    uuid: str
+    success: bool
+    attempts: int = 1
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkResult:
+    """
+    Aggregated outcomes of a bulk operation, in the order the UUIDs were given.
+
+    Attributes:
+        outcomes (List[BulkOutcome]): One outcome per distinct UUID.
+        elapsed (float): Seconds the whole operation took.
+    """
+    outcomes: List[BulkOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [outcome.uuid for outcome in self.outcomes if outcome.success]
+
+    @property
+    def failed(self) -> List[str]:
+        return [outcome.uuid for outcome in self.outcomes if not outcome.success]
+
+    @property
+    def ok(self) -> bool:
+        return all(outcome.success for outcome in self.outcomes)
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    True for errors worth retrying: connection problems, timeouts, 429/5xx responses,
+    and response bodies that are not JSON (typically an error page from a gateway).
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, requests.JSONDecodeError)):
+        return True
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in TRANSIENT_STATUS_CODES
+    return False
+
+
+class BulkRunner:
+    """
+    Applies a single-document API call to many UUIDs.
+
+    Calls run on `max_workers` threads, paced by a shared token bucket of `rate`
+    requests per second (retries included). Only a bounded window of UUIDs is in
+    flight at a time, so arbitrarily large iterables can be passed. Duplicate
+    UUIDs are processed once.
+
+    A call that returns False is a definitive failure and is not retried, so operations
+    must raise on HTTP error statuses (the Integrator passes `raise_for_status=True` to the
+    APIClient methods it runs). A call that raises a transient error is retried up to `max_retries` times with
+    exponential backoff and jitter. Errors never abort the run, they are recorded
+    in the outcome of their UUID.
+
+    Example:
+        >>> runner = BulkRunner(max_workers=8, rate=20)
+        >>> result = runner.run(lambda uuid: api_client.clear_document_by_uuid(uuid, raise_for_status=True), uuids)
+        >>> print(len(result.succeeded), result.failed)
+
+    Attributes:
+        max_workers (int): Concurrent requests.
+        rate (Optional[float]): Requests per second across all workers. None disables rate limiting.
+        max_retries (int): Retries per UUID after a transient error.
+        backoff (float): Base delay in seconds between retries, doubled on every attempt.
+    """
+
+    def __init__(self, max_workers: int = 8, rate: Optional[float] = 20.0, max_retries: int = 3, backoff: float = 0.5):
+        self.max_workers = max_workers
+        self.rate = rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._bucket = TokenBucket(rate) if rate else None
+
+    def run(self, operation: Callable[[str], bool], uuids: Iterable[str]) -> BulkResult:
+        started = time.monotonic()
+        order: List[str] = []
+        outcomes: Dict[str, BulkOutcome] = {}
+        in_flight: Dict[Future, str] = {}
+
+        def collect(done):
+            for future in done:
+                outcome = future.result()
+                outcomes[in_flight.pop(future)] = outcome
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            seen = set()
+            for uuid in uuids:
+                if uuid in seen:
+                    continue
+                seen.add(uuid)
+                order.append(uuid)
+                if len(in_flight) >= self.max_workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[executor.submit(self._attempt, operation, uuid)] = uuid
+            done, _ = wait(in_flight)
+            collect(done)
+
+        result = BulkResult(outcomes=[outcomes[uuid] for uuid in order], elapsed=time.monotonic() - started)
+        if result.failed:
+            logger.warning(f"bulk operation: {len(result.failed)}/{len(result)} documents failed")
+        return result
+
+    def _attempt(self, operation: Callable[[str], bool], uuid: str) -> BulkOutcome:
+        attempts = 0
+        while True:
+            if self._bucket is not None:
+                self._bucket.acquire()
+            attempts += 1
+            try:
+                return BulkOutcome(uuid=uuid, success=bool(operation(uuid)), attempts=attempts)
+            except Exception as e:
+                if attempts > self.max_retries or not is_transient(e):
+                    return BulkOutcome(uuid=uuid, success=False, attempts=attempts, error=str(e))
+                delay = self.backoff * 2 ** (attempts - 1)
+                time.sleep(delay + random.uniform(0, delay))
@@ -0,0 +1,291 @@
+import dataclasses
+import gzip
+import json
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.models import Document
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+_END = object()
+
+
+@dataclass
+class ExportState:
+    """
+    Progress of an export, persisted next to the output so it can be resumed.
+
+    Attributes:
+        batch_id (str): The exported batch.
+        page_size (int): Page size of the export; a resume must use the same one.
+        next_page (int): First page not written yet.
+        documents (int): Documents written so far.
+        total (int): `total` reported by the last fetched page.
+        offset (int): Output bytes known to be complete (JSONL exports).
+        parts (int): Complete part files (Parquet exports).
+        finished (bool): True once the last page was written.
+    """
+    batch_id: str
+    page_size: int
+    next_page: int = 1
+    documents: int = 0
+    total: int = 0
+    offset: int = 0
+    parts: int = 0
+    finished: bool = False
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ExportState"]:
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(dataclasses.asdict(self), f)
+        os.replace(tmp, path)
+
+
+class BatchExporter:
+    """
+    Streams every document of a batch, with its entities, to a file.
+
+    Pages are fetched by a background thread into a queue of `prefetch` pages, so
+    the next requests overlap with writing and memory stays bounded by
+    `page_size * (prefetch + 1)` documents whatever the size of the batch.
+
+    After every page the exporter records how far it got in a `.state` sidecar
+    (JSONL) or `_export_state.json` (Parquet directory). Exporting again to the
+    same path resumes from there: partial output written after the last
+    checkpoint is discarded and the export continues from the next page. The
+    sidecar is removed once the export completes. Resuming assumes the batch did
+    not change in between; a different `total` is logged as a warning.
+
+    Example:
+        >>> exporter = BatchExporter(integrator._api_client)
+        >>> exporter.to_jsonl(batch_id, "batch.jsonl.gz")
+        >>> exporter.to_parquet(batch_id, "batch_parquet")
+
+    Attributes:
+        api_client (APIClient): Client used to read the batch.
+        page_size (int): Documents per request.
+        prefetch (int): Pages fetched ahead of the writer.
+    """
+
+    def __init__(self, api_client: APIClient, page_size: int = 100, prefetch: int = 2):
+        self.api_client = api_client
+        self.page_size = page_size
+        self.prefetch = prefetch
+
+    def to_jsonl(self, batch_id: str, path: str, compress: Optional[bool] = None, resume: bool = True) -> ExportState:
+        """
+        Writes one JSON object per document to `path`.
+
+        Args:
+            batch_id (str): The batch to export.
+            path (str): Output file.
+            compress (Optional[bool]): Gzip the output. Defaults to True if `path` ends with ".gz".
+            resume (bool): Continue an interrupted export to the same path instead of starting over.
+
+        Returns:
+            ExportState: Final state of the export.
+        """
+        compress = path.endswith(".gz") if compress is None else compress
+        state_path = f"{path}.state"
+        state = self._initial_state(batch_id, state_path, resume)
+        if state.offset and (not os.path.exists(path) or os.path.getsize(path) < state.offset):
+            logger.warning(f"{path} is missing or shorter than its export state, exporting batch {batch_id} again")
+            state = ExportState(batch_id=batch_id, page_size=self.page_size)
+
+        with open(path, "r+b" if state.offset else "wb") as raw:
+            raw.truncate(state.offset)
+            raw.seek(state.offset)
+            for page, total, documents in self._pages(batch_id, state.next_page):
+                lines = b"".join(
+                    json.dumps(dataclasses.asdict(doc), ensure_ascii=False).encode() + b"\n" for doc in documents
+                )
+                if compress:
+                    # one gzip member per page: a complete member ends at every checkpoint
+                    with gzip.GzipFile(fileobj=raw, mode="wb") as member:
+                        member.write(lines)
+                else:
+                    raw.write(lines)
+                raw.flush()
+                os.fsync(raw.fileno())
+                self._advance(state, state_path, page, total, len(documents), offset=raw.tell())
+
+        return self._finish(state, state_path)
+
+    def to_parquet(self, batch_id: str, directory: str, pages_per_file: int = 10, compression: str = "zstd",
+                   resume: bool = True) -> ExportState:
+        """
+        Writes the batch as a Parquet dataset: `part-00000.parquet`, `part-00001.parquet`, ...
+        in `directory`, one row group per page and one row per document, with the
+        entities as a list of structs. Requires pyarrow.
+
+        Args:
+            batch_id (str): The batch to export.
+            directory (str): Output directory, created if missing.
+            pages_per_file (int): Pages written to each part file.
+            compression (str): Parquet compression codec.
+            resume (bool): Continue an interrupted export to the same directory instead of starting over.
+
+        Returns:
+            ExportState: Final state of the export.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pa is None:
+            raise ImportError("Parquet export requires pyarrow: pip install nebuia_copilot_python[parquet]")
+        os.makedirs(directory, exist_ok=True)
+        state_path = os.path.join(directory, "_export_state.json")
+        state = self._initial_state(batch_id, state_path, resume)
+        if any(not os.path.exists(_part_path(directory, part)) for part in range(state.parts)):
+            logger.warning(f"part files are missing in {directory}, exporting batch {batch_id} again")
+            state = ExportState(batch_id=batch_id, page_size=self.page_size)
+        # part files past the checkpoint are partial, or left over from an earlier export
+        for name in os.listdir(directory):
+            if name.startswith("part-") and name.endswith(".parquet") and int(name[5:-8]) >= state.parts:
+                os.remove(os.path.join(directory, name))
+        schema = _parquet_schema()
+
+        writer = None
+        pages_in_file = 0
+        file_documents = 0
+        last = None
+        try:
+            for page, total, documents in self._pages(batch_id, state.next_page):
+                if writer is None:
+                    writer = pq.ParquetWriter(_part_path(directory, state.parts), schema, compression=compression)
+                writer.write_table(pa.Table.from_pylist([dataclasses.asdict(doc) for doc in documents], schema=schema))
+                pages_in_file += 1
+                file_documents += len(documents)
+                last = (page, total)
+                if pages_in_file == pages_per_file:
+                    # only whole part files are checkpointed; an interrupted one is rewritten on resume
+                    writer.close()
+                    writer = None
+                    state.parts += 1
+                    self._advance(state, state_path, page, total, file_documents)
+                    pages_in_file = file_documents = 0
+            if writer is not None:
+                writer.close()
+                writer = None
+                state.parts += 1
+                self._advance(state, state_path, last[0], last[1], file_documents)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return self._finish(state, state_path)
+
+    def _initial_state(self, batch_id: str, state_path: str, resume: bool) -> ExportState:
+        state = ExportState.load(state_path) if resume else None
+        if state is None or state.batch_id != batch_id or state.page_size != self.page_size or state.finished:
+            return ExportState(batch_id=batch_id, page_size=self.page_size)
+        logger.info(f"resuming export of batch {batch_id} at page {state.next_page} ({state.documents} documents written)")
+        return state
+
+    def _advance(self, state: ExportState, state_path: str, page: int, total: int, documents: int, offset: int = 0):
+        if state.total and total != state.total:
+            logger.warning(f"batch {state.batch_id} changed during the export: {state.total} -> {total} documents")
+        state.next_page = page + 1
+        state.documents += documents
+        state.total = total
+        state.offset = offset
+        state.save(state_path)
+
+    def _finish(self, state: ExportState, state_path: str) -> ExportState:
+        state.finished = True
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        logger.info(f"exported {state.documents} documents of batch {state.batch_id}")
+        return state
+
+    def _pages(self, batch_id: str, start_page: int) -> Iterator[Tuple[int, int, List[Document]]]:
+        pages: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch():
+            page = start_page
+            try:
+                while not stop.is_set():
+                    response = self.api_client.get_documents_by_batch(batch_id, page=page, limit=self.page_size)
+                    if not response.documents:
+                        break
+                    if not put((page, response.total, response.documents)):
+                        return
+                    if page * self.page_size >= response.total:
+                        break
+                    page += 1
+            except Exception as e:
+                put(e)
+                return
+            put(_END)
+
+        fetcher = threading.Thread(target=fetch, name="batch-export-prefetch", daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            fetcher.join()
+
+
+def _part_path(directory: str, part: int) -> str:
+    return os.path.join(directory, f"part-{part:05d}.parquet")
+
+
+def _parquet_schema():
+    entity = pa.struct([
+        ("id", pa.string()),
+        ("key", pa.string()),
+        ("value", pa.string()),
+        ("page", pa.int64()),
+        ("id_core", pa.string()),
+        ("is_valid", pa.bool_()),
+    ])
+    return pa.schema([
+        ("id", pa.string()),
+        ("batch_id", pa.string()),
+        ("user", pa.string()),
+        ("uuid", pa.string()),
+        ("url", pa.string()),
+        ("file_name", pa.string()),
+        ("type_document", pa.string()),
+        ("status_document", pa.string()),
+        ("uploaded", pa.string()),
+        ("reviewed_at", pa.string()),
+        ("source_type", pa.string()),
+        ("entities", pa.list_(entity)),
+    ])
@@ -0,0 +1,336 @@
+import asyncio
+import inspect
+import random
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+from nebuia_copilot_python.src.listener.claim import ClaimConfig, LeaseManager
+from nebuia_copilot_python.src.listener.diff import ChangeDetector
+from nebuia_copilot_python.src.listener.metrics import ListenerMetrics
+from nebuia_copilot_python.src.models import BatchType, Document, Entity, StatusDocument
+
+Handler = Callable[..., Union[None, Awaitable[None]]]
+
+
+async def _call(handler: Handler, *args):
+    result = handler(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class AsyncListener:
+    """
+    Polls one (status, batch_type) subscription from inside an asyncio event loop.
+
+    Behaves like ThreadedEventBasedListener (drain mode, claims, checkpoints and change detection),
+    but every document of a page is handled as its own task, bounded by the
+    manager's concurrency limit.
+
+    Attributes:
+        status (StatusDocument): Status of the documents to poll.
+        batch_type (BatchType): Batch type of the documents to poll.
+        interval (float): Seconds between the end of a cycle and the start of the next.
+        limit_documents (int): Page size.
+        drain (bool): Follow pagination within a poll cycle.
+        max_pages (Optional[int]): Maximum pages fetched per cycle in drain mode.
+        cycle_budget (Optional[float]): Maximum seconds spent per cycle in drain mode.
+        leases (Optional[LeaseManager]): Claims documents when claim mode is enabled.
+        changes (Optional[ChangeDetector]): Detects modified documents when change detection is enabled.
+        stats (ListenerStats): Metrics of this listener, registered in the manager's metrics.
+    """
+
+    def __init__(self, manager: "AsyncListenerManager", status: StatusDocument, batch_type: BatchType, interval: float,
+                 limit_documents: int, drain: bool = False, max_pages: Optional[int] = None,
+                 cycle_budget: Optional[float] = None, claim: Optional[ClaimConfig] = None,
+                 detect_changes: bool = False):
+        self.manager = manager
+        self.status = status
+        self.batch_type = batch_type
+        self.interval = interval
+        self.limit_documents = limit_documents
+        self.drain = drain
+        self.max_pages = max_pages
+        self.cycle_budget = cycle_budget
+        self.leases = LeaseManager(manager.api_client, status, batch_type, claim) if claim else None
+        self.changes = ChangeDetector() if detect_changes else None
+        self.stats = manager.metrics.for_listener(status, batch_type)
+
+    async def fetch_documents(self, page: int = 1):
+        return await self.manager.run_blocking(
+            self.manager.api_client.get_documents_by_status_and_batch,
+            status=self.status, batch_type=self.batch_type, page=page, limit=self.limit_documents)
+
+    async def poll(self):
+        """
+        Runs a single poll cycle. Errors are reported to the error handler instead of being raised.
+        """
+        started = time.monotonic()
+        seen = set()
+        page = 1
+        pages = 0
+        last_total = None
+        try:
+            while True:
+                fetch_started = time.monotonic()
+                documents = await self.fetch_documents(page)
+                self.stats.observe_poll(time.monotonic() - fetch_started, documents.total)
+                pages += 1
+                if page == 1:
+                    await self._retain_checkpoints(documents)
+                fresh = [doc for doc in documents.documents if doc.uuid not in seen]
+                seen.update(doc.uuid for doc in fresh)
+                dispatched = await self.dispatch(fresh)
+
+                # see ThreadedEventBasedListener.poll: skip past pages already handled
+                covered = bool(fresh) and not dispatched
+                if not (self.drain or covered) or not documents.documents or self._cycle_exhausted(pages, started):
+                    break
+
+                # see ThreadedEventBasedListener.poll: restart while the queue shrinks
+                if fresh and last_total is not None and documents.total < last_total:
+                    page = 1
+                else:
+                    page += 1
+                last_total = documents.total
+
+                if (page - 1) * self.limit_documents >= documents.total:
+                    break
+        except Exception as e:
+            self.stats.observe_poll_error()
+            await self.manager.report_error(self.status, e)
+
+    def _cycle_exhausted(self, pages: int, started: float) -> bool:
+        if self.manager.stopping:
+            return True
+        if self.max_pages is not None and pages >= self.max_pages:
+            return True
+        if self.cycle_budget is not None and time.monotonic() - started >= self.cycle_budget:
+            return True
+        return False
+
+    async def dispatch(self, documents: List[Document]) -> int:
+        """
+        Handles `documents` and returns how many were left once the change and checkpoint
+        filters were applied.
+        """
+        pending = {}
+        checkpoint = self.manager.checkpoint
+        if self.changes is not None:
+            for doc in documents:
+                change = self.changes.changes(doc)
+                if change is not None:
+                    pending[doc.uuid] = change
+            documents = [doc for doc in documents if doc.uuid in pending]
+        elif checkpoint is not None:
+            documents = [doc for doc in documents if not checkpoint.is_handled(self.status, self.batch_type, doc.uuid)]
+        if self.leases is not None:
+            documents = list(documents)
+            random.shuffle(documents)
+
+        batch_handler = self.manager.on_documents_handler
+        results = await asyncio.gather(*(self._handle(doc, pending.get(doc.uuid), settle=batch_handler is None)
+                                         for doc in documents))
+        delivered = [doc for doc, handled in zip(documents, results) if handled]
+        if not delivered or batch_handler is None:
+            return len(documents)
+        # with a batch handler, documents are acknowledged and released only once it succeeded
+        try:
+            await _call(batch_handler, self.status, delivered)
+        except Exception as e:
+            await self._settle(delivered, False)
+            await self.manager.report_error(self.status, e)
+        else:
+            await self._settle(delivered, True)
+        return len(documents)
+
+    async def _settle(self, documents: List[Document], success: bool):
+        for doc in documents:
+            if self.leases is not None:
+                await self.manager.run_blocking(self.leases.release, doc, success)
+            if success:
+                await self._acknowledge(doc)
+            elif self.changes is not None:
+                self.changes.forget(doc.uuid)
+
+    async def _retain_checkpoints(self, documents):
+        # see ThreadedEventBasedListener._retain_checkpoints
+        checkpoint = self.manager.checkpoint
+        if checkpoint is not None and self.changes is None and len(documents.documents) >= documents.total:
+            await self.manager.run_blocking(checkpoint.retain, self.status, self.batch_type,
+                                            [doc.uuid for doc in documents.documents])
+
+    async def _acknowledge(self, doc: Document):
+        checkpoint = self.manager.checkpoint
+        if checkpoint is not None and self.changes is None:
+            # the SQLite commit blocks; keep it off the event loop
+            await self.manager.run_blocking(checkpoint.acknowledge, self.status, self.batch_type, doc.uuid)
+
+    async def _handle(self, doc: Document, change, settle: bool = True) -> bool:
+        async with self.manager.semaphore:
+            if self.manager.stopping:
+                return False
+            if self.leases is not None and not await self.manager.run_blocking(self.leases.claim, doc):
+                return False
+            started = time.monotonic()
+            try:
+                if self.manager.on_document_handler is not None:
+                    await _call(self.manager.on_document_handler, self.status, doc)
+                if change is not None:
+                    fingerprint, changed_entities = change
+                    if self.manager.on_document_changed_handler is not None:
+                        await _call(self.manager.on_document_changed_handler, self.status, doc, changed_entities)
+                    self.changes.remember(doc.uuid, fingerprint)
+            except Exception as e:
+                self.stats.observe_handler(time.monotonic() - started, failed=True)
+                if self.leases is not None:
+                    await self.manager.run_blocking(self.leases.release, doc, False)
+                await self.manager.report_error(self.status, e)
+                return False
+            self.stats.observe_handler(time.monotonic() - started)
+            if settle:
+                await self._settle([doc], True)
+            return True
+
+    async def run(self, delay: float = 0.0):
+        if await self.manager.wait_stopped(delay):
+            return
+        while not self.manager.stopping:
+            await self.poll()
+            if await self.manager.wait_stopped(self.interval):
+                return
+
+    async def reap_expired_leases(self):
+        reap_interval = max(self.interval, self.leases.config.lease_timeout / 2)
+        while not await self.manager.wait_stopped(reap_interval):
+            try:
+                await self.manager.run_blocking(self.leases.reap_expired, self.limit_documents)
+            except Exception as e:
+                await self.manager.report_error(self.status, e)
+
+
+class AsyncListenerManager:
+    """
+    asyncio counterpart of ThreadedListenerManager.
+
+    Runs inside an existing event loop: every subscription is a task and every
+    document is handled concurrently, up to `max_concurrency` at a time. Handlers
+    may be coroutine functions or plain functions. HTTP calls go through the
+    regular APIClient in `executor` (the loop's default executor if None), so the
+    loop is never blocked. No signal handlers are installed; stop the manager with
+    `stop()` or by cancelling the `run()` task.
+
+    Example:
+        >>> manager = AsyncListenerManager(integrator._api_client)
+        >>> manager.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=4, limit_documents=20)
+        >>> async def on_document(status, doc):
+        ...     await save(doc)
+        >>> manager.set_on_document_handler(on_document)
+        >>> task = asyncio.create_task(manager.run())
+        >>> ...
+        >>> await manager.stop()
+
+    Attributes:
+        api_client (APIClient): Client used to poll and update documents.
+        listeners (Dict[Tuple[StatusDocument, BatchType], AsyncListener]): Registered listeners.
+        max_concurrency (int): Maximum documents handled at the same time across all listeners.
+        checkpoint (Optional[CheckpointStore]): Store used to skip documents already handled.
+        metrics (ListenerMetrics): Poll, backlog and handler metrics of every listener.
+    """
+
+    def __init__(self, api_client: APIClient, max_concurrency: int = 10, executor: Optional[Executor] = None,
+                 checkpoint: Optional[CheckpointStore] = None):
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.checkpoint = checkpoint
+        self.metrics = ListenerMetrics()
+        self.listeners: Dict[Tuple[StatusDocument, BatchType], AsyncListener] = {}
+        self.on_document_handler: Optional[Handler] = None
+        self.on_documents_handler: Optional[Handler] = None
+        self.on_document_changed_handler: Optional[Handler] = None
+        self.on_error_handler: Optional[Handler] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def add_listener(self, status: StatusDocument, batch_type: BatchType, interval: float, limit_documents: int,
+                     drain: bool = False, max_pages: Optional[int] = None, cycle_budget: Optional[float] = None,
+                     claim: Optional[ClaimConfig] = None, detect_changes: bool = False) -> AsyncListener:
+        if self._tasks:
+            raise RuntimeError("listeners must be added before run()")
+        listener = AsyncListener(self, status, batch_type, interval, limit_documents, drain=drain,
+                                 max_pages=max_pages, cycle_budget=cycle_budget, claim=claim,
+                                 detect_changes=detect_changes)
+        self.listeners[(status, batch_type)] = listener
+        return listener
+
+    def set_on_document_handler(self, handler: Callable[[StatusDocument, Document], Union[None, Awaitable[None]]]):
+        self.on_document_handler = handler
+
+    def set_on_documents_handler(self, handler: Callable[[StatusDocument, List[Document]], Union[None, Awaitable[None]]]):
+        self.on_documents_handler = handler
+
+    def set_on_document_changed_handler(self, handler: Callable[[StatusDocument, Document, List[Entity]], Union[None, Awaitable[None]]]):
+        self.on_document_changed_handler = handler
+
+    def set_on_error_handler(self, handler: Callable[[StatusDocument, Exception], Union[None, Awaitable[None]]]):
+        self.on_error_handler = handler
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    async def run_blocking(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def wait_stopped(self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds for `stop()`. Returns True if the manager is stopping.
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._stop_event.is_set()
+
+    async def report_error(self, status: StatusDocument, error: Exception):
+        if self.on_error_handler is not None:
+            await _call(self.on_error_handler, status, error)
+        else:
+            logger.error(f"listener error for {status}: {error}")
+
+    async def run(self, max_spread: float = 5.0):
+        """
+        Runs every listener until `stop()` is called or the task is cancelled.
+        First polls are staggered over at most `max_spread` seconds.
+        """
+        self._stop_event = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        listeners = list(self.listeners.values())
+        for index, listener in enumerate(listeners):
+            delay = min(listener.interval, max_spread) * index / len(listeners)
+            self._tasks.append(asyncio.ensure_future(listener.run(delay)))
+            if listener.leases is not None:
+                self._tasks.append(asyncio.ensure_future(listener.reap_expired_leases()))
+            logger.info(f"listener started for status: {listener.status}")
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+            logger.info("listeners exited.")
+
+    async def stop(self):
+        """
+        Signals every listener to stop. Documents being handled finish first.
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
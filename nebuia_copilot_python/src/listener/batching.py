@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.models import Document, StatusDocument
+
+Settle = Callable[[List[Document], bool], None]
+
+
+class MicroBatcher:
+    """
+    Groups documents per status and hands them to a batch handler in chunks.
+
+    A chunk is flushed as soon as it holds `max_size` documents, or `max_wait`
+    seconds after its first document arrived, whichever comes first. Size-triggered
+    flushes run on the thread that added the documents; time-triggered flushes run
+    on the batcher's own timer thread.
+
+    Documents can be added with a `settle(documents, success)` callback, which is
+    called once their chunk has been handled, with `success=False` if the handler
+    raised. Documents still buffered when the process dies are never settled, so
+    their listener delivers them again.
+
+    Attributes:
+        handler (Callable[[StatusDocument, List[Document]], None]): Receives each chunk.
+        max_size (Optional[int]): Maximum documents per chunk. None means no size limit.
+        max_wait (float): Maximum seconds a document waits before its chunk is flushed.
+    """
+
+    def __init__(self, handler: Callable[[StatusDocument, List[Document]], None],
+                 max_size: Optional[int] = None, max_wait: float = 1.0):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._buckets: Dict[StatusDocument, List[Tuple[Document, Optional[Settle]]]] = {}
+        self._deadlines: Dict[StatusDocument, float] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add(self, status: StatusDocument, documents: List[Document], settle: Optional[Settle] = None):
+        ready = []
+        with self._condition:
+            bucket = self._buckets.setdefault(status, [])
+            if not bucket:
+                self._deadlines[status] = time.monotonic() + self.max_wait
+                self._condition.notify()
+            bucket.extend((doc, settle) for doc in documents)
+            while self.max_size is not None and len(bucket) >= self.max_size:
+                ready.append(bucket[:self.max_size])
+                del bucket[:self.max_size]
+            if not bucket:
+                self._deadlines.pop(status, None)
+        for chunk in ready:
+            self._emit(status, chunk)
+
+    def flush(self):
+        """
+        Hands every pending document to the handler immediately.
+        """
+        with self._condition:
+            pending = [(status, bucket) for status, bucket in self._buckets.items() if bucket]
+            self._buckets = {}
+            self._deadlines = {}
+        for status, bucket in pending:
+            self._emit(status, bucket)
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="listener-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the timer thread and flushes the pending documents.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _emit(self, status: StatusDocument, entries: List[Tuple[Document, Optional[Settle]]]):
+        documents = [doc for doc, _ in entries]
+        success = True
+        try:
+            self.handler(status, documents)
+        except Exception as e:
+            success = False
+            logger.error(f"batch handler failed for {len(documents)} documents from {status}: {e}")
+
+        settled: Dict[Settle, List[Document]] = {}
+        for doc, settle in entries:
+            if settle is not None:
+                settled.setdefault(settle, []).append(doc)
+        for settle, settled_documents in settled.items():
+            try:
+                settle(settled_documents, success)
+            except Exception as e:
+                logger.error(f"failed to settle {len(settled_documents)} documents from {status}: {e}")
+
+    def _run(self):
+        while True:
+            due = []
+            with self._condition:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                for status, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        due.append((status, self._buckets.pop(status)))
+                        del self._deadlines[status]
+                if not due:
+                    timeout = min(self._deadlines.values()) - now if self._deadlines else None
+                    self._condition.wait(timeout)
+                    continue
+            for status, bucket in due:
+                self._emit(status, bucket)
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+class CheckpointStore:
+    """
+    Persists which documents each listener has already handled, in a local SQLite file.
+
+    A document is recorded only after its handler returned successfully. The whole
+    table is loaded into memory when the store is opened, so a restarted worker skips
+    everything it already handled without touching the API or the database on the hot
+    path. Entries older than `max_age` seconds are pruned on open and then at most every
+    `PRUNE_INTERVAL` seconds while documents are acknowledged, so a long-running worker
+    does not accumulate them.
+
+    A listener that sees its whole queue in one page calls `retain` with it: documents
+    it had handled that are no longer in the status are forgotten, so a document that
+    leaves the status and later re-enters it is delivered again.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+        max_age (Optional[float]): Seconds an acknowledgement is kept. None keeps them forever.
+    """
+
+    PRUNE_INTERVAL = 3600.0
+
+    def __init__(self, path: str, max_age: Optional[float] = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS handled ("
+            "status TEXT NOT NULL, batch_type TEXT NOT NULL, uuid TEXT NOT NULL, "
+            "acknowledged_at REAL NOT NULL, PRIMARY KEY (status, batch_type, uuid))"
+        )
+        self._connection.commit()
+        # acknowledged_at of every handled uuid, per (status, batch_type) listener
+        self._handled: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._load()
+
+    def _load(self):
+        with self._lock:
+            self._prune(time.time())
+            self._handled = {}
+            rows = self._connection.execute("SELECT status, batch_type, uuid, acknowledged_at FROM handled")
+            for status, batch_type, uuid, acknowledged_at in rows:
+                self._handled.setdefault((status, batch_type), {})[uuid] = acknowledged_at
+        logger.info(f"loaded {len(self)} listener checkpoints from {self.path}")
+
+    def _prune(self, now: float):
+        self._pruned_at = now
+        if self.max_age is None:
+            return
+        horizon = now - self.max_age
+        self._connection.execute("DELETE FROM handled WHERE acknowledged_at < ?", (horizon,))
+        self._connection.commit()
+        for handled in self._handled.values():
+            for uuid in [uuid for uuid, acknowledged_at in handled.items() if acknowledged_at < horizon]:
+                del handled[uuid]
+
+    def is_handled(self, status: StatusDocument, batch_type: BatchType, uuid: str) -> bool:
+        return uuid in self._handled.get((status.value, batch_type.value), ())
+
+    def acknowledge(self, status: StatusDocument, batch_type: BatchType, uuid: str):
+        """
+        Records that the document `uuid` was handled for the (status, batch_type) listener.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO handled (status, batch_type, uuid, acknowledged_at) VALUES (?, ?, ?, ?)",
+                (status.value, batch_type.value, uuid, now))
+            self._connection.commit()
+            self._handled.setdefault((status.value, batch_type.value), {})[uuid] = now
+            if self.max_age is not None and now - self._pruned_at >= min(self.PRUNE_INTERVAL, self.max_age):
+                self._prune(now)
+
+    def retain(self, status: StatusDocument, batch_type: BatchType, uuids: Iterable[str]):
+        """
+        Forgets the handled documents of the (status, batch_type) listener that are not in
+        `uuids`, which must be the complete current contents of the status.
+        """
+        uuids = set(uuids)
+        with self._lock:
+            handled = self._handled.get((status.value, batch_type.value), {})
+            left = [uuid for uuid in handled if uuid not in uuids]
+            if not left:
+                return
+            self._connection.executemany(
+                "DELETE FROM handled WHERE status = ? AND batch_type = ? AND uuid = ?",
+                [(status.value, batch_type.value, uuid) for uuid in left])
+            self._connection.commit()
+            for uuid in left:
+                del handled[uuid]
+
+    def forget(self, status: StatusDocument, batch_type: BatchType, uuid: str):
+        """
+        Removes the record for `uuid`, so the listener handles the document again.
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM handled WHERE status = ? AND batch_type = ? AND uuid = ?",
+                (status.value, batch_type.value, uuid))
+            self._connection.commit()
+            self._handled.get((status.value, batch_type.value), {}).pop(uuid, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(handled) for handled in self._handled.values())
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
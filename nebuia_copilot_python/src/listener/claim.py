@@ -0,0 +1,167 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.models import BatchType, Document, StatusDocument
+
+
+@dataclass
+class ClaimConfig:
+    """
+    Configures claim/lease mode for a listener.
+
+    Attributes:
+        claim_status (StatusDocument): Intermediate status a worker moves a document to
+            in order to take ownership of it. Defaults to ASSIGNED.
+        lease_timeout (float): Seconds a document may stay in `claim_status` before it is
+            considered abandoned and moved back to the listener status.
+        done_status (Optional[StatusDocument]): Status set after the handler succeeds. If None,
+            the handler is responsible for moving the document on.
+        verify (bool): Re-read the document before claiming it and skip it if another worker
+            already moved it out of the listener status, and re-read it after claiming it to
+            confirm it is still in `claim_status`.
+
+    Claims narrow the window in which two workers pick up the same document but do not
+    close it, so delivery is at-least-once and handlers should be idempotent.
+    """
+    claim_status: StatusDocument = StatusDocument.ASSIGNED
+    lease_timeout: float = 300.0
+    done_status: Optional[StatusDocument] = None
+    verify: bool = True
+
+
+class LeaseManager:
+    """
+    Claims documents for a single listener and requeues abandoned claims.
+
+    The API has no compare-and-set for statuses, so a claim is a re-read of the
+    document (when `verify` is enabled) followed by `set_document_status` to the
+    claim status and a second re-read. A worker that finds the document out of the
+    listener status before the update, out of the claim status after it, or whose
+    status update is rejected skips the document.
+
+    Statuses are shared by all workers, so two workers that read the document before
+    either of them updates it both hold the claim: delivery is at-least-once, not
+    exactly-once, and handlers must tolerate seeing a document twice.
+
+    Documents are requeued to the listener status when the handler fails, and by
+    `reap_expired` when they stay in the claim status for longer than the lease
+    timeout, which covers workers that died while holding a claim. All listeners
+    sharing a claim status should therefore have the same listener status.
+
+    Attributes:
+        api_client (APIClient): Client used to read and update documents.
+        status (StatusDocument): Status of the queue the listener consumes.
+        batch_type (BatchType): Batch type of the queue the listener consumes.
+        config (ClaimConfig): Claim settings.
+    """
+
+    def __init__(self, api_client: APIClient, status: StatusDocument, batch_type: BatchType, config: ClaimConfig):
+        self.api_client = api_client
+        self.status = status
+        self.batch_type = batch_type
+        self.config = config
+        self._held: Dict[str, float] = {}
+        self._first_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, doc: Document) -> bool:
+        """
+        Tries to take ownership of `doc`.
+
+        Returns:
+            bool: True if this worker now holds the document, False if the race was lost.
+        """
+        if self.config.verify:
+            current = self._read_status(doc.uuid)
+            if current != self.status.value:
+                if current is not None:
+                    logger.debug(f"document {doc.uuid} already taken ({current})")
+                return False
+
+        try:
+            claimed = self.api_client.set_document_status(uuid=doc.uuid, status=self.config.claim_status)
+        except requests.RequestException as e:
+            logger.warning(f"claim failed for document {doc.uuid}: {e}")
+            return False
+        if not claimed:
+            logger.debug(f"claim rejected for document {doc.uuid}")
+            return False
+        if self.config.verify:
+            current = self._read_status(doc.uuid)
+            if current is not None and current != self.config.claim_status.value:
+                # another worker finished the document between our read and our update
+                logger.debug(f"document {doc.uuid} moved on after the claim ({current})")
+                return False
+
+        with self._lock:
+            self._held[doc.uuid] = time.monotonic()
+        return True
+
+    def _read_status(self, uuid: str) -> Optional[str]:
+        """Current status of a document, or None if it could not be read."""
+        try:
+            return self.api_client.get_document_by_uuid(uuid).status_document
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.warning(f"could not read document {uuid}: {e}")
+            return None
+
+    def release(self, doc: Document, success: bool):
+        """
+        Gives up ownership of `doc`. On success the document is moved to `done_status`
+        when configured; on failure it is requeued to the listener status.
+        """
+        with self._lock:
+            self._held.pop(doc.uuid, None)
+        status = self.config.done_status if success else self.status
+        if status is None:
+            return
+        try:
+            self.api_client.set_document_status(uuid=doc.uuid, status=status)
+        except requests.RequestException as e:
+            # the document stays in the claim status until `reap_expired` requeues it
+            logger.warning(f"release failed for document {doc.uuid}: {e}")
+
+    def reap_expired(self, limit: int = 50) -> int:
+        """
+        Requeues documents that stayed in the claim status longer than the lease timeout.
+
+        Ages are measured from the first time this worker observed a document in the
+        claim status. Documents currently held by this worker are never reaped.
+
+        Returns:
+            int: Number of documents requeued.
+        """
+        now = time.monotonic()
+        visible = set()
+        expired = []
+        page = 1
+        while True:
+            documents = self.api_client.get_documents_by_status_and_batch(
+                status=self.config.claim_status, batch_type=self.batch_type, page=page, limit=limit)
+            for doc in documents.documents:
+                visible.add(doc.uuid)
+                first_seen = self._first_seen.setdefault(doc.uuid, now)
+                with self._lock:
+                    held = doc.uuid in self._held
+                if not held and now - first_seen >= self.config.lease_timeout:
+                    expired.append(doc.uuid)
+            if not documents.documents or page * limit >= documents.total:
+                break
+            page += 1
+
+        self._first_seen = {uuid: seen for uuid, seen in self._first_seen.items() if uuid in visible}
+
+        requeued = 0
+        for uuid in expired:
+            if self.api_client.set_document_status(uuid=uuid, status=self.status):
+                self._first_seen.pop(uuid, None)
+                requeued += 1
+        if requeued:
+            logger.info(f"requeued {requeued} expired leases to {self.status}")
+        return requeued
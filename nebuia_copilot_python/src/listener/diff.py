@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from nebuia_copilot_python.src.models import Document, Entity
+
+
+def _digest(*parts) -> bytes:
+    return hashlib.blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=8).digest()
+
+
+@dataclass
+class DocumentFingerprint:
+    """
+    Compact summary of a document used to detect changes between polls.
+
+    Attributes:
+        status (str): The document status.
+        reviewed_at (str): The last review timestamp.
+        entities_hash (bytes): Digest over all entity digests, to compare documents in one step.
+        entity_hashes (Dict[str, bytes]): 8-byte digest of each entity, keyed by entity id.
+    """
+    status: str
+    reviewed_at: str
+    entities_hash: bytes
+    entity_hashes: Dict[str, bytes]
+
+    @classmethod
+    def of(cls, doc: Document) -> "DocumentFingerprint":
+        entity_hashes = {
+            entity.id: _digest(entity.key, entity.value, entity.page, entity.id_core, entity.is_valid)
+            for entity in doc.entities or []
+        }
+        entities_hash = _digest(*(entity_hashes[key].hex() for key in sorted(entity_hashes)))
+        return cls(doc.status_document, doc.reviewed_at, entities_hash, entity_hashes)
+
+
+class ChangeDetector:
+    """
+    Remembers a fingerprint per document and reports which entities changed.
+
+    Fingerprints are kept for the `max_documents` most recently seen documents.
+    A document seen for the first time counts as changed in all of its entities
+    when `emit_initial` is True, and is only remembered otherwise. Removed
+    entities change the document fingerprint but are not reported.
+
+    Attributes:
+        max_documents (int): Maximum number of fingerprints kept.
+        emit_initial (bool): Report documents the detector has not seen before.
+    """
+
+    def __init__(self, max_documents: int = 100000, emit_initial: bool = True):
+        self.max_documents = max_documents
+        self.emit_initial = emit_initial
+        self._fingerprints: "OrderedDict[str, DocumentFingerprint]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def changes(self, doc: Document) -> Optional[Tuple[DocumentFingerprint, List[Entity]]]:
+        """
+        Compares `doc` with its last remembered fingerprint without updating it.
+
+        Returns:
+            Optional[Tuple[DocumentFingerprint, List[Entity]]]: None if the document is
+            unchanged, otherwise its new fingerprint and the added or modified entities.
+            Pass the fingerprint to `remember` once the change has been handled.
+        """
+        fingerprint = DocumentFingerprint.of(doc)
+        with self._lock:
+            previous = self._fingerprints.get(doc.uuid)
+            if previous is not None:
+                self._fingerprints.move_to_end(doc.uuid)
+
+        if previous is None:
+            if not self.emit_initial:
+                self.remember(doc.uuid, fingerprint)
+                return None
+            return fingerprint, list(doc.entities or [])
+
+        if (previous.status == fingerprint.status and previous.reviewed_at == fingerprint.reviewed_at
+                and previous.entities_hash == fingerprint.entities_hash):
+            return None
+
+        changed = [
+            entity for entity in doc.entities or []
+            if previous.entity_hashes.get(entity.id) != fingerprint.entity_hashes[entity.id]
+        ]
+        return fingerprint, changed
+
+    def remember(self, uuid: str, fingerprint: DocumentFingerprint):
+        with self._lock:
+            self._fingerprints[uuid] = fingerprint
+            self._fingerprints.move_to_end(uuid)
+            while len(self._fingerprints) > self.max_documents:
+                self._fingerprints.popitem(last=False)
+
+    def forget(self, uuid: str):
+        with self._lock:
+            self._fingerprints.pop(uuid, None)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
@@ -1,28 +1,91 @@
 import sys
 import threading
 import signal
-from typing import Callable
+from typing import Callable, List, Optional
 from loguru import logger
 from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.listener.batching import MicroBatcher
+from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+from nebuia_copilot_python.src.listener.claim import ClaimConfig
 from nebuia_copilot_python.src.listener.manager import ThreadedListenerManager
-from nebuia_copilot_python.src.models import BatchType, StatusDocument
+from nebuia_copilot_python.src.listener.metrics import MetricsServer
+from nebuia_copilot_python.src.listener.push import PushNotificationReceiver
+from nebuia_copilot_python.src.logging_policy import log_payload
+from nebuia_copilot_python.src.models import BatchType, Document, Entity, StatusDocument
 
 class ListenerIntegrator:
-    def __init__(self, api_client: APIClient):
-        self.manager = ThreadedListenerManager(api_client)
+    def __init__(self, api_client: APIClient, workers: int = 2, handle_signals: bool = True):
+        self.manager = ThreadedListenerManager(api_client, workers=workers, handle_signals=handle_signals)
         self.on_document_handler = None
+        self.on_documents_handler = None
+        self.on_document_changed_handler = None
+        self.batcher = None
         self.on_listener_start_handler = None
         self.on_listener_stop_handler = None
         self.on_all_complete_handler = None
+        self.push_receiver = None
+        self._handlers_installed = False
         self.run_thread = None
         self._stop_event = threading.Event()
 
-    def add_listener(self, status: StatusDocument, batch_type: BatchType, interval: int, limit_documents: int):
-        self.manager.add_listener(status, batch_type, interval, limit_documents)
+    def add_listener(self, status: StatusDocument, batch_type: BatchType, interval: int, limit_documents: int,
+                     drain: bool = False, max_pages: Optional[int] = None, cycle_budget: Optional[float] = None,
+                     claim: Optional[ClaimConfig] = None, detect_changes: bool = False):
+        return self.manager.add_listener(status, batch_type, interval, limit_documents,
+                                         drain=drain, max_pages=max_pages, cycle_budget=cycle_budget, claim=claim,
+                                         detect_changes=detect_changes)
+
+    def use_checkpoints(self, path: str, max_age: Optional[float] = 7 * 24 * 3600) -> CheckpointStore:
+        store = CheckpointStore(path, max_age=max_age)
+        self.manager.set_checkpoint_store(store)
+        return store
+
+    def metrics(self) -> List[dict]:
+        """
+        Returns a snapshot of the poll, backlog and handler metrics of every listener.
+        """
+        return self.manager.metrics.snapshot()
+
+    def serve_metrics(self, host: str = "127.0.0.1", port: int = 0) -> MetricsServer:
+        """
+        Starts an HTTP endpoint exposing the listener metrics in Prometheus text format.
+        """
+        server = MetricsServer(self.manager.metrics, host=host, port=port)
+        server.start()
+        return server
+
+    def enable_push(self, host: str = "127.0.0.1", port: int = 0, path: str = "/notifications",
+                    token: Optional[str] = None) -> PushNotificationReceiver:
+        self.push_receiver = PushNotificationReceiver(self.manager, host=host, port=port, path=path, token=token)
+        return self.push_receiver
 
     def set_on_document_handler(self, handler: Callable[[StatusDocument, dict], None]):
         self.on_document_handler = handler
 
+    def set_on_documents_handler(self, handler: Callable[[StatusDocument, List[Document]], None],
+                                 max_size: Optional[int] = None, max_wait: Optional[float] = None):
+        """
+        Sets a handler receiving documents in batches instead of one at a time.
+
+        Without `max_size` and `max_wait` the handler is called once per dispatched page.
+        With either of them, documents are micro-batched per status across pages, cycles
+        and listeners, and the handler is called when a batch reaches `max_size` documents
+        or its oldest document has waited `max_wait` seconds (1 s if only `max_size` is set).
+
+        Documents are acknowledged (checkpoints) and their claims released only after the
+        handler returns for their batch. If it raises, claims are requeued and nothing is
+        acknowledged, so the documents are delivered again.
+        """
+        self.on_documents_handler = handler
+        self.manager.set_settle_after_batch(handler is not None)
+        if max_size is None and max_wait is None:
+            self.batcher = None
+        else:
+            self.batcher = MicroBatcher(handler, max_size=max_size, max_wait=max_wait if max_wait is not None else 1.0)
+
+    def set_on_document_changed_handler(self, handler: Callable[[StatusDocument, Document, List[Entity]], None]):
+        self.on_document_changed_handler = handler
+
     def set_on_listener_start_handler(self, handler: Callable[[StatusDocument], None]):
         self.on_listener_start_handler = handler
 
@@ -35,8 +98,20 @@ class ListenerIntegrator:
     def on_document(self, status, doc):
         if self.on_document_handler:
             self.on_document_handler(status, doc)
-        else:
-            logger.info(f"new document from {status}: {doc}")
+        elif not self.on_documents_handler and not self.on_document_changed_handler:
+            log_payload(f"new document from {status}", doc)
+
+    def on_document_changed(self, status, doc, changed_entities):
+        if self.on_document_changed_handler:
+            self.on_document_changed_handler(status, doc, changed_entities)
+
+    def on_documents(self, status, documents, settle=None):
+        if self.batcher is not None:
+            self.batcher.add(status, documents, settle)
+        elif self.on_documents_handler:
+            self.on_documents_handler(status, documents)
+            if settle is not None:
+                settle(documents, True)
 
     def on_listener_start(self, status):
         if self.on_listener_start_handler:
@@ -57,34 +132,52 @@ class ListenerIntegrator:
             logger.info("all listeners have completed their work")
 
     def setup_event_handlers(self):
+        if self._handlers_installed:
+            return
+        self._handlers_installed = True
         self.manager.events.on_document += self.on_document
+        self.manager.events.on_documents += self.on_documents
+        self.manager.events.on_document_changed += self.on_document_changed
         self.manager.events.on_listener_start += self.on_listener_start
         self.manager.events.on_listener_stop += self.on_listener_stop
         self.manager.events.on_all_complete += self.on_all_complete
 
     def run(self):
+        self.manager.stop_flag.clear()
+        self._run()
+
+    def _run(self):
         self.setup_event_handlers()
+        batcher = self.batcher
+        if batcher is not None:
+            batcher.start()
+        if self.push_receiver is not None:
+            self.push_receiver.start()
         try:
             self.manager.run()
         except Exception as e:
             logger.error(f"exception in manager run: {e}")
         finally:
+            if self.push_receiver is not None:
+                self.push_receiver.stop()
+            if batcher is not None:
+                batcher.stop()
             self._stop_event.set()
             logger.info("listeners exited.")
 
     def start(self):
         if self.run_thread is None or not self.run_thread.is_alive():
             self._stop_event.clear()
-            self.run_thread = threading.Thread(target=self.run)
+            self.manager.stop_flag.clear()
+            self.run_thread = threading.Thread(target=self._run)
             self.run_thread.start()
         else:
             logger.warning("listeners already running.")
 
-    def stop(self):
+    def stop(self, timeout: Optional[float] = None):
         if self.run_thread and self.run_thread.is_alive():
             logger.info("stopping manager...")
-            self._stop_event.set()
-            self.manager.stop_all_listeners()
-            self.run_thread.join(timeout=5)
+            self.manager.stop()
+            self.run_thread.join(timeout)
         else:
             logger.warning("listeners not started or already stopped.")
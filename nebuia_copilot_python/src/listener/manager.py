@@ -1,73 +1,388 @@
+import random
 import signal
 import time
 import threading
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from loguru import logger
 from events import Events
 from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+from nebuia_copilot_python.src.listener.claim import ClaimConfig, LeaseManager
+from nebuia_copilot_python.src.listener.diff import ChangeDetector
+from nebuia_copilot_python.src.listener.metrics import ListenerMetrics, ListenerStats
+from nebuia_copilot_python.src.listener.scheduler import ListenerScheduler
 from nebuia_copilot_python.src.models import BatchType, StatusDocument
 
+class _HandlerFailed(Exception):
+    """
+    Carries a handler exception out of a poll cycle, which already counted it as a handler error.
+    """
+
 class ListenerEvents(Events):
-    __events__ = ('on_document', 'on_error', 'on_complete')
+    __events__ = ('on_document', 'on_documents', 'on_document_changed', 'on_error', 'on_complete')
 
 class ThreadedEventBasedListener:
-    def __init__(self, api_client: APIClient, status: StatusDocument, batchType: BatchType, interval: int, limit_documents: int):
+    """
+    Polls documents with a given status and batch type and emits them as events.
+
+    By default a poll cycle fetches only the first page of `limit_documents`
+    documents. In drain mode the cycle keeps following pagination, using the
+    returned `total`, until the backlog is consumed or the per-cycle budget
+    (`max_pages` pages or `cycle_budget` seconds) runs out. Documents are
+    dispatched page by page as they arrive.
+
+    In claim mode each document is claimed through a LeaseManager before it is
+    dispatched, so several workers can share the same queue without handling the
+    same document twice. Documents whose handler raises are requeued.
+
+    With a CheckpointStore, every successfully handled document is acknowledged
+    and skipped by later cycles, including after a restart, until a poll shows that
+    it left the status. A page holding only skipped documents does not end the cycle,
+    even without drain mode, so handled documents that stay in the status cannot hide
+    the ones behind them; the same applies to unchanged documents in change-detection
+    mode.
+
+    Besides one `on_document(status, doc)` event per document, every dispatched
+    page emits `on_documents(status, documents)` with the documents that were
+    delivered, after their claims and checkpoints have been settled. With
+    `settle_after_batch`, a batch handler consumes the documents instead: the event
+    also carries a `settle(documents, success)` callback, and documents are only
+    acknowledged and released once the batch handler has run. A failed batch releases
+    its claims with `success=False`, so the documents are delivered again.
+
+    In change-detection mode a ChangeDetector keeps a fingerprint per document and
+    only documents that changed since they were last handled are dispatched. Each of
+    them also emits `on_document_changed(status, doc, changed_entities)`. Checkpoints
+    are ignored in this mode, since they would hide later edits.
+
+    Attributes:
+        drain (bool): Follow pagination within a poll cycle.
+        max_pages (Optional[int]): Maximum pages fetched per cycle in drain mode.
+        cycle_budget (Optional[float]): Maximum seconds spent per cycle in drain mode.
+        leases (Optional[LeaseManager]): Claims documents when claim mode is enabled.
+        checkpoint (Optional[CheckpointStore]): Records handled documents when set.
+        changes (Optional[ChangeDetector]): Detects modified documents when change detection is enabled.
+        stats (ListenerStats): Poll, backlog and handler metrics of this listener, registered in
+            `metrics` when given.
+        settle_after_batch (bool): Defer acknowledgements and lease releases until the batch
+            handler has settled the documents.
+        stop_event (threading.Event): Shutdown signal. Waits between cycles, drained pages and
+            dispatched documents are interrupted as soon as it is set. A manager shares its
+            own event with all of its listeners.
+    """
+
+    def __init__(self, api_client: APIClient, status: StatusDocument, batchType: BatchType, interval: int, limit_documents: int,
+                 drain: bool = False, max_pages: Optional[int] = None, cycle_budget: Optional[float] = None,
+                 claim: Optional[ClaimConfig] = None, checkpoint: Optional[CheckpointStore] = None,
+                 stop_event: Optional[threading.Event] = None, detect_changes: bool = False,
+                 metrics: Optional[ListenerMetrics] = None):
         self.api_client = api_client
         self.status = status
         self.batch_type = batchType
         self.interval = interval
         self.limit_documents = limit_documents
-        self.stop_flag = False
+        self.drain = drain
+        self.max_pages = max_pages
+        self.cycle_budget = cycle_budget
+        self.leases = LeaseManager(api_client, status, batchType, claim) if claim else None
+        self.checkpoint = checkpoint
+        self.changes = ChangeDetector() if detect_changes else None
+        self.stats = metrics.for_listener(status, batchType) if metrics is not None else ListenerStats(status, batchType)
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        self.settle_after_batch = False
         self.thread = None
         self.events = ListenerEvents()
+        self._unsettled = set()
+        self._unsettled_lock = threading.Lock()
+        # poll cycles and push deliveries run on different threads
+        self._dispatch_lock = threading.RLock()
+
+    @property
+    def stop_flag(self) -> bool:
+        return self.stop_event.is_set()
 
-    def fetch_documents(self):
+    @stop_flag.setter
+    def stop_flag(self, value: bool):
+        if value:
+            self.stop_event.set()
+        else:
+            self.stop_event.clear()
+
+    def fetch_documents(self, page: int = 1):
         documents = self.api_client.get_documents_by_status_and_batch(
             status=self.status,
             batch_type=self.batch_type,
+            page=page,
             limit=self.limit_documents
         )
         return documents
 
-    def run(self):
-        while not self.stop_flag:
+    def _cycle_exhausted(self, pages: int, started: float) -> bool:
+        if self.stop_event.is_set():
+            return True
+        if self.max_pages is not None and pages >= self.max_pages:
+            return True
+        if self.cycle_budget is not None and time.monotonic() - started >= self.cycle_budget:
+            return True
+        return False
+
+    def poll(self):
+        """
+        Runs a single poll cycle: fetches documents and dispatches them to the handlers.
+        Errors are reported through the `on_error` event instead of being raised.
+        """
+        started = time.monotonic()
+        seen = set()
+        page = 1
+        pages = 0
+        last_total = None
+        try:
+            while True:
+                fetch_started = time.monotonic()
+                documents = self.fetch_documents(page)
+                self.stats.observe_poll(time.monotonic() - fetch_started, documents.total)
+                pages += 1
+                if page == 1:
+                    self._retain_checkpoints(documents)
+                fresh = [doc for doc in documents.documents if doc.uuid not in seen]
+                seen.update(doc.uuid for doc in fresh)
+                dispatched = self._dispatch(fresh)
+
+                # a page holding only documents handled in earlier cycles would hide the
+                # rest of the queue forever; move on to the next page even without drain
+                covered = bool(fresh) and not dispatched
+                if not (self.drain or covered) or not documents.documents or self._cycle_exhausted(pages, started):
+                    break
+
+                # handlers usually move documents out of the status, which shifts the
+                # offsets of later pages; restart from the first page while the queue shrinks
+                if fresh and last_total is not None and documents.total < last_total:
+                    page = 1
+                else:
+                    page += 1
+                last_total = documents.total
+
+                if (page - 1) * self.limit_documents >= documents.total:
+                    break
+        except Exception as e:
+            if not isinstance(e, _HandlerFailed):
+                self.stats.observe_poll_error()
+            self.events.on_error(str(e))
+
+    def deliver(self, documents):
+        """
+        Dispatches documents obtained outside the poll cycle, e.g. from push notifications.
+        Waits for a dispatch already running in the poll cycle, so a document is never handled
+        twice concurrently. Errors are reported through the `on_error` event instead of being raised.
+        """
+        try:
+            self._dispatch(documents)
+        except Exception as e:
+            self.events.on_error(str(e))
+
+    def _dispatch(self, documents) -> int:
+        with self._dispatch_lock:
+            return self._dispatch_locked(documents)
+
+    def _dispatch_locked(self, documents) -> int:
+        """
+        Returns the number of documents left to handle once the unsettled, changed and
+        checkpointed filters were applied.
+        """
+        pending = {}
+        with self._unsettled_lock:
+            # documents still waiting for the batch handler are not dispatched twice
+            documents = [doc for doc in documents if doc.uuid not in self._unsettled]
+        if self.changes is not None:
+            for doc in documents:
+                change = self.changes.changes(doc)
+                if change is not None:
+                    pending[doc.uuid] = change
+            documents = [doc for doc in documents if doc.uuid in pending]
+        elif self.checkpoint is not None:
+            documents = [doc for doc in documents if not self.checkpoint.is_handled(self.status, self.batch_type, doc.uuid)]
+
+        if not documents:
+            return 0
+        deferred = self.settle_after_batch
+        delivered = []
+        try:
+            if self.leases is None:
+                for doc in documents:
+                    if self.stop_event.is_set():
+                        break
+                    self._emit(doc, pending)
+                    if not deferred:
+                        self._acknowledge(doc)
+                    delivered.append(doc)
+            else:
+                self._dispatch_claimed(documents, pending, delivered, deferred)
+        finally:
+            if delivered and deferred:
+                with self._unsettled_lock:
+                    self._unsettled.update(doc.uuid for doc in delivered)
+                try:
+                    self.events.on_documents(self.status, delivered, self.settle)
+                except Exception as e:
+                    self.settle(delivered, False)
+                    self.events.on_error(f"batch handler failed for {len(delivered)} documents: {e}")
+            elif delivered:
+                self.events.on_documents(self.status, delivered)
+        return len(documents)
+
+    def settle(self, documents, success: bool):
+        """
+        Completes documents handed to a batch handler in `settle_after_batch` mode: on success
+        they are acknowledged and their claims released to `done_status`; on failure their
+        claims are requeued and, in change-detection mode, their fingerprints forgotten, so
+        that they are delivered again. Documents already settled are ignored.
+        """
+        with self._unsettled_lock:
+            documents = [doc for doc in documents if doc.uuid in self._unsettled]
+            self._unsettled.difference_update(doc.uuid for doc in documents)
+        for doc in documents:
             try:
-                documents = self.fetch_documents()
-                for doc in documents.documents:
-                    self.events.on_document(self.status, doc)
+                if self.leases is not None:
+                    self.leases.release(doc, success=success)
+                if success:
+                    self._acknowledge(doc)
+                elif self.changes is not None:
+                    self.changes.forget(doc.uuid)
             except Exception as e:
-                self.events.on_error(str(e))
-            time.sleep(self.interval)
+                self.events.on_error(f"failed to settle document {doc.uuid}: {e}")
+
+    def _emit(self, doc, pending):
+        started = time.monotonic()
+        try:
+            self.events.on_document(self.status, doc)
+            change = pending.get(doc.uuid)
+            if change is not None:
+                fingerprint, changed_entities = change
+                self.events.on_document_changed(self.status, doc, changed_entities)
+                self.changes.remember(doc.uuid, fingerprint)
+        except Exception as e:
+            self.stats.observe_handler(time.monotonic() - started, failed=True)
+            raise _HandlerFailed(e) from e
+        self.stats.observe_handler(time.monotonic() - started)
+
+    def _dispatch_claimed(self, documents, pending, delivered, deferred=False):
+        # workers polling the same queue see the same page; visiting it in a
+        # random order makes them contend for different documents first
+        documents = list(documents)
+        random.shuffle(documents)
+        for doc in documents:
+            if self.stop_event.is_set():
+                return
+            if not self.leases.claim(doc):
+                continue
+            try:
+                self._emit(doc, pending)
+            except Exception as e:
+                self.leases.release(doc, success=False)
+                self.events.on_error(f"handler failed for document {doc.uuid}: {e}")
+            else:
+                if not deferred:
+                    self.leases.release(doc, success=True)
+                    self._acknowledge(doc)
+                delivered.append(doc)
+
+    def _retain_checkpoints(self, documents):
+        # a first page holding the whole queue shows which handled documents left the status
+        if self.checkpoint is not None and self.changes is None and len(documents.documents) >= documents.total:
+            self.checkpoint.retain(self.status, self.batch_type, (doc.uuid for doc in documents.documents))
+
+    def _acknowledge(self, doc):
+        if self.checkpoint is not None and self.changes is None:
+            self.checkpoint.acknowledge(self.status, self.batch_type, doc.uuid)
+
+    def reap_expired_leases(self):
+        try:
+            self.leases.reap_expired(limit=self.limit_documents)
+        except Exception as e:
+            self.events.on_error(str(e))
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.poll()
+            self.stop_event.wait(self.interval)
         self.events.on_complete(self.status)
 
     def start(self):
         if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
             self.thread = threading.Thread(target=self.run)
             self.thread.start()
 
     def stop(self):
-        self.stop_flag = True
+        self.stop_event.set()
         if self.thread and self.thread.is_alive():
             self.thread.join()
 
 class ManagerEvents(Events):
-    __events__ = ('on_document', 'on_listener_start', 'on_listener_stop', 'on_all_complete')
+    __events__ = ('on_document', 'on_documents', 'on_document_changed', 'on_listener_start', 'on_listener_stop', 'on_all_complete')
 
 class ThreadedListenerManager:
-    def __init__(self, api_client: APIClient):
+    """
+    Manages listeners for any number of (status, batch_type) subscriptions.
+
+    Listeners do not own threads: their poll cycles are driven by a shared
+    ListenerScheduler, so many subscriptions run on a small, fixed worker pool.
+
+    `stop_flag` is the central shutdown signal. It is shared with every listener and
+    `run` blocks on it, so `stop()` interrupts all waits at once and shutdown only
+    waits for the document being handled, regardless of the polling intervals.
+
+    Attributes:
+        listeners (Dict[Tuple[StatusDocument, BatchType], ThreadedEventBasedListener]):
+            Registered listeners keyed by (status, batch_type).
+        scheduler (ListenerScheduler): Timer heap executing the poll cycles.
+        checkpoint (Optional[CheckpointStore]): Store shared by all listeners to skip
+            documents handled before a restart.
+        metrics (ListenerMetrics): Poll, backlog and handler metrics of every listener.
+
+    A SIGINT handler that stops the manager is installed unless `handle_signals` is
+    False or the manager is created outside the main thread. Applications with their
+    own signal handling, such as asyncio services, should pass False or use
+    AsyncListenerManager.
+    """
+
+    def __init__(self, api_client: APIClient, workers: int = 2, checkpoint: Optional[CheckpointStore] = None,
+                 handle_signals: bool = True):
         self.api_client = api_client
-        self.listeners: Dict[StatusDocument, ThreadedEventBasedListener] = {}
+        self.checkpoint = checkpoint
+        self.metrics = ListenerMetrics()
+        self.listeners: Dict[Tuple[StatusDocument, BatchType], ThreadedEventBasedListener] = {}
+        self.scheduler = ListenerScheduler(workers=workers)
         self.events = ManagerEvents()
         self.stop_flag = threading.Event()
-        signal.signal(signal.SIGINT, self._signal_handler)
+        self.settle_after_batch = False
+        # signal handlers can only be installed from the main thread
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._signal_handler)
 
-    def add_listener(self, status: StatusDocument, batchType: BatchType, interval: int, limit_documents: int) -> ThreadedEventBasedListener:
+    def add_listener(self, status: StatusDocument, batchType: BatchType, interval: int, limit_documents: int,
+                     drain: bool = False, max_pages: Optional[int] = None, cycle_budget: Optional[float] = None,
+                     claim: Optional[ClaimConfig] = None, detect_changes: bool = False) -> ThreadedEventBasedListener:
         listener = ThreadedEventBasedListener(
             self.api_client, status=status, batchType=batchType, interval=interval,
-            limit_documents=limit_documents
+            limit_documents=limit_documents, drain=drain, max_pages=max_pages, cycle_budget=cycle_budget,
+            claim=claim, checkpoint=self.checkpoint, stop_event=self.stop_flag, detect_changes=detect_changes,
+            metrics=self.metrics
         )
-        self.listeners[status] = listener
+        listener.settle_after_batch = self.settle_after_batch
+        key = (status, batchType)
+        if key in self.listeners:
+            logger.warning(f"replacing listener for {status} ({batchType})")
+            for job in self._jobs_for(key, self.listeners[key]):
+                self.scheduler.cancel(job[0])
+        self.listeners[key] = listener
+        if self.scheduler.is_running():
+            for job_key, interval, callback in self._jobs_for(key, listener):
+                self.scheduler.schedule(job_key, interval, callback)
+            self.events.on_listener_start(status)
         listener.events.on_document += self.on_listener_document
+        listener.events.on_documents += self.on_listener_documents
+        listener.events.on_document_changed += self.on_listener_document_changed
         listener.events.on_error += lambda e: logger.error(f"Listener error: {e}")
         listener.events.on_complete += lambda s: self.events.on_listener_stop(s)
         return listener
@@ -75,21 +390,57 @@ class ThreadedListenerManager:
     def on_listener_document(self, status, doc):
         self.events.on_document(status, doc)
 
+    def on_listener_documents(self, status, documents, *settle):
+        self.events.on_documents(status, documents, *settle)
+
+    def on_listener_document_changed(self, status, doc, changed_entities):
+        self.events.on_document_changed(status, doc, changed_entities)
+
+    def set_settle_after_batch(self, enabled: bool):
+        """
+        Makes every listener wait for the batch handler before acknowledging documents.
+        """
+        self.settle_after_batch = enabled
+        for listener in self.listeners.values():
+            listener.settle_after_batch = enabled
+
+    def set_checkpoint_store(self, checkpoint: Optional[CheckpointStore]):
+        self.checkpoint = checkpoint
+        for listener in self.listeners.values():
+            listener.checkpoint = checkpoint
+
+    def _jobs_for(self, key, listener: ThreadedEventBasedListener):
+        jobs = [(key, listener.interval, listener.poll)]
+        if listener.leases is not None:
+            reap_interval = max(listener.interval, listener.leases.config.lease_timeout / 2)
+            jobs.append((key + ('leases',), reap_interval, listener.reap_expired_leases))
+        return jobs
+
     def start_all_listeners(self):
-        for status, listener in self.listeners.items():
-            listener.start()
+        self.scheduler.schedule_spread([
+            job for key, listener in self.listeners.items() for job in self._jobs_for(key, listener)
+        ])
+        self.scheduler.start()
+        for status, _ in self.listeners:
             self.events.on_listener_start(status)
 
     def stop_all_listeners(self):
-        for status, listener in self.listeners.items():
-            listener.stop()
-            self.events.on_listener_stop(status)
+        if not self.scheduler.is_running():
+            return
+        self.scheduler.stop()
+        for listener in self.listeners.values():
+            listener.events.on_complete(listener.status)
+
+    def stop(self):
+        """
+        Signals `run` to stop all listeners and return.
+        """
+        self.stop_flag.set()
 
     def run(self):
         self.start_all_listeners()
         try:
-            while not self.stop_flag.is_set():
-                time.sleep(0.1)
+            self.stop_flag.wait()
         except KeyboardInterrupt:
             logger.info("keyboard interrupt received.")
         finally:
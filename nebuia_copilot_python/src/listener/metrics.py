@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+from nebuia_copilot_python.src.stats import LatencyHistogram
+
+# upper bounds, in seconds, of the histogram buckets exported to Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class ListenerStats:
+    """
+    Counters, gauges and histograms of a single (status, batch_type) listener.
+
+    Attributes:
+        polls (int): Pages fetched.
+        poll_errors (int): Failed poll cycles.
+        documents (int): Documents dispatched to handlers.
+        handler_errors (int): Handler calls that raised.
+        backlog (int): `total` reported by the last fetched page.
+        last_poll (Optional[float]): Unix time of the last fetched page.
+        poll_latency (LatencyHistogram): Seconds per page fetch, including decoding.
+        handler_latency (LatencyHistogram): Seconds per document spent in the handlers.
+    """
+
+    RATE_WINDOW = 60.0
+
+    def __init__(self, status: StatusDocument, batch_type: BatchType):
+        self.status = status
+        self.batch_type = batch_type
+        self.polls = 0
+        self.poll_errors = 0
+        self.documents = 0
+        self.handler_errors = 0
+        self.backlog = 0
+        self.last_poll: Optional[float] = None
+        self.poll_latency = LatencyHistogram()
+        self.handler_latency = LatencyHistogram()
+        self._recent: deque = deque()
+        self._lock = threading.Lock()
+
+    def observe_poll(self, seconds: float, total: int):
+        with self._lock:
+            self.polls += 1
+            self.backlog = total
+            self.last_poll = time.time()
+            self.poll_latency.record(seconds)
+
+    def observe_poll_error(self):
+        with self._lock:
+            self.poll_errors += 1
+
+    def observe_handler(self, seconds: float, failed: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            self.handler_latency.record(seconds)
+            if failed:
+                self.handler_errors += 1
+                return
+            self.documents += 1
+            self._recent.append(now)
+            self._prune(now)
+
+    def _prune(self, now: float):
+        # keeps `_recent` bounded to the rate window even when nothing reads the rate
+        horizon = now - self.RATE_WINDOW
+        while self._recent and self._recent[0] < horizon:
+            self._recent.popleft()
+
+    def documents_per_second(self) -> float:
+        """
+        Rate of successfully handled documents over the last minute.
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            return len(self._recent) / self.RATE_WINDOW
+
+    def snapshot(self) -> dict:
+        rate = self.documents_per_second()
+        with self._lock:
+            handled = self.documents + self.handler_errors
+            return {
+                "status": self.status.value,
+                "batch_type": self.batch_type.value,
+                "polls": self.polls,
+                "poll_errors": self.poll_errors,
+                "documents": self.documents,
+                "handler_errors": self.handler_errors,
+                "handler_error_rate": self.handler_errors / handled if handled else 0.0,
+                "documents_per_second": rate,
+                "backlog": self.backlog,
+                "last_poll": self.last_poll,
+                "poll_latency": self.poll_latency.snapshot(),
+                "handler_latency": self.handler_latency.snapshot(),
+            }
+
+
+class ListenerMetrics:
+    """
+    Registry of ListenerStats, keyed by (status, batch_type).
+
+    Stats are readable in-process through `snapshot()` and exportable in the
+    Prometheus text format through `render_prometheus()` or a MetricsServer, with
+    latency histograms bucketed on `DEFAULT_BUCKETS`.
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[StatusDocument, BatchType], ListenerStats] = {}
+        self._lock = threading.Lock()
+
+    def for_listener(self, status: StatusDocument, batch_type: BatchType) -> ListenerStats:
+        key = (status, batch_type)
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, ListenerStats(status, batch_type))
+        return stats
+
+    def snapshot(self) -> List[dict]:
+        return [stats.snapshot() for stats in list(self._stats.values())]
+
+    def render_prometheus(self) -> str:
+        lines = []
+        all_stats = list(self._stats.values())
+
+        def metric(name: str, kind: str, help_text: str, values):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stats in all_stats:
+                lines.append(f"{name}{{{_labels(stats)}}} {values(stats)}")
+
+        def histogram(name: str, help_text: str, attribute: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for stats in all_stats:
+                labels = _labels(stats)
+                with stats._lock:
+                    hist = getattr(stats, attribute)
+                    cumulative, total_sum, total_count = hist.cumulative(DEFAULT_BUCKETS), hist.total, hist.count
+                for bound, bucket_count in zip(DEFAULT_BUCKETS, cumulative):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {total_count}')
+                lines.append(f"{name}_sum{{{labels}}} {total_sum}")
+                lines.append(f"{name}_count{{{labels}}} {total_count}")
+
+        metric("nebuia_listener_polls_total", "counter", "Pages fetched by the listener.", lambda s: s.polls)
+        metric("nebuia_listener_poll_errors_total", "counter", "Failed poll cycles.", lambda s: s.poll_errors)
+        metric("nebuia_listener_documents_total", "counter", "Documents handled successfully.", lambda s: s.documents)
+        metric("nebuia_listener_handler_errors_total", "counter", "Handler calls that raised.", lambda s: s.handler_errors)
+        metric("nebuia_listener_backlog", "gauge", "Total documents reported by the last poll.", lambda s: s.backlog)
+        metric("nebuia_listener_documents_per_second", "gauge", "Documents handled per second over the last minute.",
+               lambda s: s.documents_per_second())
+        metric("nebuia_listener_last_poll_timestamp_seconds", "gauge", "Unix time of the last poll.",
+               lambda s: s.last_poll or 0)
+        histogram("nebuia_listener_poll_duration_seconds", "Page fetch latency.", "poll_latency")
+        histogram("nebuia_listener_handler_duration_seconds", "Handler latency per document.", "handler_latency")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(stats: ListenerStats) -> str:
+    return f'status="{stats.status.value}",batch_type="{stats.batch_type.value}"'
+
+
+class MetricsServer:
+    """
+    Serves `ListenerMetrics.render_prometheus()` on http://host:port/metrics.
+    """
+
+    def __init__(self, metrics: ListenerMetrics, host: str = "127.0.0.1", port: int = 0):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self):
+        if self._server is not None:
+            return
+        metrics = self.metrics
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                         name="listener-metrics", daemon=True).start()
+        logger.info(f"listener metrics served on {self.url}")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
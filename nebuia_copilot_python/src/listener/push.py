@@ -0,0 +1,231 @@
+import ipaddress
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Set, Tuple
+
+import requests
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.listener.manager import ThreadedListenerManager
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+TOKEN_HEADER = "X-Nebuia-Token"
+
+
+class PushNotificationReceiver:
+    """
+    Embedded HTTP endpoint that receives document-status notifications.
+
+    Notifications are POSTed as JSON to `path`, either a single object or a list:
+
+        {"uuid": "...", "status": "complete_qa", "batch_type": "execution", "document": {...}}
+
+    `batch_type` and `document` are optional. Without `batch_type` the notification is
+    delivered to every listener registered for the status; without `document` the
+    document is fetched with `get_document_by_uuid`. Notifications for statuses with no
+    registered listener are ignored, and so are documents that are no longer in the
+    notified status, e.g. because a poll already handled them.
+
+    Embedded documents are only used when the receiver requires a token or binds to a
+    loopback interface; otherwise anyone able to reach it could inject document contents,
+    so the document is fetched from the API instead. Binding elsewhere without a token
+    logs a warning.
+
+    Requests are answered with 202 as soon as they are queued, and a single dispatcher
+    thread feeds the documents into the matching listeners, so they go through the same
+    pipeline as polled documents (checkpoints, claims and `on_document` handlers), one
+    dispatch at a time per listener. A notification repeated while the previous one for
+    the same document and status is still queued is dropped. The listeners keep polling,
+    which acts as a reconciliation fallback for lost notifications; their interval can be
+    raised accordingly.
+
+    Attributes:
+        manager (ThreadedListenerManager): Manager owning the listeners to feed.
+        host (str): Interface to bind. Defaults to 127.0.0.1.
+        port (int): Port to bind. 0 picks a free port, see `url`.
+        path (str): Path accepting notifications.
+        token (Optional[str]): If set, requests must carry it in the X-Nebuia-Token header.
+    """
+
+    def __init__(self, manager: ThreadedListenerManager, host: str = "127.0.0.1", port: int = 0,
+                 path: str = "/notifications", token: Optional[str] = None):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.path = path
+        self.token = token
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._queued: Set[Tuple[str, str]] = set()
+        self._queued_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._dispatch_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    @property
+    def trusts_embedded_documents(self) -> bool:
+        return self.token is not None or _is_loopback(self.host)
+
+    def start(self):
+        if self._server is not None:
+            logger.warning("push receiver already running.")
+            return
+        if not self.trusts_embedded_documents:
+            logger.warning(f"push receiver bound to {self.host} without a token: anyone reaching it can "
+                           f"trigger document fetches; embedded documents are ignored.")
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._server_thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                               name="push-receiver", daemon=True)
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, name="push-dispatcher", daemon=True)
+        self._server_thread.start()
+        self._dispatch_thread.start()
+        logger.info(f"push receiver listening on {self.url}")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._queue.put(None)
+        self._dispatch_thread.join()
+        self._server = None
+        logger.info("push receiver stopped")
+
+    def submit(self, notification: dict):
+        """
+        Queues a notification for dispatch, as if it had been received over HTTP.
+
+        Raises:
+            ValueError: If the notification has no uuid or an unknown status.
+        """
+        self._validate(notification)
+        self._enqueue(notification)
+
+    def _enqueue(self, notification: dict):
+        key = (notification['uuid'], notification['status'])
+        with self._queued_lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+        self._queue.put(notification)
+
+    @staticmethod
+    def _validate(notification: dict):
+        if 'uuid' not in notification:
+            raise ValueError("notification without uuid")
+        StatusDocument(notification['status'])
+        if notification.get('batch_type') is not None:
+            BatchType(notification['batch_type'])
+
+    def _dispatch_loop(self):
+        while True:
+            notification = self._queue.get()
+            if notification is None:
+                return
+            with self._queued_lock:
+                self._queued.discard((notification['uuid'], notification['status']))
+            try:
+                self._dispatch(notification)
+            except Exception as e:
+                logger.error(f"failed to dispatch notification for {notification.get('uuid')}: {e}")
+
+    def _dispatch(self, notification: dict):
+        status = StatusDocument(notification['status'])
+        batch_type = notification.get('batch_type')
+        listeners = [
+            listener for (listener_status, listener_batch), listener in list(self.manager.listeners.items())
+            if listener_status == status and (batch_type is None or listener_batch.value == batch_type)
+        ]
+        if not listeners:
+            logger.debug(f"no listener for notification {notification['uuid']} ({status})")
+            return
+
+        if notification.get('document') and self.trusts_embedded_documents:
+            doc = APIClient.parse_document(notification['document'])
+        else:
+            doc = self.manager.api_client.get_document_by_uuid(notification['uuid'])
+        if doc.status_document != status.value:
+            logger.debug(f"document {doc.uuid} is no longer {status.value}, notification ignored")
+            return
+
+        for listener in listeners:
+            listener.deliver([doc])
+
+    def _handler_class(self):
+        receiver = self
+
+        class NotificationHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != receiver.path:
+                    self._reply(404, {"status": False, "payload": "not found"})
+                    return
+                if receiver.token is not None and self.headers.get(TOKEN_HEADER) != receiver.token:
+                    self._reply(401, {"status": False, "payload": "unauthorized"})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    body = json.loads(self.rfile.read(length) or b'null')
+                    notifications = body if isinstance(body, list) else [body]
+                    for notification in notifications:
+                        receiver._validate(notification)
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(400, {"status": False, "payload": str(e)})
+                    return
+                for notification in notifications:
+                    receiver._enqueue(notification)
+                self._reply(202, {"status": True, "payload": len(notifications)})
+
+            def _reply(self, code: int, data: dict):
+                body = json.dumps(data).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"push receiver: {format % args}")
+
+        return NotificationHandler
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def send_notification(url: str, uuid: str, status: StatusDocument, batch_type: Optional[BatchType] = None,
+                      document: Optional[dict] = None, token: Optional[str] = None) -> bool:
+    """
+    Sends a document-status notification to a PushNotificationReceiver.
+
+    Acts as a local stand-in for the server-side sender, e.g. in tests or to forward
+    notifications from another system.
+
+    Returns:
+        bool: True if the receiver accepted the notification.
+    """
+    notification = {"uuid": uuid, "status": status.value}
+    if batch_type is not None:
+        notification["batch_type"] = batch_type.value
+    if document is not None:
+        notification["document"] = document
+    return send_notifications(url, [notification], token=token)
+
+
+def send_notifications(url: str, notifications: List[dict], token: Optional[str] = None) -> bool:
+    headers = {TOKEN_HEADER: token} if token is not None else {}
+    response = requests.post(url, json=notifications, headers=headers)
+    return response.status_code == 202
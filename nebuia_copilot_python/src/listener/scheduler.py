@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from loguru import logger
+
+
+class ScheduledPoll:
+    """
+    A recurring job registered in a ListenerScheduler.
+
+    Attributes:
+        key (Hashable): Identifier of the job, e.g. a (status, batch_type) tuple.
+        interval (float): Seconds between the end of one run and the start of the next.
+        callback (Callable[[], None]): Function executed on every run.
+        cancelled (bool): True once the job has been removed from the scheduler.
+    """
+
+    def __init__(self, key: Hashable, interval: float, callback: Callable[[], None]):
+        self.key = key
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+
+class ListenerScheduler:
+    """
+    Drives any number of recurring polls from a single timer heap.
+
+    Instead of one sleeping thread per listener, every poll is an entry in a heap
+    ordered by its next due time. A small pool of worker threads pops due entries,
+    runs them and pushes them back with their next due time, so a job never runs
+    concurrently with itself. First runs are spread across each job's interval and
+    every reschedule gets a small random jitter, which keeps subscriptions with the
+    same interval from firing at the same instant.
+
+    Attributes:
+        workers (int): Number of worker threads executing due jobs.
+        jitter (float): Fraction of the interval used as random jitter on reschedule.
+    """
+
+    def __init__(self, workers: int = 2, jitter: float = 0.1):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.jitter = jitter
+        self._heap: List[Tuple[float, int, ScheduledPoll]] = []
+        self._jobs = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    def schedule(self, key: Hashable, interval: float, callback: Callable[[], None], delay: float = 0.0) -> ScheduledPoll:
+        """
+        Registers a recurring job. Replaces any job already registered under `key`.
+
+        Args:
+            key (Hashable): Identifier of the job.
+            interval (float): Seconds between the end of one run and the start of the next.
+            callback (Callable[[], None]): Function executed on every run.
+            delay (float, optional): Seconds before the first run. Defaults to 0.
+
+        Returns:
+            ScheduledPoll: The registered job.
+        """
+        job = ScheduledPoll(key, interval, callback)
+        with self._condition:
+            previous = self._jobs.get(key)
+            if previous is not None:
+                previous.cancelled = True
+            self._jobs[key] = job
+            self._push(job, time.monotonic() + delay)
+        return job
+
+    def schedule_spread(self, jobs: List[Tuple[Hashable, float, Callable[[], None]]], max_spread: float = 5.0) -> List[ScheduledPoll]:
+        """
+        Registers several jobs, staggering their first run evenly across each interval.
+
+        Args:
+            jobs (List[Tuple[Hashable, float, Callable[[], None]]]): (key, interval, callback) tuples.
+            max_spread (float, optional): Upper bound in seconds for the stagger window, so jobs
+                with long intervals still run soon after start. Defaults to 5.
+
+        Returns:
+            List[ScheduledPoll]: The registered jobs, in the given order.
+        """
+        total = len(jobs)
+        return [
+            self.schedule(key, interval, callback, delay=min(interval, max_spread) * index / total)
+            for index, (key, interval, callback) in enumerate(jobs)
+        ]
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Removes the job registered under `key`. A run already in progress completes.
+
+        Returns:
+            bool: True if a job was registered under `key`.
+        """
+        with self._condition:
+            job = self._jobs.pop(key, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            self._condition.notify_all()
+            return True
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"listener-scheduler-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops the worker threads, waiting for runs in progress to finish.
+        Registered jobs are kept, so the scheduler can be started again.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def _push(self, job: ScheduledPoll, due: float):
+        heapq.heappush(self._heap, (due, next(self._counter), job))
+        self._condition.notify()
+
+    def _next_due_job(self) -> Optional[ScheduledPoll]:
+        with self._condition:
+            while self._running:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, job = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                return job
+            return None
+
+    def _worker(self):
+        while True:
+            job = self._next_due_job()
+            if job is None:
+                return
+            try:
+                job.callback()
+            except Exception as e:
+                logger.error(f"scheduled job {job.key} failed: {e}")
+            with self._condition:
+                if job.cancelled:
+                    continue
+                spread = job.interval * self.jitter
+                self._push(job, time.monotonic() + job.interval + random.uniform(-spread, spread))
@@ -0,0 +1,66 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+from loguru import logger
+
+
+@dataclass
+class LogPolicy:
+    """
+    Controls how the client logs request and response payloads.
+
+    Payloads are formatted lazily: nothing is converted to text unless a loguru
+    sink accepts `level`, so at the default DEBUG level a production INFO sink
+    costs one level check per call.
+
+    Attributes:
+        level (str): Level payloads are logged at.
+        max_payload_chars (int): Payload text beyond this length is cut, with the full length noted.
+            0 disables the cap.
+        sample_rate (float): Fraction of payloads logged, between 0 and 1.
+        quiet (bool): Drop payload logs entirely. Warnings and errors are not affected.
+    """
+    level: str = "DEBUG"
+    max_payload_chars: int = 512
+    sample_rate: float = 1.0
+    quiet: bool = False
+
+
+policy = LogPolicy()
+
+
+def configure_logging(level: str = None, max_payload_chars: int = None, sample_rate: float = None,
+                      quiet: bool = None) -> LogPolicy:
+    """
+    Updates the fields of the global payload logging policy that are given.
+    """
+    for name, value in (("level", level), ("max_payload_chars", max_payload_chars),
+                        ("sample_rate", sample_rate), ("quiet", quiet)):
+        if value is not None:
+            setattr(policy, name, value)
+    return policy
+
+
+def truncate(text: str, limit: int) -> str:
+    if not limit or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text)} chars)"
+
+
+def log_payload(label: str, payload: Union[Any, Callable[[], Any]]):
+    """
+    Logs `payload` under `label` according to the policy. `payload` may be a callable
+    returning it, to also defer building the value.
+    """
+    if policy.quiet:
+        return
+    if policy.sample_rate < 1.0 and random.random() >= policy.sample_rate:
+        return
+    logger.opt(lazy=True, depth=1).log(policy.level, "{}: {}", lambda: label, lambda: _render(payload))
+
+
+def _render(payload: Union[Any, Callable[[], Any]]) -> str:
+    if callable(payload):
+        payload = payload()
+    return truncate(payload if isinstance(payload, str) else repr(payload), policy.max_payload_chars)
@@ -0,0 +1,353 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid as uuid_lib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from loguru import logger
+
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+@dataclass
+class MockProfile:
+    """
+    Behaviour of a MockNebuIAServer.
+
+    Attributes:
+        latency (float): Seconds added to every response.
+        jitter (float): Random extra seconds, uniform between 0 and `jitter`.
+        error_rate (float): Fraction of requests answered with HTTP 503.
+        entities_per_document (int): Entities of each seeded or uploaded document.
+        value_size (int): Characters of each entity value.
+        content_size (int): Characters of each search result or hit.
+        processing_time (float): Seconds a processed document takes to reach `processed_status`.
+        processed_status (StatusDocument): Status documents reach once processed.
+        seed (Optional[int]): Seed of the random generator, for reproducible runs.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    entities_per_document: int = 20
+    value_size: int = 24
+    content_size: int = 400
+    processing_time: float = 0.0
+    processed_status: StatusDocument = StatusDocument.COMPLETE
+    seed: Optional[int] = None
+
+
+class MockNebuIAServer:
+    """
+    In-memory stand-in for the NebuIA API, implementing every endpoint APIClient uses.
+
+    Documents and batches live in memory. Uploaded and seeded documents get
+    `entities_per_document` generated entities; triggering processing of a batch
+    moves its waiting documents to `processed_status` after `processing_time`
+    seconds. Latency, errors and payload sizes follow the profile, which can be
+    changed while the server runs. Credentials are not checked.
+
+    Example:
+        >>> with MockNebuIAServer(MockProfile(latency=0.02)) as server:
+        ...     integrator = Integrator(with_base=server.url, key="key", secret="secret")
+        ...     server.seed_documents(500, StatusDocument.WAITING_QA)
+        ...     integrator.get_documents_by_status(StatusDocument.WAITING_QA, limit=100)
+
+    Attributes:
+        profile (MockProfile): Latency, error and payload profile.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one, updated on `start()`.
+    """
+
+    def __init__(self, profile: Optional[MockProfile] = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or MockProfile()
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._random = random.Random(self.profile.seed)
+        self._documents: Dict[str, dict] = {}
+        self._batches: Dict[str, dict] = {}
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._routes: List[Tuple[str, "re.Pattern", Callable]] = [
+            ("POST", re.compile(r"/integrator/extractor/from/text$"), self._extract),
+            ("POST", re.compile(r"/integrator/extractor/from/document/(?P<uuid>[^/]+)$"), self._extract),
+            ("POST", re.compile(r"/integrator/document/search$"), self._search_document),
+            ("GET", re.compile(r"/integrator/documents/set/status/(?P<uuid>[^/]+)/(?P<status>[^/]+)$"), self._set_status),
+            ("GET", re.compile(r"/integrator/document/get/by/uuid/(?P<uuid>[^/]+)$"), self._get_document),
+            ("GET", re.compile(r"/integrator/documents/by/status/(?P<status>[^/]+)$"), self._list),
+            ("GET", re.compile(r"/integrator/documents/by/id/batch/(?P<batch_id>[^/]+)$"), self._list),
+            ("GET", re.compile(r"/integrator/documents/type/all/user$"), self._document_types),
+            ("GET", re.compile(r"/integrator/documents/by/(?P<batch_type>[^/]+)/status/(?P<status>[^/]+)$"), self._list),
+            ("GET", re.compile(r"/integrator/clear/document/(?P<uuid>[^/]+)$"), self._clear),
+            ("DELETE", re.compile(r"/integrator/delete/batch/(?P<batch_id>[^/]+)$"), self._delete_batch),
+            ("DELETE", re.compile(r"/integrator/delete/by/uuid/(?P<uuid>[^/]+)$"), self._delete_document),
+            ("POST", re.compile(r"/integrator/create/batch$"), self._create_batch),
+            ("POST", re.compile(r"/integrator/append/to/batch/(?P<batch_id>[^/]+)$"), self._append),
+            ("POST", re.compile(r"/integrator/search/brain$"), self._search_brain),
+            ("POST", re.compile(r"/integrator/run/qa/batch/all/(?P<batch_id>[^/]+)$"), self._process),
+        ]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockNebuIAServer":
+        if self._server is not None:
+            return self
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                         name="mock-nebuia", daemon=True).start()
+        logger.info(f"mock NebuIA server listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self) -> "MockNebuIAServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def seed_documents(self, count: int, status: StatusDocument = StatusDocument.COMPLETE,
+                       batch_type: BatchType = BatchType.EXECUTION, batch_id: Optional[str] = None) -> List[str]:
+        """
+        Adds `count` documents in `status`, to `batch_id` or to a new batch. Returns their uuids.
+        """
+        with self._lock:
+            if batch_id is None:
+                batch_id = self._new_batch("seeded", batch_type.value)
+            return [self._new_document(batch_id, f"seeded_{index}.pdf", status.value) for index in range(count)]
+
+    def set_status(self, uuids: List[str], status: StatusDocument):
+        with self._lock:
+            for uuid in uuids:
+                self._documents[uuid]["status_document"] = status.value
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str):
+        parsed = urlparse(request.path)
+        length = int(request.headers.get("Content-Length") or 0)
+        body = request.rfile.read(length) if length else b""
+        profile = self.profile
+        with self._lock:
+            self.requests += 1
+            delay = profile.latency + (self._random.uniform(0, profile.jitter) if profile.jitter else 0.0)
+            failed = bool(profile.error_rate) and self._random.random() < profile.error_rate
+        if delay:
+            time.sleep(delay)
+
+        status, payload = 404, {"status": False, "payload": "not found"}
+        if failed:
+            status, payload = 503, {"status": False, "payload": "service unavailable"}
+        else:
+            for route_method, pattern, handler in self._routes:
+                match = pattern.match(parsed.path)
+                if route_method == method and match:
+                    query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                    with self._lock:
+                        self._advance_processing()
+                        status, payload = 200, handler(match.groupdict(), query, body, request.headers)
+                    break
+
+        data = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    def _new_batch(self, name: str, batch_type: str) -> str:
+        batch_id = uuid_lib.uuid4().hex[:24]
+        self._batches[batch_id] = {"name": name, "batch_type": batch_type, "documents": []}
+        return batch_id
+
+    def _new_document(self, batch_id: str, file_name: str, status: str, type_document: str = "mock") -> str:
+        uuid = str(uuid_lib.uuid4())
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        profile = self.profile
+        self._documents[uuid] = {
+            "id": uuid_lib.uuid4().hex[:24],
+            "batch_id": batch_id,
+            "user": "mock",
+            "uuid": uuid,
+            "url": f"https://mock.nebuia/files/{uuid}",
+            "file_name": file_name,
+            "type_document": type_document,
+            "status_document": status,
+            "uploaded": now,
+            "reviewed_at": now,
+            "source_type": "file",
+            "entities": [
+                {
+                    "id": f"{uuid}-{index}",
+                    "key": f"key_{index}",
+                    "value": "v" * profile.value_size,
+                    "page": index % 5 + 1,
+                    "id_core": "core",
+                    "is_valid": True,
+                }
+                for index in range(profile.entities_per_document)
+            ],
+        }
+        self._batches[batch_id]["documents"].append(uuid)
+        return uuid
+
+    def _advance_processing(self):
+        if not self._pending:
+            return
+        now = time.monotonic()
+        for uuid, ready_at in list(self._pending.items()):
+            if ready_at <= now:
+                del self._pending[uuid]
+                if uuid in self._documents:
+                    self._documents[uuid]["status_document"] = self.profile.processed_status.value
+
+    def _list(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        page = int(query.get("page", 1))
+        limit = int(query.get("limit", 10))
+        if "batch_id" in params:
+            batch = self._batches.get(params["batch_id"], {"documents": []})
+            documents = [self._documents[uuid] for uuid in batch["documents"] if uuid in self._documents]
+        else:
+            documents = [doc for doc in self._documents.values() if doc["status_document"] == params["status"]]
+            if "batch_type" in params:
+                documents = [doc for doc in documents
+                             if self._batches[doc["batch_id"]]["batch_type"] == params["batch_type"]]
+        start = (page - 1) * limit
+        return {"status": True, "payload": {"documents": documents[start:start + limit], "total": len(documents)}}
+
+    def _get_document(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        document = self._documents.get(params["uuid"])
+        return {"status": document is not None, "payload": document or {}}
+
+    def _set_status(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        document = self._documents.get(params["uuid"])
+        if document is not None:
+            document["status_document"] = params["status"]
+        return {"status": document is not None, "payload": params["status"]}
+
+    def _clear(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        document = self._documents.get(params["uuid"])
+        if document is not None:
+            document["entities"] = []
+            document["status_document"] = StatusDocument.WAITING_PROCESS.value
+        return {"status": document is not None, "payload": None}
+
+    def _delete_document(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        return {"status": self._documents.pop(params["uuid"], None) is not None, "payload": None}
+
+    def _delete_batch(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        batch = self._batches.pop(params["batch_id"], None)
+        for uuid in (batch or {}).get("documents", []):
+            self._documents.pop(uuid, None)
+        return {"status": batch is not None, "payload": None}
+
+    def _document_types(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        return {"status": True, "payload": [
+            {"id": "type", "user": "mock", "key": "mock", "id_type_document": "mock", "created": "2024-01-01"}
+        ]}
+
+    def _create_batch(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        batch_id = self._new_batch(form.get("batch_name", "batch"), form.get("batch_type", BatchType.EXECUTION.value))
+        return {"status": True, "payload": batch_id}
+
+    def _append(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        if params["batch_id"] not in self._batches:
+            return {"status": False, "payload": "batch not found"}
+        file_name = _multipart_field(body, "file_name") or _multipart_filename(body) or "file"
+        type_document = _multipart_field(body, "type_document") or "mock"
+        uuid = self._new_document(params["batch_id"], file_name, StatusDocument.WAITING_PROCESS.value, type_document)
+        return {"status": True, "payload": [uuid]}
+
+    def _process(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        batch = self._batches.get(params["batch_id"])
+        if batch is None:
+            return {"status": False, "payload": "batch not found"}
+        ready_at = time.monotonic() + self.profile.processing_time
+        for uuid in batch["documents"]:
+            if self._documents.get(uuid, {}).get("status_document") == StatusDocument.WAITING_PROCESS.value:
+                self._pending[uuid] = ready_at
+        self._advance_processing()
+        return {"status": True, "payload": None}
+
+    def _search_brain(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        search = json.loads(body or b"{}")
+        k = int(search.get("k", 5))
+        content = _text(search.get("param", ""), self.profile.content_size)
+        return {"status": True, "payload": {"results": [
+            {
+                "uuid": str(uuid_lib.uuid5(uuid_lib.NAMESPACE_URL, f"{search.get('batch')}/{search.get('param')}/{rank}")),
+                "content": content,
+                "name": f"document_{rank}.pdf",
+                "source": rank,
+                "coincidences": max(0, k - rank),
+                "score": round(1.0 - rank / (k + 1), 6),
+            }
+            for rank in range(k)
+        ]}}
+
+    def _search_document(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        search = json.loads(body or b"{}")
+        limit = int(search.get("max_results", 10))
+        matches = search.get("matches", "")
+        hits = []
+        for rank in range(limit):
+            content = _text(matches, self.profile.content_size)
+            meta = {"name": "document.pdf", "source": rank}
+            hits.append({
+                "_formatted": {"content": content.replace(matches, f"<em>{matches}</em>", max(1, limit - rank)),
+                               "id": str(rank), "meta": meta},
+                "content": content,
+                "id": rank,
+                "meta": meta,
+            })
+        return {"status": True, "payload": {"hits": hits, "estimatedTotalHits": limit, "limit": limit,
+                                            "processingTimeMs": 1, "query": matches}}
+
+    def _extract(self, params: dict, query: dict, body: bytes, headers) -> dict:
+        return {"status": True, "payload": json.dumps({"extracted": True, "uuid": params.get("uuid")})}
+
+
+def _text(term: str, size: int) -> str:
+    chunk = f"{term} lorem ipsum dolor sit amet " if term else "lorem ipsum dolor sit amet "
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def _multipart_field(body: bytes, name: str) -> Optional[str]:
+    match = re.search(rb'name="' + name.encode() + rb'"\r\n\r\n(.*?)\r\n', body, re.S)
+    return match.group(1).decode(errors="replace") if match else None
+
+
+def _multipart_filename(body: bytes) -> Optional[str]:
+    match = re.search(rb'filename="([^"]*)"', body)
+    return match.group(1).decode(errors="replace") if match else None
@@ -0,0 +1,199 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.models import BatchType, Document, File, StatusDocument, UploadResult
+
+DEFAULT_TERMINAL_STATUSES = (StatusDocument.COMPLETE, StatusDocument.QA_COMPLETE)
+DEFAULT_FAILURE_STATUSES = (
+    StatusDocument.ERROR_LINK,
+    StatusDocument.ERROR_OCR,
+    StatusDocument.NO_PIPELINE_DEFINED,
+    StatusDocument.WITH_ERROR_ON_ASSIGN,
+)
+
+
+@dataclass
+class StageTimings:
+    """
+    Wall-clock seconds spent in each stage of a pipeline run.
+
+    Attributes:
+        create (float): Creating the batch.
+        upload (float): Uploading every file, concurrently.
+        process (float): Triggering processing of the batch.
+        first_result (Optional[float]): From the start of the run to the first finished document.
+        collect (float): From triggering processing to the last finished document (or timeout).
+        total (float): The whole run.
+    """
+    create: float = 0.0
+    upload: float = 0.0
+    process: float = 0.0
+    first_result: Optional[float] = None
+    collect: float = 0.0
+    total: float = 0.0
+
+
+@dataclass
+class PipelineRun:
+    """
+    A single create/upload/process/collect run. Iterating over it executes the run and
+    yields documents as soon as they reach a terminal or failure status.
+
+    Attributes:
+        batch_id (Optional[str]): Identifier of the created batch.
+        uploads (Dict[str, List[UploadResult]]): "successful" and "failed" upload results.
+        timings (StageTimings): Per-stage timings, filled in as the run progresses.
+        pending (int): Uploaded documents that have not finished yet.
+        missing (List[str]): Uploaded documents that disappeared from the batch before finishing.
+        timed_out (bool): True if the run stopped because of its timeout.
+    """
+    pipeline: "BatchPipeline"
+    name: str
+    files: List[File]
+    batch_type: BatchType
+    timeout: Optional[float] = None
+    batch_id: Optional[str] = None
+    uploads: Dict[str, List[UploadResult]] = field(default_factory=lambda: {"successful": [], "failed": []})
+    timings: StageTimings = field(default_factory=StageTimings)
+    pending: int = 0
+    missing: List[str] = field(default_factory=list)
+    timed_out: bool = False
+
+    def __iter__(self) -> Iterator[Document]:
+        return self.pipeline._execute(self)
+
+
+class BatchPipeline:
+    """
+    High-level batch ingestion: create a batch, upload files, trigger processing
+    and stream back the processed documents.
+
+    Files are uploaded concurrently on `upload_workers` threads, processing is
+    triggered as soon as the last upload returns, and the batch is then polled
+    every `poll_interval` seconds. Each document is yielded the first time it is
+    seen in a terminal or failure status, so callers can start consuming results
+    long before the whole batch is done. Documents deleted from the batch before
+    they finish are recorded in `PipelineRun.missing` instead of being waited on.
+
+    Example:
+        >>> run = integrator.run_batch_pipeline("invoices", files)
+        >>> for document in run:
+        ...     print(document.file_name, document.status_document)
+        >>> print(run.timings)
+
+    Attributes:
+        api_client (APIClient): Client used for every call.
+        upload_workers (int): Concurrent uploads.
+        poll_interval (float): Seconds between checks of the batch.
+        page_size (int): Documents fetched per page when checking the batch.
+        terminal_statuses (Sequence[StatusDocument]): Statuses of successfully finished documents.
+        failure_statuses (Sequence[StatusDocument]): Statuses of documents that failed processing.
+    """
+
+    def __init__(self, api_client: APIClient, upload_workers: int = 4, poll_interval: float = 2.0, page_size: int = 50,
+                 terminal_statuses: Sequence[StatusDocument] = DEFAULT_TERMINAL_STATUSES,
+                 failure_statuses: Sequence[StatusDocument] = DEFAULT_FAILURE_STATUSES):
+        self.api_client = api_client
+        self.upload_workers = upload_workers
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+        self.terminal_statuses = tuple(terminal_statuses)
+        self.failure_statuses = tuple(failure_statuses)
+
+    def run(self, name: str, files: Iterable[File], batch_type: BatchType = BatchType.EXECUTION,
+            timeout: Optional[float] = None) -> PipelineRun:
+        """
+        Prepares a run. Nothing is sent until the returned PipelineRun is iterated.
+
+        Args:
+            name (str): Name of the batch to create.
+            files (Iterable[File]): Files to upload.
+            batch_type (BatchType, optional): Type of the batch. Defaults to EXECUTION.
+            timeout (Optional[float], optional): Maximum seconds to wait for documents to finish
+                once processing was triggered. None waits until every document finished.
+
+        Returns:
+            PipelineRun: The run, to be iterated for the finished documents.
+        """
+        return PipelineRun(pipeline=self, name=name, files=list(files), batch_type=batch_type, timeout=timeout)
+
+    def _execute(self, run: PipelineRun) -> Iterator[Document]:
+        started = time.monotonic()
+
+        response = self.api_client.create_batch(run.name, run.batch_type)
+        run.timings.create = time.monotonic() - started
+        if not response.status:
+            raise RuntimeError(f"failed to create batch: {response.payload}")
+        run.batch_id = response.payload
+
+        upload_started = time.monotonic()
+        self._upload(run)
+        run.timings.upload = time.monotonic() - upload_started
+        run.pending = len(run.uploads["successful"])
+        if not run.pending:
+            run.timings.total = time.monotonic() - started
+            return
+
+        process_started = time.monotonic()
+        if not self.api_client.process_item(batch_id=run.batch_id):
+            raise RuntimeError(f"failed to trigger processing for batch {run.batch_id}")
+        run.timings.process = time.monotonic() - process_started
+
+        collect_started = time.monotonic()
+        expected = {result.uuid for result in run.uploads["successful"]}
+        finished = set()
+        finished_statuses = {status.value for status in self.terminal_statuses + self.failure_statuses}
+        try:
+            while True:
+                listed = set()
+                for doc in self._batch_documents(run.batch_id):
+                    listed.add(doc.uuid)
+                    if doc.uuid in finished or doc.status_document not in finished_statuses:
+                        continue
+                    finished.add(doc.uuid)
+                    run.pending = len(expected - finished)
+                    if run.timings.first_result is None:
+                        run.timings.first_result = time.monotonic() - started
+                    yield doc
+
+                gone = expected - finished - listed
+                if gone:
+                    logger.warning(f"batch {run.batch_id}: {len(gone)} documents left the batch before finishing")
+                    run.missing.extend(sorted(gone))
+                    expected -= gone
+                    run.pending = len(expected - finished)
+                if expected <= finished:
+                    break
+                interval = self.poll_interval
+                if run.timeout is not None:
+                    remaining = run.timeout - (time.monotonic() - collect_started)
+                    if remaining <= 0:
+                        run.timed_out = True
+                        logger.warning(f"batch {run.batch_id}: {run.pending} documents unfinished after {run.timeout}s")
+                        break
+                    interval = min(interval, remaining)
+                time.sleep(interval)
+        finally:
+            run.timings.collect = time.monotonic() - collect_started
+            run.timings.total = time.monotonic() - started
+
+    def _upload(self, run: PipelineRun):
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            futures = [executor.submit(self.api_client._upload_file, file, run.batch_id) for file in run.files]
+            for future in as_completed(futures):
+                result = future.result()
+                run.uploads["successful" if result.success else "failed"].append(result)
+
+    def _batch_documents(self, batch_id: str) -> Iterator[Document]:
+        page = 1
+        while True:
+            documents = self.api_client.get_documents_by_batch(batch_id, page=page, limit=self.page_size)
+            yield from documents.documents
+            if not documents.documents or page * self.page_size >= documents.total:
+                return
+            page += 1
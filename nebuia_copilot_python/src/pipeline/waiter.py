@@ -0,0 +1,158 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.models import StatusDocument
+from nebuia_copilot_python.src.pipeline.pipeline import DEFAULT_FAILURE_STATUSES, DEFAULT_TERMINAL_STATUSES
+
+
+@dataclass
+class BatchProgress:
+    """
+    Progress of a batch towards its terminal statuses.
+
+    Attributes:
+        batch_id (str): The batch being watched.
+        total (int): Documents in the batch.
+        counts (Dict[str, int]): Documents per status value.
+        finished (int): Documents in one of the terminal statuses.
+        elapsed (float): Seconds since the wait started.
+        done (bool): True once every document is in a terminal status, including when the
+            batch is empty.
+        timed_out (bool): True if the wait gave up because of its timeout.
+    """
+    batch_id: str
+    total: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    finished: int = 0
+    elapsed: float = 0.0
+    done: bool = False
+    timed_out: bool = False
+
+    @property
+    def fraction(self) -> float:
+        return self.finished / self.total if self.total else 0.0
+
+
+class BatchWaiter:
+    """
+    Waits for every document of a batch to reach a terminal status.
+
+    The listing endpoints cannot filter a batch by status, so counting what is done
+    requires reading the batch. To keep that rare, each check starts with a probe of
+    `limit=1` queries, issued concurrently, whose `total`s are only used as counts:
+    the batch size and the global number of documents in every terminal status. When
+    no count moved since the previous check nothing in the batch can have finished,
+    and the batch is not read; otherwise its pages are fetched concurrently and the
+    statuses counted. A full read is still forced every `max_skipped` checks, since
+    documents entering and leaving a status in the same interval cancel out.
+
+    The interval between checks starts at `min_interval`, grows by `backoff` while
+    nothing progresses, up to `max_interval`, and drops back on progress.
+
+    Attributes:
+        api_client (APIClient): Client used for the listing calls.
+        page_size (int): Page size used when reading the batch.
+        max_workers (int): Concurrent listing requests.
+        min_interval (float): Shortest wait between checks, in seconds.
+        max_interval (float): Longest wait between checks, in seconds.
+        backoff (float): Interval multiplier applied while there is no progress.
+        max_skipped (int): Checks that may skip reading the batch in a row.
+    """
+
+    def __init__(self, api_client: APIClient, page_size: int = 100, max_workers: int = 4, min_interval: float = 1.0,
+                 max_interval: float = 30.0, backoff: float = 1.5, max_skipped: int = 5):
+        self.api_client = api_client
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_skipped = max_skipped
+
+    def wait(self, batch_id: str, terminal_statuses: Optional[Sequence[StatusDocument]] = None,
+             timeout: Optional[float] = None,
+             on_progress: Optional[Callable[[BatchProgress], None]] = None) -> BatchProgress:
+        """
+        Blocks until every document of `batch_id` is in one of `terminal_statuses`.
+        A batch that is empty, or whose documents were all deleted, is done at once.
+
+        Args:
+            batch_id (str): The batch to watch.
+            terminal_statuses (Optional[Sequence[StatusDocument]]): Statuses considered done.
+                Defaults to COMPLETE, QA_COMPLETE and the error statuses.
+            timeout (Optional[float]): Maximum seconds to wait. None waits forever.
+            on_progress (Optional[Callable[[BatchProgress], None]]): Called with a snapshot of
+                the progress after every read of the batch.
+
+        Returns:
+            BatchProgress: The last progress; `done` or `timed_out` tells how the wait ended.
+        """
+        statuses = tuple(terminal_statuses or DEFAULT_TERMINAL_STATUSES + DEFAULT_FAILURE_STATUSES)
+        terminal_values = {status.value for status in statuses}
+        started = time.monotonic()
+        progress = BatchProgress(batch_id=batch_id)
+        interval = self.min_interval
+        last_signature = None
+        skipped = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                signature = self._probe(executor, batch_id, statuses)
+                if signature != last_signature or skipped >= self.max_skipped:
+                    previous = progress.finished
+                    total, counts = self._count(executor, batch_id, signature[0])
+                    progress.total = total
+                    progress.counts = counts
+                    progress.finished = sum(count for status, count in counts.items() if status in terminal_values)
+                    progress.elapsed = time.monotonic() - started
+                    progress.done = progress.finished >= total
+                    last_signature = signature
+                    skipped = 0
+                    if on_progress is not None:
+                        on_progress(replace(progress))
+                    if progress.done:
+                        return progress
+                    interval = self.min_interval if progress.finished > previous else min(interval * self.backoff, self.max_interval)
+                else:
+                    skipped += 1
+                    interval = min(interval * self.backoff, self.max_interval)
+
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    progress.elapsed = time.monotonic() - started
+                    progress.timed_out = True
+                    logger.warning(f"batch {batch_id}: {progress.finished}/{progress.total} finished after {timeout}s")
+                    return progress
+                time.sleep(interval if remaining is None else min(interval, remaining))
+
+    def _probe(self, executor: ThreadPoolExecutor, batch_id: str, statuses: Tuple[StatusDocument, ...]) -> Tuple[int, ...]:
+        batch_total = executor.submit(self.api_client.get_documents_by_batch, batch_id, page=1, limit=1)
+        status_totals = [
+            executor.submit(self.api_client.get_documents_by_status, status=status, page=1, limit=1)
+            for status in statuses
+        ]
+        return (batch_total.result().total,) + tuple(future.result().total for future in status_totals)
+
+    def _count(self, executor: ThreadPoolExecutor, batch_id: str, total: int) -> Tuple[int, Dict[str, int]]:
+        pages = max(1, -(-total // self.page_size))
+        futures = [
+            executor.submit(self.api_client.get_documents_by_batch, batch_id, page=page, limit=self.page_size)
+            for page in range(1, pages + 1)
+        ]
+        counts: Counter = Counter()
+        seen: List[str] = []
+        for future in futures:
+            documents = future.result()
+            total = documents.total
+            for doc in documents.documents:
+                seen.append(doc.uuid)
+                counts[doc.status_document] += 1
+        if len(set(seen)) != len(seen):
+            logger.debug(f"batch {batch_id} changed while it was being read")
+        return total, dict(counts)
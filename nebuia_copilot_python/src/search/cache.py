@@ -0,0 +1,110 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Sequence, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Case-folds, strips accents and collapses whitespace, so that
+    " Fecha  de PAGÓ" and "fecha de pago" share a cache entry.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE.sub(" ", stripped.casefold()).strip()
+
+
+class SearchCache:
+    """
+    LRU cache of search results with a time to live.
+
+    Entries are keyed by `(kind, target, normalized query, mode)` and remember the k
+    they were fetched with. A request for k results is answered by an entry fetched
+    with a k at least as large (its first k results), or by any entry that returned
+    fewer results than it asked for, since there is nothing more to find. Storing
+    results for the same key keeps whichever entry can answer more.
+
+    Empty results are never stored: the API answers failed searches with empty
+    results too, and caching them would hide the real answer for the whole `ttl`.
+    An entry may carry `meta`, e.g. the response the items came from.
+
+    Attributes:
+        max_entries (int): Entries kept before the least recently used ones are evicted.
+        ttl (Optional[float]): Seconds an entry stays valid. None never expires entries.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were not.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, Sequence[Any], float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, target: str, query: str, mode: Optional[str] = None) -> Tuple:
+        return kind, target, normalize_query(query), mode
+
+    def get(self, key: Tuple, k: int) -> Optional[Sequence[Any]]:
+        """
+        Returns up to `k` cached items for `key`, or None on a miss.
+        """
+        entry = self.lookup(key, k)
+        return None if entry is None else entry[0]
+
+    def lookup(self, key: Tuple, k: int) -> Optional[Tuple[Sequence[Any], Any]]:
+        """
+        Returns up to `k` cached items for `key` and the `meta` stored with them, or None on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and now - entry[2] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None or not _covers(entry, k):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1][:k], entry[3]
+
+    def put(self, key: Tuple, k: int, items: Sequence[Any], meta: Any = None):
+        if not items:
+            return
+        now = time.monotonic()
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and (self.ttl is None or now - current[2] <= self.ttl) and _covers(current, k):
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (k, list(items), now, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key: Tuple, k: int, fetch: Callable[[], Sequence[Any]]) -> Sequence[Any]:
+        cached = self.get(key, k)
+        if cached is not None:
+            return cached
+        items = fetch()
+        self.put(key, k, items)
+        return list(items)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _covers(entry: Tuple[int, Sequence[Any], float, Any], k: int) -> bool:
+    cached_k, items = entry[0], entry[1]
+    return cached_k >= k or len(items) < cached_k
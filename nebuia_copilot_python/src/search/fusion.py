@@ -0,0 +1,68 @@
+import dataclasses
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from nebuia_copilot_python.src.models import Result
+
+RRF_K = 60
+
+
+def _key(result: Result) -> Tuple[str, str]:
+    return result.uuid, str(result.source)
+
+
+def _normalized(values: List[float]) -> List[float]:
+    if not values:
+        return []
+    low, high = min(values), max(values)
+    if high == low:
+        return [1.0] * len(values)
+    span = high - low
+    return [(value - low) / span for value in values]
+
+
+def _fuse(ranked_lists: Sequence[Sequence[Result]], contributions: Sequence[List[float]],
+          top_k: Optional[int]) -> List[Result]:
+    scores: Dict[Tuple[str, str], float] = {}
+    first: Dict[Tuple[str, str], Result] = {}
+    for results, contribution in zip(ranked_lists, contributions):
+        for result, value in zip(results, contribution):
+            key = _key(result)
+            scores[key] = scores.get(key, 0.0) + value
+            first.setdefault(key, result)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if top_k is not None:
+        ranked = ranked[:top_k]
+    return [dataclasses.replace(first[key], score=score) for key, score in ranked]
+
+
+def reciprocal_rank_fusion(ranked_lists: Sequence[Sequence[Result]], weights: Optional[Sequence[float]] = None,
+                           k: int = RRF_K, top_k: Optional[int] = None) -> List[Result]:
+    """
+    Fuses ranked lists with weighted reciprocal-rank fusion: each list adds
+    `weight / (k + rank)` to the results it contains, rank starting at 1.
+
+    Only ranks are used, so lists whose scores are not comparable can be fused.
+    Each list must be ordered best first. The returned Results carry the fused score.
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    contributions = [
+        [weight / (k + rank) for rank in range(1, len(results) + 1)]
+        for results, weight in zip(ranked_lists, weights)
+    ]
+    return _fuse(ranked_lists, contributions, top_k)
+
+
+def weighted_score_fusion(ranked_lists: Sequence[Sequence[Result]], weights: Sequence[float],
+                          signals: Sequence[Callable[[Result], float]],
+                          top_k: Optional[int] = None) -> List[Result]:
+    """
+    Fuses lists by a weighted sum of min-max normalized scores. `signals[i]` reads
+    the raw score of a result of list i (e.g. `score` or `coincidences`).
+
+    The returned Results carry the fused score, between 0 and sum(weights).
+    """
+    contributions = [
+        [weight * value for value in _normalized([float(signal(result)) for result in results])]
+        for results, weight, signal in zip(ranked_lists, weights, signals)
+    ]
+    return _fuse(ranked_lists, contributions, top_k)
@@ -0,0 +1,382 @@
+import dataclasses
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple, Union
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.models import Hit, Result, ResultsSearch, Search, SearchDocument, SearchParameters
+from nebuia_copilot_python.src.search.cache import SearchCache
+from nebuia_copilot_python.src.search.fusion import RRF_K, reciprocal_rank_fusion, weighted_score_fusion
+
+
+def results_of(response: Union[ResultsSearch, List[Result]]) -> List[Result]:
+    """
+    APIClient.search_in_brain returns a plain list of Result on success and a
+    ResultsSearch when there is nothing to return; this accepts both.
+    """
+    if isinstance(response, ResultsSearch):
+        return list(response.results)
+    return list(response)
+
+
+def merge_results(result_lists: Iterable[Sequence[Result]], top_k: Optional[int] = None) -> List[Result]:
+    """
+    Merges result lists, keeping one Result per (uuid, source) - the one with the
+    highest score - ordered by decreasing score.
+    """
+    best: Dict[Tuple[str, str], Result] = {}
+    for results in result_lists:
+        for result in results:
+            key = (result.uuid, str(result.source))
+            current = best.get(key)
+            if current is None or result.score > current.score:
+                best[key] = result
+    merged = sorted(best.values(), key=lambda result: result.score, reverse=True)
+    return merged if top_k is None else merged[:top_k]
+
+
+HIGHLIGHT = "<em>"
+
+
+@dataclass
+class DocumentHit:
+    """
+    A search_in_document hit, attributed to its document.
+
+    Attributes:
+        uuid (str): The document searched.
+        hit (Hit): The hit as returned by the API.
+        rank (int): Position of the hit in its document's results, starting at 0.
+        relevance (float): Highlighted terms in the hit, plus a bonus decreasing with `rank`.
+    """
+    uuid: str
+    hit: Hit
+    rank: int
+    relevance: float
+
+
+def hit_relevance(hit: Hit, rank: int) -> float:
+    """
+    Number of highlighted terms in `hit._formatted.content`, plus `1 / (rank + 1)` so
+    that hits with as many highlights keep the order the engine gave them.
+    """
+    return hit._formatted.content.count(HIGHLIGHT) + 1.0 / (rank + 1)
+
+
+@dataclass
+class BrainHit:
+    """
+    A search_in_brain result, attributed to the brain it came from.
+
+    Attributes:
+        brain (str): The brain (`SearchParameters.batch`) that returned the result.
+        result (Result): The result.
+    """
+    brain: str
+    result: Result
+
+
+@dataclass
+class ScatterResults:
+    """
+    Merged results of a multi-brain search.
+
+    Attributes:
+        hits (List[BrainHit]): The best results across brains, by decreasing score.
+        failed (Dict[str, str]): Error message per brain whose search raised.
+        timed_out (List[str]): Brains that did not answer before the deadline.
+        elapsed (float): Seconds the scatter search took.
+    """
+    hits: List[BrainHit] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class Searcher:
+    """
+    Runs brain and document searches concurrently on a shared thread pool.
+
+    When a SearchCache is set, every single search goes through it, including the
+    ones issued by the fan-out methods.
+
+    Attributes:
+        api_client (APIClient): Client used for every search.
+        max_workers (int): Maximum searches in flight at the same time.
+        cache (Optional[SearchCache]): Cache of search results, disabled if None.
+    """
+
+    def __init__(self, api_client: APIClient, max_workers: int = 8, cache: Optional[SearchCache] = None):
+        self.api_client = api_client
+        self.max_workers = max_workers
+        self.cache = cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="search")
+        return self._executor
+
+    def search_brain(self, search_params: SearchParameters, timeout: Optional[float] = None) -> List[Result]:
+        def fetch() -> List[Result]:
+            return results_of(self.api_client.search_in_brain(search_params=search_params, timeout=timeout))
+
+        if self.cache is None:
+            return fetch()
+        key = SearchCache.key("brain", search_params.batch, search_params.param, search_params.type_search)
+        return list(self.cache.get_or_fetch(key, search_params.k, fetch))
+
+    def search_document(self, search: Search) -> SearchDocument:
+        if self.cache is None:
+            return self.api_client.search_in_document(search)
+        key = SearchCache.key("document", search.uuid, search.matches)
+        cached = self.cache.lookup(key, search.max_results)
+        if cached is not None:
+            hits, document = cached
+            return dataclasses.replace(document, hits=list(hits), limit=search.max_results)
+        document = self.api_client.search_in_document(search)
+        # a failed search comes back with no hits, which put() leaves out of the cache
+        self.cache.put(key, search.max_results, document.hits, meta=document)
+        return document
+
+    def search_brain_many(self, search_params: Sequence[SearchParameters], top_k: Optional[int] = None) -> ResultsSearch:
+        """
+        Runs every search concurrently and merges the results.
+
+        Args:
+            search_params (Sequence[SearchParameters]): The searches to run.
+            top_k (Optional[int]): Keep only the k best results across all searches.
+
+        Returns:
+            ResultsSearch: Results deduplicated by (uuid, source), by decreasing score.
+
+        Raises:
+            requests.exceptions.RequestException: If any of the searches fails.
+        """
+        if len(search_params) == 1:
+            return ResultsSearch(results=merge_results([self.search_brain(search_params[0])], top_k))
+        result_lists = list(self.executor.map(self.search_brain, search_params))
+        return ResultsSearch(results=merge_results(result_lists, top_k))
+
+    def search_brain_hybrid(self, search_params: SearchParameters, method: Literal['rrf', 'weighted'] = 'rrf',
+                            semantic_weight: float = 0.5, rrf_k: int = RRF_K,
+                            top_k: Optional[int] = None) -> ResultsSearch:
+        """
+        Runs the semantic and the literal variant of `search_params` concurrently and fuses them.
+
+        Args:
+            search_params (SearchParameters): The search; its `type_search` is ignored.
+            method (Literal['rrf', 'weighted']): Reciprocal-rank fusion, or a weighted sum of
+                min-max normalized semantic `score` and literal `coincidences`.
+            semantic_weight (float): Weight of the semantic list; the literal list gets `1 - semantic_weight`.
+            rrf_k (int): RRF rank offset.
+            top_k (Optional[int]): Number of results to keep. Defaults to `search_params.k`.
+
+        Returns:
+            ResultsSearch: One ranked list; each Result's `score` is its fused score.
+
+        Raises:
+            ValueError: If `method` is not 'rrf' or 'weighted'; no search is sent.
+        """
+        if method not in ('rrf', 'weighted'):
+            raise ValueError(f"unknown fusion method: {method}")
+        semantic, literal = self.executor.map(self.search_brain, [
+            dataclasses.replace(search_params, type_search='semantic'),
+            dataclasses.replace(search_params, type_search='literal'),
+        ])
+        weights = (semantic_weight, 1.0 - semantic_weight)
+        signals = [lambda result: result.score, lambda result: result.coincidences]
+        top_k = search_params.k if top_k is None else top_k
+        if method == 'rrf':
+            # RRF reads ranks from list positions; do not rely on the server returning them best-first
+            ranked = [sorted(results, key=signal, reverse=True) for results, signal in zip((semantic, literal), signals)]
+            fused = reciprocal_rank_fusion(ranked, weights, k=rrf_k, top_k=top_k)
+        else:
+            fused = weighted_score_fusion([semantic, literal], weights, signals, top_k=top_k)
+        return ResultsSearch(results=fused)
+
+    def search_brains(self, search_params: SearchParameters, brains: Sequence[str], top_k: Optional[int] = None,
+                      deadline: Optional[float] = None, max_brains_in_flight: int = 32) -> ScatterResults:
+        """
+        Runs `search_params` against every brain at the same time and merges the results.
+
+        Brains are searched on their own short-lived pool of up to `max_brains_in_flight`
+        threads; the others queue until a thread is free. `deadline` applies to each brain
+        from the moment its search starts, so queued brains are not charged for the wait.
+        A brain still running at its deadline, or whose search raises, is reported and left
+        out. Its request is also sent with `deadline` as HTTP timeout, but requests applies
+        it to the connection and to each socket read, not to the whole response, so a slow
+        brain can keep its thread, and delay the brains queued behind it, past the deadline.
+
+        Args:
+            search_params (SearchParameters): Template search; `batch` is replaced by each brain id.
+            brains (Sequence[str]): Brain ids to search.
+            top_k (Optional[int]): Results kept across all brains. Defaults to `search_params.k`.
+            deadline (Optional[float]): Seconds each brain has to answer once its search started.
+                None waits for every brain.
+            max_brains_in_flight (int): Maximum brains searched at the same time.
+
+        Returns:
+            ScatterResults: Merged hits with their brain, plus failed and timed out brains.
+        """
+        started = time.monotonic()
+        top_k = search_params.k if top_k is None else top_k
+        brains = list(dict.fromkeys(brains))
+        report = ScatterResults()
+        if not brains:
+            return report
+
+        # when each brain's search actually started, set by the pool threads
+        started_at: Dict[str, float] = {}
+
+        def search(brain: str) -> List[Result]:
+            started_at[brain] = time.monotonic()
+            return self.search_brain(dataclasses.replace(search_params, batch=brain), timeout=deadline)
+
+        executor = ThreadPoolExecutor(max_workers=min(len(brains), max_brains_in_flight), thread_name_prefix="brain-search")
+        done, not_done = set(), set()
+        try:
+            futures = {executor.submit(search, brain): brain for brain in brains}
+            pending = set(futures)
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    now = time.monotonic()
+                    expired = {future for future in pending if not future.done()
+                               and now - started_at.get(futures[future], now) >= deadline}
+                    not_done |= expired
+                    pending -= expired
+                    if not pending:
+                        break
+                    running = [started_at[futures[future]] for future in pending if futures[future] in started_at]
+                    timeout = max(min(running) + deadline - now, 0.0) if running else None
+                    if len(running) < len(pending):
+                        # queued brains get their deadline once they start; look again shortly
+                        timeout = 0.05 if timeout is None else min(timeout, 0.05)
+                finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                done |= finished
+        finally:
+            executor.shutdown(wait=False)
+
+        hits: List[Tuple[float, int, BrainHit]] = []
+        for future in done:
+            brain = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                report.failed[brain] = str(e)
+                continue
+            hits.extend((result.score, index, BrainHit(brain=brain, result=result)) for index, result in enumerate(results))
+        for future in not_done:
+            future.cancel()
+        report.timed_out = [futures[future] for future in futures if future in not_done]
+        if report.failed or report.timed_out:
+            logger.warning(f"brain search: {len(report.failed)} failed, {len(report.timed_out)} timed out "
+                           f"of {len(brains)} brains")
+
+        order = lambda entry: (entry[0], -entry[1])
+        if top_k is None:
+            best = sorted(hits, key=order, reverse=True)
+        else:
+            best = heapq.nlargest(top_k, hits, key=order)
+        report.hits = [hit for _, _, hit in best]
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def iter_search_documents(self, matches: str, uuids: Iterable[str],
+                              per_document: int = 10) -> Iterator[Tuple[str, SearchDocument]]:
+        """
+        Searches every document concurrently and yields `(uuid, SearchDocument)` as each
+        search completes. Only a bounded window of documents is in flight, so `uuids` can
+        be a lazy iterable; closing the iterator stops the remaining searches. Documents
+        whose search fails are logged and skipped.
+        """
+        in_flight: Dict[Future, str] = {}
+        uuids = iter(uuids)
+        window = self.max_workers * 2
+        try:
+            while True:
+                for uuid in itertools.islice(uuids, window - len(in_flight)):
+                    search = Search(matches=matches, uuid=uuid, max_results=per_document)
+                    in_flight[self.executor.submit(self.search_document, search)] = uuid
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    uuid = in_flight.pop(future)
+                    try:
+                        document = future.result()
+                    except Exception as e:
+                        logger.warning(f"search in document {uuid} failed: {e}")
+                        continue
+                    yield uuid, document
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def search_documents(self, matches: str, uuids: Iterable[str], max_results: Optional[int] = None,
+                         per_document: int = 10, top_k: Optional[int] = None,
+                         on_partial: Optional[Callable[[str, List[DocumentHit]], None]] = None) -> List[DocumentHit]:
+        """
+        Scatter-gather `search_in_document` over many documents.
+
+        Args:
+            matches (str): Text to search for.
+            uuids (Iterable[str]): Documents to search; may be lazy.
+            max_results (Optional[int]): Stop once this many hits were found in total.
+            per_document (int): Maximum hits requested per document.
+            top_k (Optional[int]): Hits returned. Defaults to `max_results` (every hit if both are None).
+            on_partial (Optional[Callable[[str, List[DocumentHit]], None]]): Called with the hits
+                of each document as soon as its search completes.
+
+        Returns:
+            List[DocumentHit]: The best hits across all documents, by decreasing relevance.
+
+        Raises:
+            ValueError: If `max_results` or `top_k` is negative.
+        """
+        if (max_results is not None and max_results < 0) or (top_k is not None and top_k < 0):
+            raise ValueError("max_results and top_k must not be negative")
+        top_k = max_results if top_k is None else top_k
+        if top_k == 0:
+            return []
+        heap: List[Tuple[float, int, DocumentHit]] = []
+        sequence = itertools.count()
+        found = 0
+        searches = self.iter_search_documents(matches, uuids, per_document=per_document)
+        try:
+            for uuid, document in searches:
+                hits = [DocumentHit(uuid=uuid, hit=hit, rank=rank, relevance=hit_relevance(hit, rank))
+                        for rank, hit in enumerate(document.hits)]
+                if not hits:
+                    continue
+                if on_partial is not None:
+                    on_partial(uuid, hits)
+                for hit in hits:
+                    # sequence breaks ties in favour of earlier hits, and keeps DocumentHit out of comparisons
+                    entry = (hit.relevance, -next(sequence), hit)
+                    if top_k is None or len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry[:2] > heap[0][:2]:
+                        heapq.heapreplace(heap, entry)
+                found += len(hits)
+                if max_results is not None and found >= max_results:
+                    break
+        finally:
+            searches.close()
+        return [hit for _, _, hit in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
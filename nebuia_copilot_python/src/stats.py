@@ -0,0 +1,165 @@
+import bisect
+import threading
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+from nebuia_copilot_python.src.tracing import PHASES, Span, Tracer
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies, recorded in whole microseconds.
+
+    Values below 128 µs are counted exactly; above, each power of two is split into
+    64 linear sub-buckets, so every quantile is within about 1.6% of the true value
+    whatever the range. Buckets are stored sparsely, and recording is O(1).
+    `cumulative` re-buckets the counts on fixed bounds for exporters that need them.
+
+    Attributes:
+        count (int): Values recorded.
+        total (float): Sum of the values, in seconds.
+        min (Optional[float]): Smallest value, in seconds.
+        max (Optional[float]): Largest value, in seconds.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        micros = max(0, int(seconds * 1e6))
+        shift = max(0, micros.bit_length() - SUB_BUCKET_BITS)
+        key = (shift << SUB_BUCKET_BITS) | (micros >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Value at quantile `q` (0 to 1), in seconds; None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(max(_bucket_value(key), self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Values at or below each of `bounds` (seconds, in increasing order), as in the
+        Prometheus histogram type. Values are placed by their sub-bucket, so counts are
+        exact below 128 µs and otherwise only off for values within 1.6% of a bound.
+        """
+        counts = [0] * len(bounds)
+        for key, count in self.counts.items():
+            index = bisect.bisect_left(bounds, _bucket_value(key))
+            if index < len(bounds):
+                counts[index] += count
+        return list(accumulate(counts))
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _bucket_value(key: int) -> float:
+    shift, mantissa = key >> SUB_BUCKET_BITS, key & (SUB_BUCKETS - 1)
+    return ((mantissa << shift) + ((1 << shift) - 1) / 2) / 1e6
+
+
+class EndpointStats:
+    """
+    Counters of a single APIClient method.
+
+    Attributes:
+        calls (int): Calls made.
+        errors (int): Calls that raised or got an HTTP status of 400 or more.
+        retries (int): Extra HTTP requests sent by calls that retry (e.g. uploads).
+        bytes_sent (int): Request body bytes.
+        bytes_received (int): Response body bytes.
+        latency (LatencyHistogram): Seconds per call.
+        phases (Dict[str, float]): Total seconds per phase (see Span).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def observe(self, span: Span):
+        self.calls += 1
+        if span.error is not None or (span.status_code or 0) >= 400:
+            self.errors += 1
+        self.retries += max(0, span.requests - 1)
+        self.bytes_sent += span.request_bytes
+        self.bytes_received += span.response_bytes
+        self.latency.record(span.duration or 0.0)
+        for phase, seconds in span.phases.items():
+            self.phases[phase] += seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.snapshot(),
+            "phases": dict(self.phases),
+        }
+
+
+class ClientStats(Tracer):
+    """
+    Tracer aggregating spans into per-endpoint statistics, keyed by APIClient method name.
+    Calls made from within another traced call (e.g. uploads of append_job) are counted
+    under their own method.
+    """
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span):
+        with self._lock:
+            stats = self._endpoints.get(span.name)
+            if stats is None:
+                stats = self._endpoints[span.name] = EndpointStats()
+            stats.observe(span)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, dict]:
+        """
+        Statistics per endpoint. With `reset`, counters restart from zero atomically.
+        """
+        with self._lock:
+            snapshot = {name: stats.snapshot() for name, stats in self._endpoints.items()}
+            if reset:
+                self._endpoints = {}
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
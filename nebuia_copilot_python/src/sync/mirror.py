@@ -0,0 +1,359 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from nebuia_copilot_python.src.api_client import APIClient
+from nebuia_copilot_python.src.listener.diff import DocumentFingerprint
+from nebuia_copilot_python.src.models import Document, Entity, StatusDocument
+
+_DOCUMENT_COLUMNS = ("uuid", "id", "batch_id", "user", "url", "file_name", "type_document", "status_document",
+                     "uploaded", "reviewed_at", "source_type")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS documents ("
+    "uuid TEXT PRIMARY KEY, id TEXT, batch_id TEXT, user TEXT, url TEXT, file_name TEXT, type_document TEXT, "
+    "status_document TEXT, uploaded TEXT, reviewed_at TEXT, source_type TEXT, has_entities INTEGER NOT NULL, "
+    "synced_at REAL NOT NULL, entities_hash TEXT)",
+    "CREATE TABLE IF NOT EXISTS entities ("
+    "document_uuid TEXT NOT NULL, id TEXT NOT NULL, key TEXT, value TEXT, page INTEGER, id_core TEXT, "
+    "is_valid INTEGER, PRIMARY KEY (document_uuid, id))",
+    "CREATE TABLE IF NOT EXISTS sync_state (status TEXT PRIMARY KEY, watermark TEXT, synced_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS documents_status ON documents (status_document)",
+    "CREATE INDEX IF NOT EXISTS documents_batch ON documents (batch_id, status_document)",
+    "CREATE INDEX IF NOT EXISTS documents_type ON documents (type_document, status_document)",
+    "CREATE INDEX IF NOT EXISTS documents_reviewed ON documents (reviewed_at)",
+    "CREATE INDEX IF NOT EXISTS entities_key ON entities (key, value)",
+)
+
+
+@dataclass
+class StatusSync:
+    """
+    Outcome of syncing one status.
+
+    Attributes:
+        pages (int): Pages fetched.
+        seen (int): Documents listed by the API.
+        changed (int): Documents inserted or updated in the mirror.
+        removed (int): Mirrored documents no longer listed under the status.
+        complete (bool): False if the pass stopped early, in which case nothing was removed.
+    """
+    pages: int = 0
+    seen: int = 0
+    changed: int = 0
+    removed: int = 0
+    complete: bool = True
+
+
+@dataclass
+class SyncReport:
+    """
+    Outcome of a `DocumentMirror.sync` call.
+
+    Attributes:
+        statuses (Dict[str, StatusSync]): Per-status outcome, keyed by status value.
+        elapsed (float): Seconds the sync took.
+    """
+    statuses: Dict[str, StatusSync] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def changed(self) -> int:
+        return sum(status.changed for status in self.statuses.values())
+
+
+class DocumentMirror:
+    """
+    Local SQLite mirror of documents and their entities.
+
+    `sync` lists every requested status through the API and writes only the
+    documents whose status, `reviewed_at`, `uploaded` or entities (compared by their
+    DocumentFingerprint digest) differ from the mirrored copy, so a sync over a mostly unchanged account costs the listing requests and
+    almost no writes. A complete pass over a status also removes the mirrored
+    documents the API no longer lists under it. When the listing returns recently
+    changed documents first, `stop_after_unchanged` ends a pass after that many
+    consecutive pages without changes, and `since_watermark` ends it at the first
+    page whose newest `reviewed_at`/`uploaded` is older than the watermark stored by
+    the previous pass; such partial passes remove nothing.
+
+    Documents received elsewhere, e.g. by a listener, can be written with `upsert`.
+    Reads are plain indexed SQLite queries and never touch the API.
+
+    Example:
+        >>> mirror = DocumentMirror(integrator._api_client, "documents.db")
+        >>> mirror.sync([StatusDocument.COMPLETE, StatusDocument.WAITING_QA])
+        >>> mirror.counts_by_status(batch_id="66a5271a7a97c83cece5dd0d")
+        >>> mirror.documents(entity_key="rfc", entity_value="XAXX010101000")
+
+    Attributes:
+        api_client (APIClient): Client used to list documents.
+        path (str): Path of the SQLite database file.
+        page_size (int): Documents per listing request.
+    """
+
+    def __init__(self, api_client: APIClient, path: str, page_size: int = 100):
+        self.api_client = api_client
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(documents)")}
+        if "entities_hash" not in columns:
+            # mirrors created before entity fingerprints; their entities are rewritten on the next change
+            self._connection.execute("ALTER TABLE documents ADD COLUMN entities_hash TEXT")
+        self._connection.commit()
+
+    def sync(self, statuses: Optional[Iterable[StatusDocument]] = None,
+             stop_after_unchanged: Optional[int] = None, since_watermark: bool = False) -> SyncReport:
+        """
+        Brings the mirror up to date for `statuses` (every status if None).
+
+        Args:
+            statuses (Optional[Iterable[StatusDocument]]): Statuses to sync.
+            stop_after_unchanged (Optional[int]): End a status pass after this many
+                consecutive pages without changes. None always lists every page.
+            since_watermark (bool): End a status pass at the first page entirely older than
+                the status watermark. Only meaningful when the listing is newest first.
+
+        Returns:
+            SyncReport: Pages read and documents changed or removed per status.
+        """
+        started = time.monotonic()
+        sync_started = time.time()
+        report = SyncReport()
+        for status in statuses or list(StatusDocument):
+            report.statuses[status.value] = self._sync_status(status, stop_after_unchanged, since_watermark)
+
+        # removals wait for every pass, so a document that moved between two synced statuses is updated, not dropped
+        with self._lock:
+            for status, result in report.statuses.items():
+                if not result.complete:
+                    continue
+                stale = [row[0] for row in self._connection.execute(
+                    "SELECT uuid FROM documents WHERE status_document = ? AND synced_at < ?", (status, sync_started))]
+                self._delete(stale)
+                result.removed = len(stale)
+            self._connection.commit()
+        report.elapsed = time.monotonic() - started
+        logger.info(f"mirror sync: {report.changed} documents changed in {report.elapsed:.2f}s")
+        return report
+
+    def _sync_status(self, status: StatusDocument, stop_after_unchanged: Optional[int],
+                     since_watermark: bool) -> StatusSync:
+        result = StatusSync()
+        previous = self.watermark(status) if since_watermark else None
+        watermark = ""
+        unchanged_pages = 0
+        page = 1
+        while True:
+            response = self.api_client.get_documents_by_status(status, page=page, limit=self.page_size)
+            result.pages += 1
+            result.seen += len(response.documents)
+            changed = self.upsert(response.documents, touch=True)
+            result.changed += changed
+            newest = max((max(doc.reviewed_at or "", doc.uploaded or "") for doc in response.documents), default="")
+            watermark = max(watermark, newest)
+
+            if not response.documents or page * self.page_size >= response.total:
+                break
+            unchanged_pages = 0 if changed else unchanged_pages + 1
+            if stop_after_unchanged is not None and unchanged_pages >= stop_after_unchanged:
+                result.complete = False
+                break
+            if previous and newest < previous:
+                # everything further down the listing predates the previous pass
+                result.complete = False
+                break
+            page += 1
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO sync_state (status, watermark, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(status) DO UPDATE SET watermark = max(coalesce(watermark, ''), excluded.watermark), "
+                "synced_at = excluded.synced_at",
+                (status.value, watermark, time.time()))
+            self._connection.commit()
+        return result
+
+    def upsert(self, documents: Sequence[Document], touch: bool = False) -> int:
+        """
+        Writes documents whose status, `reviewed_at`, `uploaded` or entities changed, with their entities.
+
+        Args:
+            documents (Sequence[Document]): Documents to mirror.
+            touch (bool): Also mark unchanged documents as seen by the current sync.
+
+        Returns:
+            int: Number of documents inserted or updated.
+        """
+        if not documents:
+            return 0
+        now = time.time()
+        with self._lock:
+            stored = self._stamps([doc.uuid for doc in documents])
+            changed = [doc for doc in documents if _changed(stored.get(doc.uuid), doc)]
+            changed_uuids = {doc.uuid for doc in changed}
+            unchanged = [doc.uuid for doc in documents if doc.uuid not in changed_uuids]
+            for doc in changed:
+                self._write(doc, now)
+            if touch and unchanged:
+                self._connection.executemany("UPDATE documents SET synced_at = ? WHERE uuid = ?",
+                                             [(now, uuid) for uuid in unchanged])
+            self._connection.commit()
+        return len(changed)
+
+    def _stamps(self, uuids: List[str]) -> Dict[str, Tuple]:
+        placeholders = ",".join("?" * len(uuids))
+        rows = self._connection.execute(
+            f"SELECT uuid, status_document, reviewed_at, uploaded, has_entities, entities_hash FROM documents "
+            f"WHERE uuid IN ({placeholders})", uuids)
+        return {row[0]: row[1:] for row in rows}
+
+    def _write(self, doc: Document, now: float):
+        has_entities = doc.entities is not None
+        # a listing without entities keeps the ones already mirrored
+        self._connection.execute(
+            f"INSERT INTO documents ({', '.join(_DOCUMENT_COLUMNS)}, has_entities, synced_at, entities_hash) "
+            f"VALUES ({', '.join('?' * (len(_DOCUMENT_COLUMNS) + 3))}) ON CONFLICT(uuid) DO UPDATE SET "
+            f"{', '.join(f'{column} = excluded.{column}' for column in _DOCUMENT_COLUMNS[1:])}, "
+            f"has_entities = max(has_entities, excluded.has_entities), synced_at = excluded.synced_at, "
+            f"entities_hash = coalesce(excluded.entities_hash, entities_hash)",
+            tuple(getattr(doc, column) for column in _DOCUMENT_COLUMNS) + (int(has_entities), now, _entities_hash(doc)))
+        if has_entities:
+            self._connection.execute("DELETE FROM entities WHERE document_uuid = ?", (doc.uuid,))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entities (document_uuid, id, key, value, page, id_core, is_valid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(doc.uuid, entity.id, entity.key, entity.value, entity.page, entity.id_core, int(entity.is_valid))
+                 for entity in doc.entities])
+
+    def _delete(self, uuids: List[str]):
+        self._connection.executemany("DELETE FROM entities WHERE document_uuid = ?", [(uuid,) for uuid in uuids])
+        self._connection.executemany("DELETE FROM documents WHERE uuid = ?", [(uuid,) for uuid in uuids])
+
+    def watermark(self, status: StatusDocument) -> Optional[str]:
+        """
+        Latest `reviewed_at`/`uploaded` seen for `status`, or None if it was never synced.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark FROM sync_state WHERE status = ?", (status.value,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, uuid: str) -> Optional[Document]:
+        documents = self.documents(uuid=uuid)
+        return documents[0] if documents else None
+
+    def documents(self, status: Optional[StatusDocument] = None, batch_id: Optional[str] = None,
+                  type_document: Optional[str] = None, entity_key: Optional[str] = None,
+                  entity_value: Optional[str] = None, uuid: Optional[str] = None,
+                  reviewed_since: Optional[str] = None, limit: Optional[int] = None,
+                  offset: int = 0) -> List[Document]:
+        """
+        Mirrored documents matching every given filter, most recently reviewed first, with their entities.
+
+        Args:
+            status (Optional[StatusDocument]): Document status.
+            batch_id (Optional[str]): Batch the documents belong to.
+            type_document (Optional[str]): Document type id.
+            entity_key (Optional[str]): Only documents with an entity of this key.
+            entity_value (Optional[str]): Only documents with an entity of this value
+                (of key `entity_key` if given).
+            uuid (Optional[str]): A single document.
+            reviewed_since (Optional[str]): Only documents with `reviewed_at` >= this value.
+            limit (Optional[int]): Maximum documents returned.
+            offset (int): Documents skipped, for pagination.
+
+        Returns:
+            List[Document]: The matching documents.
+        """
+        where, params = _filters(status, batch_id, type_document, entity_key, entity_value, uuid, reviewed_since)
+        query = f"SELECT {', '.join(_DOCUMENT_COLUMNS)}, has_entities FROM documents d{where} " \
+                f"ORDER BY reviewed_at DESC, uuid LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._connection.execute(query, params + [-1 if limit is None else limit, offset]).fetchall()
+            entities: Dict[str, List[Entity]] = {}
+            uuids = [row[0] for row in rows if row[-1]]
+            for start in range(0, len(uuids), 500):
+                chunk = uuids[start:start + 500]
+                for row in self._connection.execute(
+                        f"SELECT document_uuid, id, key, value, page, id_core, is_valid FROM entities "
+                        f"WHERE document_uuid IN ({','.join('?' * len(chunk))})", chunk):
+                    entities.setdefault(row[0], []).append(
+                        Entity(id=row[1], key=row[2], value=row[3], page=row[4], id_core=row[5], is_valid=bool(row[6])))
+        return [
+            Document(**dict(zip(_DOCUMENT_COLUMNS, row[:-1])), entities=entities.get(row[0], []) if row[-1] else None)
+            for row in rows
+        ]
+
+    def count(self, status: Optional[StatusDocument] = None, batch_id: Optional[str] = None,
+              type_document: Optional[str] = None, entity_key: Optional[str] = None,
+              entity_value: Optional[str] = None) -> int:
+        """
+        Number of mirrored documents matching every given filter (see `documents`).
+        """
+        where, params = _filters(status, batch_id, type_document, entity_key, entity_value, None, None)
+        with self._lock:
+            return self._connection.execute(f"SELECT count(*) FROM documents d{where}", params).fetchone()[0]
+
+    def counts_by_status(self, batch_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Number of mirrored documents per status value, optionally within one batch.
+        """
+        where, params = _filters(None, batch_id, None, None, None, None, None)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT status_document, count(*) FROM documents d{where} GROUP BY status_document", params)
+            return dict(rows.fetchall())
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _entities_hash(doc: Document) -> Optional[str]:
+    if doc.entities is None:
+        return None
+    return DocumentFingerprint.of(doc).entities_hash.hex()
+
+
+def _changed(stored: Optional[Tuple], doc: Document) -> bool:
+    if stored is None:
+        return True
+    if stored[:3] != (doc.status_document, doc.reviewed_at, doc.uploaded):
+        return True
+    # entities can be edited without touching the status or timestamps
+    return doc.entities is not None and (not stored[3] or stored[4] != _entities_hash(doc))
+
+
+def _filters(status, batch_id, type_document, entity_key, entity_value, uuid, reviewed_since) -> Tuple[str, list]:
+    clauses, params = [], []
+    for column, value in (("status_document", status.value if status else None), ("batch_id", batch_id),
+                          ("type_document", type_document), ("uuid", uuid)):
+        if value is not None:
+            clauses.append(f"d.{column} = ?")
+            params.append(value)
+    if reviewed_since is not None:
+        clauses.append("d.reviewed_at >= ?")
+        params.append(reviewed_since)
+    if entity_key is not None or entity_value is not None:
+        entity_clauses = ["e.document_uuid = d.uuid"]
+        if entity_key is not None:
+            entity_clauses.append("e.key = ?")
+            params.append(entity_key)
+        if entity_value is not None:
+            entity_clauses.append("e.value = ?")
+            params.append(entity_value)
+        clauses.append(f"EXISTS (SELECT 1 FROM entities e WHERE {' AND '.join(entity_clauses)})")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
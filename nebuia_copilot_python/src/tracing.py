@@ -0,0 +1,194 @@
+import functools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+PHASES = ("send", "wait", "download", "decode", "build")
+
+_local = threading.local()
+
+
+@dataclass
+class Span:
+    """
+    Timing of a single APIClient call.
+
+    Phases, in seconds, accumulated over every HTTP request the call made (retries included):
+        send: connection setup and request body streaming; only measured for streamed bodies
+            such as file uploads, otherwise it is part of `wait`.
+        wait: from the end of the request body to the response headers (server time).
+        download: reading the response body.
+        decode: JSON decoding.
+        build: everything else until the call returns, mostly building the result models.
+
+    Attributes:
+        name (str): The APIClient method, e.g. "get_documents_by_status".
+        start_time (float): Unix time the call started.
+        duration (Optional[float]): Seconds the call took; None while it is running.
+        phases (Dict[str, float]): Seconds per phase.
+        method (Optional[str]): HTTP method of the last request.
+        url (Optional[str]): URL of the last request.
+        status_code (Optional[int]): Status code of the last response.
+        requests (int): HTTP requests sent.
+        request_bytes (int): Request body bytes sent, when known.
+        response_bytes (int): Response body bytes received.
+        error (Optional[BaseException]): The exception the call raised, if any.
+        parent (Optional[Span]): The call this one was made from, e.g. append_job for _upload_file.
+    """
+    name: str
+    start_time: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    phases: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    method: Optional[str] = None
+    url: Optional[str] = None
+    status_code: Optional[int] = None
+    requests: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    error: Optional[BaseException] = None
+    parent: Optional["Span"] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _accounted: float = field(default=0.0, repr=False)
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phases[phase] += seconds
+        self._accounted += seconds
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started
+        self.phases["build"] += max(0.0, self.duration - self._accounted)
+
+
+class Tracer:
+    """
+    Receives the spans of an APIClient. Subclass it and override `on_start` and/or `on_end`.
+    """
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        pass
+
+
+class CallbackTracer(Tracer):
+    """
+    Tracer calling plain functions, e.g. `CallbackTracer(on_end=spans.append)`.
+    """
+
+    def __init__(self, on_start: Optional[Callable[[Span], None]] = None,
+                 on_end: Optional[Callable[[Span], None]] = None):
+        self._on_start = on_start
+        self._on_end = on_end
+
+    def on_start(self, span: Span):
+        if self._on_start is not None:
+            self._on_start(span)
+
+    def on_end(self, span: Span):
+        if self._on_end is not None:
+            self._on_end(span)
+
+
+class MultiTracer(Tracer):
+    """
+    Forwards spans to several tracers.
+    """
+
+    def __init__(self, tracers: List[Tracer]):
+        self.tracers = list(tracers)
+
+    def on_start(self, span: Span):
+        for tracer in self.tracers:
+            tracer.on_start(span)
+
+    def on_end(self, span: Span):
+        for tracer in self.tracers:
+            tracer.on_end(span)
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Exports spans through an OpenTelemetry tracer, e.g. `trace.get_tracer("nebuia")`.
+
+    Each call becomes a span named `nebuia.<method>` with HTTP attributes, one event per
+    phase carrying its duration, and an exception record when the call failed. The
+    OpenTelemetry SDK is not a dependency: any object with the `start_span` API works.
+    """
+
+    def __init__(self, otel_tracer: Any):
+        self.otel_tracer = otel_tracer
+
+    def on_end(self, span: Span):
+        start_ns = int(span.start_time * 1e9)
+        otel_span = self.otel_tracer.start_span(f"nebuia.{span.name}", start_time=start_ns)
+        attributes = {
+            "http.method": span.method,
+            "http.url": span.url,
+            "http.status_code": span.status_code,
+            "http.request_content_length": span.request_bytes,
+            "http.response_content_length": span.response_bytes,
+            "nebuia.requests": span.requests,
+        }
+        for key, value in attributes.items():
+            if value is not None:
+                otel_span.set_attribute(key, value)
+        offset = start_ns
+        for phase in PHASES:
+            seconds = span.phases[phase]
+            otel_span.add_event(phase, {"duration_ms": seconds * 1000}, timestamp=offset)
+            offset += int(seconds * 1e9)
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+        otel_span.end(end_time=start_ns + int((span.duration or 0.0) * 1e9))
+
+
+def current_span() -> Optional[Span]:
+    return getattr(_local, "span", None)
+
+
+def traced(function: Callable) -> Callable:
+    """
+    Decorates an APIClient method so that each call produces a Span for `self.tracer`.
+    Without a tracer the call goes straight through.
+    """
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return function(self, *args, **kwargs)
+        parent = current_span()
+        span = Span(name=name, parent=parent)
+        _local.span = span
+        tracer.on_start(span)
+        try:
+            return function(self, *args, **kwargs)
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.finish()
+            _local.span = parent
+            tracer.on_end(span)
+
+    return wrapper
+
+
+class TimedBody:
+    """
+    Wraps a streamed request body (e.g. a MultipartEncoder) to record when its last byte was read.
+    """
+
+    def __init__(self, body: Any):
+        self.body = body
+        self.len = getattr(body, "len", None)
+        self.finished_at: Optional[float] = None
+
+    def read(self, size: int = -1):
+        chunk = self.body.read(size)
+        if not chunk and self.finished_at is None:
+            self.finished_at = time.perf_counter()
+        return chunk
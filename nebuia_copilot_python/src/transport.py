@@ -0,0 +1,216 @@
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class Transport:
+    """
+    Sends the HTTP requests of an APIClient. Takes the arguments of `requests.request`
+    and returns a `requests.Response`.
+    """
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return requests.request(method, url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised on replay when the cassette holds no (more) responses for a request.
+    """
+
+
+def _body_digest(kwargs: dict) -> Optional[str]:
+    """
+    Short hash of the request body, so that POSTs to the same path with different bodies
+    (e.g. searches) are told apart. Streamed bodies, such as multipart uploads, are not
+    hashed.
+    """
+    body = kwargs.get("data")
+    if body is None and kwargs.get("json") is not None:
+        body = json.dumps(kwargs["json"], sort_keys=True)
+    if isinstance(body, dict):
+        body = urlencode(sorted(body.items()), doseq=True)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, bytes) or not body:
+        return None
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def _key(method: str, url: str, kwargs: dict) -> Tuple[str, str, Optional[str]]:
+    parts = urlsplit(url)
+    return method.upper(), parts.path + (f"?{parts.query}" if parts.query else ""), _body_digest(kwargs)
+
+
+def body_size(body) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return getattr(body, "len", None) or 0
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests through `inner` and appends each request/response pair to a cassette.
+
+    The cassette is JSON lines, gzipped when the path ends in ".gz", one line per request:
+    method, path and query (the base URL is dropped, so a cassette replays against any
+    base), a hash and the size of the request body, status code, content type, response
+    body, the seconds the request took and, of those, the seconds spent downloading the
+    body. Credentials and other request headers are never written. Lines are written as
+    responses arrive; call `close()` (or use it as a context manager) to flush.
+
+    The response body is read here, before the client gets the response, so while recording
+    the `download` phase of traced calls is reported as part of `wait`; the cassette keeps
+    the actual download time.
+
+    Example:
+        >>> with RecordingTransport("traffic.jsonl.gz") as recorder:
+        ...     integrator.set_transport(recorder)
+        ...     integrator.get_documents_by_status(StatusDocument.COMPLETE, limit=100)
+        >>> integrator.set_transport(None)
+    """
+
+    def __init__(self, path: str, inner: Optional[Transport] = None):
+        self.path = path
+        self.inner = inner or Transport()
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "at", encoding="utf-8") if path.endswith(".gz") else open(path, "a", encoding="utf-8")
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        response = self.inner.request(method, url, **kwargs)
+        headers_at = time.perf_counter()
+        content = response.content
+        done = time.perf_counter()
+
+        method, path, digest = _key(method, url, kwargs)
+        entry = {
+            "method": method,
+            "path": path,
+            "request_sha1": digest,
+            "request_bytes": body_size(response.request.body if response.request is not None else kwargs.get("data")),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "elapsed": round(done - started, 6),
+            "download": round(done - headers_at, 6),
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self.recorded += 1
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.inner.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from a cassette written by RecordingTransport, without any network.
+
+    Requests are matched by method, path, query and body hash; repeated requests (e.g.
+    listener polls) get the recorded responses in their original order. Each response is delayed by its
+    recorded duration times `time_scale`: 1 replays the original latencies, 0.1 ten times
+    faster, and 0 (or None) returns at once, to profile the client alone.
+
+    Args:
+        path (str): The cassette.
+        time_scale (Optional[float]): Multiplier of the recorded durations. Defaults to 1.
+        loop (bool): When the responses of a request run out, start again from the first
+            one instead of raising CassetteMiss. Defaults to False.
+
+    Example:
+        >>> integrator = Integrator(with_base="http://replay", key="", secret="")
+        >>> integrator.set_transport(ReplayTransport("traffic.jsonl.gz", time_scale=0))
+        >>> integrator.get_documents_by_status(StatusDocument.COMPLETE, limit=100)
+    """
+
+    def __init__(self, path: str, time_scale: Optional[float] = 1.0, loop: bool = False):
+        self.path = path
+        self.time_scale = time_scale or 0.0
+        self.loop = loop
+        self.replayed = 0
+        self._entries: Dict[Tuple[str, str, Optional[str]], List[dict]] = defaultdict(list)
+        self._queues: Dict[Tuple[str, str, Optional[str]], Deque[dict]] = {}
+        self._lock = threading.Lock()
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[(entry["method"], entry["path"], entry.get("request_sha1"))].append(entry)
+        self.rewind()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def rewind(self):
+        """
+        Makes every recorded response available again, from the first one.
+        """
+        with self._lock:
+            self._queues = {key: deque(entries) for key, entries in self._entries.items()}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = _key(method, url, kwargs)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue and self.loop and key in self._entries:
+                queue = self._queues[key] = deque(self._entries[key])
+            if not queue:
+                raise CassetteMiss(f"no recorded response for {key[0]} {key[1]} in {self.path}")
+            entry = queue.popleft()
+            self.replayed += 1
+
+        if self.time_scale > 0:
+            time.sleep(entry["elapsed"] * self.time_scale)
+        return self._response(entry, method, url, kwargs)
+
+    @staticmethod
+    def _response(entry: dict, method: str, url: str, kwargs: dict) -> requests.Response:
+        request = requests.PreparedRequest()
+        request.method = method.upper()
+        request.url = url
+        request.headers = CaseInsensitiveDict(kwargs.get("headers") or {})
+        request.body = kwargs.get("data")
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.url = url
+        response.request = request
+        response.encoding = "utf-8"
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        if "body_b64" in entry:
+            response._content = base64.b64decode(entry["body_b64"])
+        else:
+            response._content = entry["body"].encode("utf-8")
+        return response
@@ -11,6 +11,10 @@ setup(
         'requests_toolbelt',
         'events'
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+        'test': ['pytest'],
+    },
     author='xellDart',
     author_email='miguel@nebuia.com',
     description='NebuIA Copilot python integration',
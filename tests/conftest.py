@@ -0,0 +1,37 @@
+import signal
+import time
+
+import pytest
+
+from nebuia_copilot_python.integration import Integrator
+from nebuia_copilot_python.src.mock.server import MockNebuIAServer, MockProfile
+
+
+@pytest.fixture
+def server():
+    with MockNebuIAServer(MockProfile(entities_per_document=3, seed=7)) as mock:
+        yield mock
+
+
+@pytest.fixture
+def integrator(server):
+    # the default listener installs a SIGINT handler; keep pytest's
+    previous = signal.getsignal(signal.SIGINT)
+    instance = Integrator(with_base=server.url, key="key", secret="secret")
+    signal.signal(signal.SIGINT, previous)
+    yield instance
+    instance._searcher.close()
+
+
+@pytest.fixture
+def api_client(integrator):
+    return integrator._api_client
+
+
+def wait_until(condition, timeout: float = 5.0, interval: float = 0.01) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from nebuia_copilot_python.src.listener.async_manager import AsyncListenerManager
+from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+def test_checkpoints_are_written_off_the_event_loop(api_client, server, tmp_path):
+    server.seed_documents(2, StatusDocument.WAITING_QA)
+    checkpoint = CheckpointStore(str(tmp_path / "async.db"))
+    threads = []
+    acknowledge = checkpoint.acknowledge
+
+    def recording_acknowledge(*args):
+        threads.append(threading.current_thread())
+        acknowledge(*args)
+
+    checkpoint.acknowledge = recording_acknowledge
+    manager = AsyncListenerManager(api_client, checkpoint=checkpoint)
+    listener = manager.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=1, limit_documents=10)
+    handled = []
+
+    async def run():
+        manager.semaphore = asyncio.Semaphore(2)
+        manager.set_on_document_handler(lambda status, doc: handled.append(doc.uuid))
+        await listener.poll()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert len(handled) == 2 and len(checkpoint) == 2
+    assert threads and all(thread is not loop_thread for thread in threads)
+
+
+def test_async_checkpoints_do_not_hide_later_pages(api_client, server, tmp_path):
+    uuids = server.seed_documents(25, StatusDocument.WAITING_QA)
+    checkpoint = CheckpointStore(str(tmp_path / "async.db"))
+    manager = AsyncListenerManager(api_client, checkpoint=checkpoint)
+    listener = manager.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=1, limit_documents=10)
+    handled = []
+
+    async def run():
+        manager.semaphore = asyncio.Semaphore(4)
+        manager.set_on_document_handler(lambda status, doc: handled.append(doc.uuid))
+        for _ in range(4):
+            await listener.poll()
+
+    asyncio.run(run())
+    assert sorted(handled) == sorted(uuids)
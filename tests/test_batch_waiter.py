@@ -0,0 +1,45 @@
+from nebuia_copilot_python.src.models import BatchType, File, StatusDocument
+from nebuia_copilot_python.src.pipeline.waiter import BatchWaiter
+
+
+def _processing_batch(integrator, server, count, processing_time):
+    server.profile.processing_time = processing_time
+    _, batch_id = integrator.create_batch("waited", BatchType.EXECUTION)
+    integrator.append_to_batch(batch_id, [File(b"%PDF-1.4", "mock", f"file_{index}.pdf") for index in range(count)])
+    integrator._api_client.process_item(batch_id=batch_id)
+    return batch_id
+
+
+def test_waits_until_the_batch_is_done(integrator, server):
+    batch_id = _processing_batch(integrator, server, 4, processing_time=0.1)
+    updates = []
+    progress = BatchWaiter(integrator._api_client, min_interval=0.02, max_interval=0.05).wait(
+        batch_id, on_progress=lambda update: updates.append(update.finished))
+    assert progress.done and not progress.timed_out
+    assert progress.total == progress.finished == 4
+    assert progress.counts == {StatusDocument.COMPLETE.value: 4}
+    assert updates[-1] == 4
+
+
+def test_gives_up_at_the_timeout(integrator, server):
+    batch_id = _processing_batch(integrator, server, 2, processing_time=60)
+    progress = integrator.wait_for_batch(batch_id, timeout=0.1)
+    assert progress.timed_out and not progress.done
+    assert progress.total == 2 and progress.fraction == 0.0
+
+
+def test_unchanged_probes_skip_reading_the_batch(integrator, server):
+    batch_id = _processing_batch(integrator, server, 30, processing_time=60)
+    reads = []
+    waiter = BatchWaiter(integrator._api_client, page_size=10, min_interval=0.01, max_interval=0.01, max_skipped=100)
+    progress = waiter.wait(batch_id, timeout=0.2, on_progress=lambda update: reads.append(update))
+    assert len(reads) == 1
+    # callbacks get snapshots, not the live progress object
+    assert reads[0] is not progress and progress.timed_out and not reads[0].timed_out
+
+
+def test_empty_batch_is_done_at_once(integrator):
+    _, batch_id = integrator.create_batch("empty", BatchType.EXECUTION)
+    progress = integrator.wait_for_batch(batch_id, timeout=5)
+    assert progress.done and not progress.timed_out
+    assert progress.total == 0 and progress.elapsed < 5
@@ -0,0 +1,51 @@
+import requests
+
+from nebuia_copilot_python.src.bulk.bulk import BulkRunner, is_transient
+from nebuia_copilot_python.src.models import StatusDocument
+
+
+def test_set_documents_status_updates_each_document_once(integrator, server):
+    uuids = server.seed_documents(6, StatusDocument.ERROR_OCR)
+    result = integrator.set_documents_status(uuids + uuids[:2], StatusDocument.WAITING_PROCESS, rate=None)
+    assert result.ok and len(result) == 6
+    assert integrator.get_documents_by_status(StatusDocument.WAITING_PROCESS).total == 6
+
+
+def test_server_errors_are_retried(integrator, server):
+    uuids = server.seed_documents(2)
+    server.profile.error_rate = 1.0
+    result = integrator.delete_documents(uuids, rate=None, max_retries=2)
+    assert not result.ok
+    assert all(outcome.attempts == 3 and "503" in outcome.error for outcome in result.outcomes)
+
+
+def test_unknown_document_is_a_definitive_failure(integrator):
+    result = integrator.delete_documents(["missing"], rate=None)
+    assert result.failed == ["missing"]
+    assert result.outcomes[0].attempts == 1 and result.outcomes[0].error is None
+
+
+def test_only_json_decode_errors_count_as_transient():
+    assert is_transient(requests.JSONDecodeError("bad", "<html>", 0))
+    assert not is_transient(ValueError("bad input"))
+    assert not is_transient(KeyError("status"))
+
+
+def test_runner_recovers_from_transient_errors():
+    calls = []
+
+    def flaky(uuid):
+        calls.append(uuid)
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return True
+
+    result = BulkRunner(max_workers=1, rate=None, backoff=0.001).run(flaky, ["a"])
+    assert result.ok and result.outcomes[0].attempts == 3
+
+
+def test_single_document_calls_report_server_errors_as_false(api_client, server):
+    uuid = server.seed_documents(1)[0]
+    server.profile.error_rate = 1.0
+    assert api_client.set_document_status(uuid, StatusDocument.COMPLETE) is False
+    assert api_client.delete_document_from_batch(uuid) is False
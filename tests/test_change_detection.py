@@ -0,0 +1,48 @@
+import dataclasses
+
+from nebuia_copilot_python.src.listener.diff import ChangeDetector
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+STATUS = StatusDocument.COMPLETE
+
+
+def _edit(doc, value):
+    return dataclasses.replace(doc, entities=[dataclasses.replace(doc.entities[0], value=value)] + doc.entities[1:])
+
+
+def test_detector_reports_only_modified_entities(api_client, server):
+    doc = api_client.get_document_by_uuid(server.seed_documents(1, STATUS)[0])
+    detector = ChangeDetector()
+
+    fingerprint, changed = detector.changes(doc)
+    assert changed == doc.entities
+    detector.remember(doc.uuid, fingerprint)
+    assert detector.changes(doc) is None
+
+    edited = _edit(doc, "corrected")
+    fingerprint, changed = detector.changes(edited)
+    assert [entity.value for entity in changed] == ["corrected"]
+
+
+def test_detector_keeps_the_most_recent_documents():
+    detector = ChangeDetector(max_documents=2, emit_initial=False)
+    for uuid in ("a", "b", "c"):
+        detector.remember(uuid, None)
+    assert len(detector) == 2
+
+
+def test_listener_emits_each_version_once(api_client, server):
+    uuids = server.seed_documents(2, STATUS)
+    listener = ThreadedEventBasedListener(api_client, STATUS, BatchType.EXECUTION, interval=60,
+                                          limit_documents=10, detect_changes=True)
+    changes = []
+    listener.events.on_document_changed += lambda status, doc, entities: changes.append((doc.uuid, len(entities)))
+
+    listener.poll()
+    listener.poll()
+    assert sorted(uuid for uuid, _ in changes) == sorted(uuids)
+
+    listener.deliver([_edit(api_client.get_document_by_uuid(uuids[0]), "corrected")])
+    assert changes[-1] == (uuids[0], 1)
+    assert len(changes) == 3
@@ -0,0 +1,71 @@
+from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+STATUS, BATCH_TYPE = StatusDocument.WAITING_QA, BatchType.EXECUTION
+
+
+def test_old_acknowledgements_are_pruned_while_running(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr("nebuia_copilot_python.src.listener.checkpoint.time.time", lambda: now[0])
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"), max_age=100)
+    for index in range(10):
+        store.acknowledge(STATUS, BATCH_TYPE, f"doc-{index}")
+        now[0] += 50
+    # pruned every max_age seconds, so at most two windows of acknowledgements remain
+    assert len(store) <= 4
+    assert store.is_handled(STATUS, BATCH_TYPE, "doc-9")
+    assert not store.is_handled(STATUS, BATCH_TYPE, "doc-0")
+    store.close()
+
+    # the pruned rows were deleted from the database as well
+    reopened = CheckpointStore(str(tmp_path / "checkpoints.db"), max_age=None)
+    assert len(reopened) <= 4
+    assert not reopened.is_handled(STATUS, BATCH_TYPE, "doc-0")
+    reopened.close()
+
+
+def test_retain_forgets_documents_that_left_the_status(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.acknowledge(STATUS, BATCH_TYPE, "stays")
+    store.acknowledge(STATUS, BATCH_TYPE, "left")
+    store.acknowledge(StatusDocument.COMPLETE, BATCH_TYPE, "other listener")
+    store.retain(STATUS, BATCH_TYPE, ["stays", "new"])
+    assert store.is_handled(STATUS, BATCH_TYPE, "stays")
+    assert not store.is_handled(STATUS, BATCH_TYPE, "left")
+    assert store.is_handled(StatusDocument.COMPLETE, BATCH_TYPE, "other listener")
+    store.close()
+
+
+def test_document_reentering_the_status_is_delivered_again(api_client, server, tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    uuid = server.seed_documents(1, STATUS)[0]
+    listener = ThreadedEventBasedListener(api_client, STATUS, BATCH_TYPE, interval=1, limit_documents=10,
+                                          checkpoint=store)
+    delivered = []
+    listener.events.on_document += lambda status, doc: delivered.append(doc.uuid)
+
+    listener.poll()
+    listener.poll()
+    assert delivered == [uuid]
+
+    api_client.set_document_status(uuid, StatusDocument.COMPLETE)
+    listener.poll()
+    api_client.set_document_status(uuid, STATUS)
+    listener.poll()
+    assert delivered == [uuid, uuid]
+    store.close()
+
+
+def test_handled_documents_that_stay_do_not_hide_later_pages(api_client, server, tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    uuids = server.seed_documents(25, STATUS)
+    listener = ThreadedEventBasedListener(api_client, STATUS, BATCH_TYPE, interval=1, limit_documents=10,
+                                          checkpoint=store)
+    delivered = []
+    listener.events.on_document += lambda status, doc: delivered.append(doc.uuid)
+
+    for _ in range(4):
+        listener.poll()
+    assert sorted(delivered) == sorted(uuids)
+    store.close()
@@ -0,0 +1,100 @@
+import threading
+
+import requests
+
+from nebuia_copilot_python.src.listener.claim import ClaimConfig, LeaseManager
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+STATUS = StatusDocument.WAITING_QA
+CLAIM = ClaimConfig(done_status=StatusDocument.COMPLETE)
+
+
+def _worker(api_client, handled, lock, fail=False):
+    listener = ThreadedEventBasedListener(api_client, STATUS, BatchType.EXECUTION, interval=60,
+                                          limit_documents=50, claim=CLAIM)
+
+    def on_document(status, doc):
+        if fail:
+            raise RuntimeError("worker broke")
+        with lock:
+            handled.append(doc.uuid)
+
+    listener.events.on_document += on_document
+    return listener
+
+
+def test_documents_claimed_by_another_worker_are_skipped(api_client, server):
+    uuids = server.seed_documents(3, STATUS)
+    other = LeaseManager(api_client, STATUS, BatchType.EXECUTION, CLAIM)
+    taken = api_client.get_document_by_uuid(uuids[0])
+    assert other.claim(taken)
+    # a stale listing still shows the claimed document in the queue
+    assert not other.claim(taken)
+
+    handled, lock = [], threading.Lock()
+    _worker(api_client, handled, lock).poll()
+    assert sorted(handled) == sorted(uuids[1:])
+    assert api_client.get_documents_by_status(StatusDocument.COMPLETE).total == 2
+    assert api_client.get_document_by_uuid(uuids[0]).status_document == StatusDocument.ASSIGNED.value
+
+
+def test_failed_handler_requeues_its_claim(api_client, server):
+    uuids = server.seed_documents(2, STATUS)
+    handled, lock = [], threading.Lock()
+    _worker(api_client, handled, lock, fail=True).poll()
+    assert api_client.get_documents_by_status(STATUS).total == 2
+
+    _worker(api_client, handled, lock).poll()
+    assert sorted(handled) == sorted(uuids)
+
+
+def test_abandoned_claims_are_reaped(api_client, server):
+    uuid = server.seed_documents(1, StatusDocument.ASSIGNED)[0]
+    leases = LeaseManager(api_client, STATUS, BatchType.EXECUTION, ClaimConfig(lease_timeout=0.0))
+    assert leases.reap_expired() == 1
+    assert api_client.get_document_by_uuid(uuid).status_document == STATUS.value
+
+
+def test_release_survives_network_errors(api_client, server, monkeypatch):
+    uuid = server.seed_documents(1, STATUS)[0]
+    leases = LeaseManager(api_client, STATUS, BatchType.EXECUTION, CLAIM)
+    doc = api_client.get_document_by_uuid(uuid)
+    assert leases.claim(doc)
+
+    def unreachable(**kwargs):
+        raise requests.ConnectionError("reset")
+
+    monkeypatch.setattr(api_client, "set_document_status", unreachable)
+    leases.release(doc, success=False)
+    assert api_client.get_document_by_uuid(uuid).status_document == StatusDocument.ASSIGNED.value
+
+
+def test_claim_is_dropped_when_the_document_moves_on(api_client, server, monkeypatch):
+    uuid = server.seed_documents(1, STATUS)[0]
+    leases = LeaseManager(api_client, STATUS, BatchType.EXECUTION, CLAIM)
+    set_status = api_client.set_document_status
+
+    def racing(**kwargs):
+        claimed = set_status(**kwargs)
+        # another worker completes the document right after our update
+        server.set_status([uuid], StatusDocument.COMPLETE)
+        return claimed
+
+    monkeypatch.setattr(api_client, "set_document_status", racing)
+    assert not leases.claim(api_client.get_document_by_uuid(uuid))
+
+
+def test_unreadable_document_is_skipped_without_aborting_the_page(api_client, server, monkeypatch):
+    uuids = server.seed_documents(3, STATUS)
+    get_document = api_client.get_document_by_uuid
+
+    def flaky(uuid):
+        if uuid == uuids[0]:
+            raise requests.ConnectionError("reset")
+        return get_document(uuid)
+
+    monkeypatch.setattr(api_client, "get_document_by_uuid", flaky)
+    handled, lock = [], threading.Lock()
+    _worker(api_client, handled, lock).poll()
+    assert sorted(handled) == sorted(uuids[1:])
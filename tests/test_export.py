@@ -0,0 +1,87 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from nebuia_copilot_python.src.export.exporter import BatchExporter, ExportState
+from nebuia_copilot_python.src.models import StatusDocument
+
+
+@pytest.fixture
+def batch(server, api_client):
+    uuids = server.seed_documents(25, StatusDocument.COMPLETE)
+    return api_client.get_document_by_uuid(uuids[0]).batch_id, uuids
+
+
+def _jsonl_uuids(path):
+    with gzip.open(path, "rt") as f:
+        return [json.loads(line)["uuid"] for line in f]
+
+
+def test_jsonl_export_writes_every_document(integrator, batch, tmp_path):
+    batch_id, uuids = batch
+    path = str(tmp_path / "batch.jsonl.gz")
+    state = integrator.export_batch_to_jsonl(batch_id, path, page_size=10)
+    assert state.finished and state.documents == 25
+    assert _jsonl_uuids(path) == uuids
+    assert not os.path.exists(f"{path}.state")
+
+
+def test_jsonl_resume_continues_after_the_checkpoint(api_client, batch, tmp_path):
+    batch_id, uuids = batch
+    path = str(tmp_path / "batch.jsonl")
+    exporter = BatchExporter(api_client, page_size=10)
+    exporter.to_jsonl(batch_id, path)
+    with open(path, "rb") as f:
+        first_page = b"".join(f.readlines()[:10])
+    # interrupted after the first page, with a partial second page on disk
+    with open(path, "wb") as f:
+        f.write(first_page + b'{"partial')
+    ExportState(batch_id=batch_id, page_size=10, next_page=2, documents=10, total=25,
+                offset=len(first_page)).save(f"{path}.state")
+
+    state = exporter.to_jsonl(batch_id, path)
+    with open(path) as f:
+        assert [json.loads(line)["uuid"] for line in f] == uuids
+    assert state.documents == 25
+
+
+def test_jsonl_resume_starts_over_when_the_output_is_gone(api_client, batch, tmp_path):
+    batch_id, uuids = batch
+    path = str(tmp_path / "batch.jsonl.gz")
+    ExportState(batch_id=batch_id, page_size=10, next_page=2, documents=10, total=25,
+                offset=4096).save(f"{path}.state")
+
+    state = BatchExporter(api_client, page_size=10).to_jsonl(batch_id, path)
+    assert state.documents == 25
+    assert _jsonl_uuids(path) == uuids
+
+
+def test_parquet_export_and_resume(api_client, batch, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    batch_id, uuids = batch
+    directory = str(tmp_path / "parquet")
+    exporter = BatchExporter(api_client, page_size=10)
+
+    state = exporter.to_parquet(batch_id, directory, pages_per_file=2)
+    assert state.parts == 2 and state.documents == 25
+    table = pq.read_table(directory)
+    assert table.column("uuid").to_pylist() == uuids
+    assert len(table.column("entities")[0].as_py()) == 3
+
+    # interrupted after the first part file: the second one is rewritten
+    os.remove(os.path.join(directory, "part-00001.parquet"))
+    ExportState(batch_id=batch_id, page_size=10, next_page=3, documents=20, total=25,
+                parts=1).save(os.path.join(directory, "_export_state.json"))
+    state = exporter.to_parquet(batch_id, directory, pages_per_file=2)
+    assert state.documents == 25
+    assert pq.read_table(directory).column("uuid").to_pylist() == uuids
+
+    # a checkpoint whose part files are gone starts over
+    os.remove(os.path.join(directory, "part-00000.parquet"))
+    ExportState(batch_id=batch_id, page_size=10, next_page=3, documents=20, total=25,
+                parts=1).save(os.path.join(directory, "_export_state.json"))
+    state = exporter.to_parquet(batch_id, directory, pages_per_file=2)
+    assert state.documents == 25
+    assert pq.read_table(directory).column("uuid").to_pylist() == uuids
@@ -0,0 +1,32 @@
+import pytest
+
+from nebuia_copilot_python.src.models import Result, SearchParameters
+
+SEARCH = SearchParameters(batch="brain", param="flu", k=3, type_search="semantic")
+
+
+def _result(uuid, score=0.0, coincidences=0):
+    return Result(uuid=uuid, content=uuid, name=None, source=1, coincidences=coincidences, score=score)
+
+
+def test_unknown_method_is_rejected_before_searching(integrator, server):
+    before = server.requests
+    with pytest.raises(ValueError):
+        integrator.search_in_brain_hybrid(SEARCH, method="borda")
+    assert server.requests == before
+
+
+def test_rrf_ranks_results_by_score_not_by_server_order(integrator, monkeypatch):
+    unordered = {
+        "semantic": [_result("low", score=0.1), _result("high", score=0.9)],
+        "literal": [_result("low", coincidences=1), _result("high", coincidences=5)],
+    }
+    monkeypatch.setattr(integrator._searcher, "search_brain", lambda search: unordered[search.type_search])
+    fused = integrator.search_in_brain_hybrid(SEARCH, method="rrf").results
+    assert [result.uuid for result in fused] == ["high", "low"]
+
+
+def test_hybrid_search_against_the_mock(integrator):
+    fused = integrator.search_in_brain_hybrid(SEARCH, method="weighted").results
+    assert 0 < len(fused) <= SEARCH.k
+    assert [result.score for result in fused] == sorted((result.score for result in fused), reverse=True)
@@ -0,0 +1,93 @@
+from nebuia_copilot_python.src.listener.claim import ClaimConfig
+from nebuia_copilot_python.src.listener.listener_integrator import ListenerIntegrator
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+def _listener_integrator(api_client, tmp_path, **listener_options):
+    integrator = ListenerIntegrator(api_client, handle_signals=False)
+    integrator.use_checkpoints(str(tmp_path / "checkpoints.db"))
+    listener = integrator.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=1,
+                                       limit_documents=10, **listener_options)
+    integrator.setup_event_handlers()
+    return integrator, listener
+
+
+def test_failed_batch_handler_gets_the_documents_again(api_client, server, tmp_path):
+    uuids = server.seed_documents(3, StatusDocument.WAITING_QA)
+    integrator, listener = _listener_integrator(api_client, tmp_path)
+    batches = []
+
+    def on_documents(status, documents):
+        batches.append([doc.uuid for doc in documents])
+        if len(batches) == 1:
+            raise RuntimeError("sink unavailable")
+
+    integrator.set_on_documents_handler(on_documents)
+    listener.poll()
+    assert not any(integrator.manager.checkpoint.is_handled(listener.status, listener.batch_type, uuid) for uuid in uuids)
+    listener.poll()
+    assert sorted(batches[1]) == sorted(uuids)
+    assert all(integrator.manager.checkpoint.is_handled(listener.status, listener.batch_type, uuid) for uuid in uuids)
+
+
+def test_claims_are_released_only_after_the_batch_handler(api_client, server, tmp_path):
+    server.seed_documents(2, StatusDocument.WAITING_QA)
+    claim = ClaimConfig(done_status=StatusDocument.COMPLETE)
+    integrator, listener = _listener_integrator(api_client, tmp_path, claim=claim)
+    statuses_during_batch = []
+
+    def on_documents(status, documents):
+        statuses_during_batch.extend(api_client.get_document_by_uuid(doc.uuid).status_document for doc in documents)
+        raise RuntimeError("sink unavailable")
+
+    integrator.set_on_documents_handler(on_documents)
+    listener.poll()
+    assert statuses_during_batch == [StatusDocument.ASSIGNED.value] * 2
+    # the failed batch requeued its claims
+    assert api_client.get_documents_by_status(StatusDocument.WAITING_QA).total == 2
+
+    integrator.set_on_documents_handler(lambda status, documents: None)
+    listener.poll()
+    assert api_client.get_documents_by_status(StatusDocument.COMPLETE).total == 2
+
+
+def test_micro_batches_settle_when_flushed(api_client, server, tmp_path):
+    uuids = server.seed_documents(3, StatusDocument.WAITING_QA)
+    integrator, listener = _listener_integrator(api_client, tmp_path)
+    received = []
+    integrator.set_on_documents_handler(lambda status, documents: received.extend(documents), max_size=100)
+    checkpoint = integrator.manager.checkpoint
+
+    listener.poll()
+    assert received == [] and len(checkpoint) == 0
+    # buffered documents are not dispatched a second time
+    listener.poll()
+    integrator.batcher.flush()
+    assert sorted(doc.uuid for doc in received) == sorted(uuids)
+    assert len(checkpoint) == 3
+
+
+def test_async_batch_handler_failure_acknowledges_nothing(api_client, server, tmp_path):
+    import asyncio
+
+    from nebuia_copilot_python.src.listener.async_manager import AsyncListenerManager
+    from nebuia_copilot_python.src.listener.checkpoint import CheckpointStore
+
+    server.seed_documents(2, StatusDocument.WAITING_QA)
+    checkpoint = CheckpointStore(str(tmp_path / "async.db"))
+    manager = AsyncListenerManager(api_client, checkpoint=checkpoint)
+    listener = manager.add_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION, interval=1, limit_documents=10)
+
+    async def failing(status, documents):
+        raise RuntimeError("sink unavailable")
+
+    async def run():
+        manager.semaphore = asyncio.Semaphore(2)
+        manager.set_on_documents_handler(failing)
+        await listener.poll()
+        assert len(checkpoint) == 0
+        manager.set_on_documents_handler(lambda status, documents: None)
+        await listener.poll()
+
+    asyncio.run(run())
+    assert len(checkpoint) == 2
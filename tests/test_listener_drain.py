@@ -0,0 +1,50 @@
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+STATUS = StatusDocument.WAITING_QA
+
+
+def _listener(api_client, moves_documents=True, **options):
+    listener = ThreadedEventBasedListener(api_client, STATUS, BatchType.EXECUTION, interval=60,
+                                          limit_documents=10, **options)
+    handled = []
+
+    def on_document(status, doc):
+        handled.append(doc.uuid)
+        if moves_documents:
+            api_client.set_document_status(doc.uuid, StatusDocument.COMPLETE)
+
+    listener.events.on_document += on_document
+    return listener, handled
+
+
+def test_without_drain_a_cycle_reads_one_page(api_client, server):
+    server.seed_documents(25, STATUS)
+    listener, handled = _listener(api_client)
+    listener.poll()
+    assert len(handled) == 10
+
+
+def test_drain_consumes_the_backlog_in_one_cycle(api_client, server):
+    uuids = server.seed_documents(25, STATUS)
+    listener, handled = _listener(api_client, drain=True)
+    listener.poll()
+    assert sorted(handled) == sorted(uuids)
+
+
+def test_drain_follows_pages_when_documents_stay(api_client, server):
+    uuids = server.seed_documents(25, STATUS)
+    listener, handled = _listener(api_client, moves_documents=False, drain=True)
+    listener.poll()
+    assert sorted(handled) == sorted(uuids)
+
+
+def test_drain_stops_at_max_pages(api_client, server):
+    uuids = server.seed_documents(25, STATUS)
+    listener, handled = _listener(api_client, drain=True, max_pages=2)
+    listener.poll()
+    assert listener.stats.polls == 2
+    assert len(handled) < 25
+    # the rest is picked up by the next cycle
+    listener.poll()
+    assert sorted(handled) == sorted(uuids)
@@ -0,0 +1,54 @@
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.listener.metrics import ListenerMetrics, ListenerStats
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+def test_rate_window_is_pruned_without_reads(monkeypatch):
+    stats = ListenerStats(StatusDocument.WAITING_QA, BatchType.EXECUTION)
+    now = [1000.0]
+    monkeypatch.setattr("nebuia_copilot_python.src.listener.metrics.time.monotonic", lambda: now[0])
+    for _ in range(100):
+        stats.observe_handler(0.001)
+        now[0] += 1.0
+    assert len(stats._recent) <= ListenerStats.RATE_WINDOW + 1
+    assert stats.documents == 100
+
+
+def test_handler_error_is_not_counted_as_poll_error(api_client, server):
+    server.seed_documents(1, StatusDocument.WAITING_QA)
+    listener = ThreadedEventBasedListener(api_client, StatusDocument.WAITING_QA, BatchType.EXECUTION,
+                                          interval=1, limit_documents=10)
+    errors = []
+    listener.events.on_error += errors.append
+
+    def on_document(status, doc):
+        raise RuntimeError("handler broke")
+
+    listener.events.on_document += on_document
+    listener.poll()
+    assert errors == ["handler broke"]
+    assert listener.stats.handler_errors == 1
+    assert listener.stats.poll_errors == 0
+
+
+def test_fetch_failure_is_a_poll_error(api_client, server):
+    server.stop()
+    listener = ThreadedEventBasedListener(api_client, StatusDocument.WAITING_QA, BatchType.EXECUTION,
+                                          interval=1, limit_documents=10)
+    listener.poll()
+    assert listener.stats.poll_errors == 1
+    assert listener.stats.handler_errors == 0
+
+
+def test_prometheus_histograms_are_cumulative():
+    metrics = ListenerMetrics()
+    stats = metrics.for_listener(StatusDocument.WAITING_QA, BatchType.EXECUTION)
+    for seconds in (0.003, 0.02, 0.02, 7.0, 60.0):
+        stats.observe_handler(seconds)
+    text = metrics.render_prometheus()
+    labels = f'status="{StatusDocument.WAITING_QA.value}",batch_type="{BatchType.EXECUTION.value}"'
+    assert f'nebuia_listener_handler_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'nebuia_listener_handler_duration_seconds_bucket{{{labels},le="0.025"}} 3' in text
+    assert f'nebuia_listener_handler_duration_seconds_bucket{{{labels},le="10.0"}} 4' in text
+    assert f'nebuia_listener_handler_duration_seconds_bucket{{{labels},le="+Inf"}} 5' in text
+    assert stats.snapshot()["handler_latency"]["count"] == 5
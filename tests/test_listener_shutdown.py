@@ -0,0 +1,30 @@
+import threading
+
+from nebuia_copilot_python.src.listener.manager import ThreadedEventBasedListener
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+
+def _listener(api_client, **options):
+    return ThreadedEventBasedListener(api_client, StatusDocument.WAITING_QA, BatchType.EXECUTION,
+                                      interval=60, limit_documents=10, **options)
+
+
+def test_setting_stop_flag_stops_the_listener(api_client):
+    listener = _listener(api_client)
+    listener.start()
+    listener.stop_flag = True
+    listener.thread.join(2)
+    assert not listener.thread.is_alive()
+    assert listener.stop_event.is_set()
+
+    listener.stop_flag = False
+    assert not listener.stop_event.is_set() and not listener.stop_flag
+
+
+def test_shared_stop_event_interrupts_the_wait(api_client):
+    stop_event = threading.Event()
+    listener = _listener(api_client, stop_event=stop_event)
+    listener.start()
+    stop_event.set()
+    listener.thread.join(2)
+    assert not listener.thread.is_alive()
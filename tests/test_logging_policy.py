@@ -0,0 +1,35 @@
+import pytest
+from loguru import logger
+
+from nebuia_copilot_python.src import logging_policy
+from nebuia_copilot_python.src.logging_policy import LogPolicy, configure_logging, log_payload
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    monkeypatch.setattr(logging_policy, "policy", LogPolicy())
+    captured = []
+    sink = logger.add(captured.append, level="DEBUG", format="{message}")
+    yield captured
+    logger.remove(sink)
+
+
+def test_payloads_are_capped(messages):
+    configure_logging(max_payload_chars=10)
+    log_payload("response", "x" * 100)
+    assert messages[-1].strip() == f"response: {'x' * 10}... (100 chars)"
+
+
+def test_payloads_are_not_built_below_the_sink_level(messages):
+    configure_logging(level="TRACE")
+    built = []
+    log_payload("response", lambda: built.append(1) or "payload")
+    assert built == [] and messages == []
+
+
+def test_quiet_and_sampling_drop_payloads(messages):
+    configure_logging(quiet=True)
+    log_payload("response", "dropped")
+    configure_logging(quiet=False, sample_rate=0.0)
+    log_payload("response", "dropped")
+    assert messages == []
@@ -0,0 +1,60 @@
+import dataclasses
+import sqlite3
+
+from nebuia_copilot_python.src.models import StatusDocument
+from nebuia_copilot_python.src.sync.mirror import DocumentMirror
+
+
+def test_resync_of_unchanged_documents_writes_nothing(api_client, server, tmp_path):
+    server.seed_documents(5, StatusDocument.COMPLETE)
+    mirror = DocumentMirror(api_client, str(tmp_path / "mirror.db"), page_size=2)
+    assert mirror.sync([StatusDocument.COMPLETE]).changed == 5
+    assert mirror.sync([StatusDocument.COMPLETE]).changed == 0
+    assert mirror.watermark(StatusDocument.COMPLETE)
+    mirror.close()
+
+
+def test_entity_edits_are_mirrored(api_client, server, tmp_path):
+    uuid = server.seed_documents(1, StatusDocument.COMPLETE)[0]
+    mirror = DocumentMirror(api_client, str(tmp_path / "mirror.db"))
+    mirror.sync([StatusDocument.COMPLETE])
+
+    doc = api_client.get_document_by_uuid(uuid)
+    edited = dataclasses.replace(doc.entities[0], value="corrected")
+    doc = dataclasses.replace(doc, entities=[edited] + doc.entities[1:])
+    # same status, reviewed_at and uploaded: only the entity changed
+    assert mirror.upsert([doc]) == 1
+    assert mirror.upsert([doc]) == 0
+    assert mirror.count(entity_key=edited.key, entity_value="corrected") == 1
+    # a listing without entities keeps the mirrored ones
+    assert mirror.upsert([dataclasses.replace(doc, entities=None)]) == 0
+    mirror.close()
+
+
+def test_mirrors_without_entity_hashes_are_migrated(api_client, tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE documents (uuid TEXT PRIMARY KEY, id TEXT, batch_id TEXT, user TEXT, url TEXT, "
+                       "file_name TEXT, type_document TEXT, status_document TEXT, uploaded TEXT, reviewed_at TEXT, "
+                       "source_type TEXT, has_entities INTEGER NOT NULL, synced_at REAL NOT NULL)")
+    connection.commit()
+    connection.close()
+    mirror = DocumentMirror(api_client, path)
+    assert len(mirror) == 0
+    mirror.close()
+
+
+def test_since_watermark_stops_at_pages_older_than_the_previous_pass(api_client, server, tmp_path):
+    uuids = server.seed_documents(6, StatusDocument.COMPLETE)
+    # the listing is newest first: two recent documents, then older ones
+    for index, uuid in enumerate(uuids):
+        stamp = "2030-01-01T00:00:00Z" if index < 2 else "2000-01-01T00:00:00Z"
+        server._documents[uuid].update(reviewed_at=stamp, uploaded=stamp)
+    mirror = DocumentMirror(api_client, str(tmp_path / "mirror.db"), page_size=2)
+    assert mirror.sync([StatusDocument.COMPLETE]).statuses[StatusDocument.COMPLETE.value].pages == 3
+    assert mirror.watermark(StatusDocument.COMPLETE) == "2030-01-01T00:00:00Z"
+
+    result = mirror.sync([StatusDocument.COMPLETE], since_watermark=True).statuses[StatusDocument.COMPLETE.value]
+    assert result.pages == 2 and not result.complete and result.removed == 0
+    assert len(mirror) == 6
+    mirror.close()
@@ -0,0 +1,31 @@
+import threading
+
+import requests
+
+from nebuia_copilot_python.src.mock.server import MockNebuIAServer, MockProfile
+from nebuia_copilot_python.src.models import StatusDocument
+
+
+def test_seeded_documents_are_listed(integrator, server):
+    server.seed_documents(12, StatusDocument.WAITING_QA)
+    response = integrator.get_documents_by_status(StatusDocument.WAITING_QA, page=2, limit=5)
+    assert response.total == 12
+    assert len(response.documents) == 5
+    assert len(response.documents[0].entities) == 3
+
+
+def test_request_counter_is_exact_under_concurrency():
+    with MockNebuIAServer() as server:
+        url = f"{server.url}/integrator/documents/type/all/user"
+        threads = [threading.Thread(target=lambda: [requests.get(url) for _ in range(10)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.requests == 80
+
+
+def test_error_rate_answers_503():
+    with MockNebuIAServer(MockProfile(error_rate=1.0)) as server:
+        response = requests.get(f"{server.url}/integrator/documents/type/all/user")
+        assert response.status_code == 503
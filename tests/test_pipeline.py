@@ -0,0 +1,46 @@
+from nebuia_copilot_python.src.models import File, StatusDocument
+
+
+def _files(count):
+    return [File(b"%PDF-1.4 mock", "mock", f"file_{index}.pdf") for index in range(count)]
+
+
+def test_pipeline_streams_every_processed_document(integrator, server):
+    server.profile.processing_time = 0.1
+    run = integrator.run_batch_pipeline("invoices", _files(5), upload_workers=3, poll_interval=0.02)
+    documents = list(run)
+    assert len(documents) == 5 and len({doc.uuid for doc in documents}) == 5
+    assert all(doc.status_document == StatusDocument.COMPLETE.value for doc in documents)
+    assert len(run.uploads["successful"]) == 5 and run.pending == 0 and not run.timed_out
+    assert run.timings.first_result is not None and run.timings.first_result <= run.timings.total
+
+
+def test_pipeline_stops_at_its_timeout(integrator, server):
+    server.profile.processing_time = 60
+    run = integrator.run_batch_pipeline("slow", _files(2), poll_interval=0.02, timeout=0.1)
+    assert list(run) == []
+    assert run.timed_out and run.pending == 2
+
+
+def test_pipeline_stops_waiting_for_deleted_documents(integrator, server, monkeypatch):
+    server.profile.processing_time = 60
+    client = integrator._api_client
+    process_item = client.process_item
+
+    def process_then_delete(batch_id):
+        triggered = process_item(batch_id=batch_id)
+        for doc in client.get_documents_by_batch(batch_id).documents:
+            client.delete_document_from_batch(doc.uuid)
+        return triggered
+
+    monkeypatch.setattr(client, "process_item", process_then_delete)
+    run = integrator.run_batch_pipeline("deleted", _files(2), poll_interval=0.02)
+    assert list(run) == []
+    assert len(run.missing) == 2 and run.pending == 0 and not run.timed_out
+
+
+def test_pipeline_sleep_never_overshoots_its_timeout(integrator, server):
+    server.profile.processing_time = 60
+    run = integrator.run_batch_pipeline("slow", _files(1), poll_interval=30, timeout=0.1)
+    assert list(run) == []
+    assert run.timed_out and run.timings.collect < 5
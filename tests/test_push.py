@@ -0,0 +1,72 @@
+import threading
+
+from nebuia_copilot_python.src.listener.manager import ThreadedListenerManager
+from nebuia_copilot_python.src.listener.push import PushNotificationReceiver
+from nebuia_copilot_python.src.models import BatchType, StatusDocument
+
+from tests.conftest import wait_until
+
+STATUS = StatusDocument.WAITING_QA
+
+
+def _manager(api_client):
+    manager = ThreadedListenerManager(api_client, handle_signals=False)
+    listener = manager.add_listener(STATUS, BatchType.EXECUTION, interval=60, limit_documents=10)
+    delivered = []
+    listener.events.on_document += lambda status, doc: delivered.append(doc)
+    return manager, listener, delivered
+
+
+def test_notifications_are_deduplicated_and_checked_against_the_status(api_client, server):
+    manager, _, delivered = _manager(api_client)
+    waiting, done = server.seed_documents(1, STATUS)[0], server.seed_documents(1, StatusDocument.COMPLETE)[0]
+    receiver = PushNotificationReceiver(manager)
+    for uuid in (waiting, waiting, done):
+        receiver.submit({"uuid": uuid, "status": STATUS.value})
+    receiver.start()
+    try:
+        assert wait_until(lambda: receiver._queue.empty() and not receiver._queued)
+    finally:
+        receiver.stop()
+    assert [doc.uuid for doc in delivered] == [waiting]
+
+
+def test_embedded_documents_need_a_token_off_loopback(api_client, server):
+    manager, _, delivered = _manager(api_client)
+    uuid = server.seed_documents(1, STATUS)[0]
+    forged = dict(vars(api_client.get_document_by_uuid(uuid)), file_name="forged.pdf", entities=[])
+
+    receiver = PushNotificationReceiver(manager, host="0.0.0.0")
+    assert not receiver.trusts_embedded_documents
+    receiver._dispatch({"uuid": uuid, "status": STATUS.value, "document": forged})
+    assert delivered[-1].file_name != "forged.pdf"
+
+    assert PushNotificationReceiver(manager, host="0.0.0.0", token="secret").trusts_embedded_documents
+    assert PushNotificationReceiver(manager).trusts_embedded_documents
+
+
+def test_push_delivery_waits_for_the_running_poll(api_client, server):
+    manager, listener, _ = _manager(api_client)
+    server.seed_documents(1, STATUS)
+    in_handler, release = threading.Event(), threading.Event()
+    active, overlaps = [0], []
+
+    def on_document(status, doc):
+        active[0] += 1
+        overlaps.append(active[0])
+        in_handler.set()
+        release.wait(5)
+        active[0] -= 1
+
+    listener.events.on_document += on_document
+    poller = threading.Thread(target=listener.poll)
+    poller.start()
+    assert in_handler.wait(5)
+    pusher = threading.Thread(target=listener.deliver, args=(listener.fetch_documents().documents,))
+    pusher.start()
+    pusher.join(0.2)
+    assert pusher.is_alive()
+    release.set()
+    poller.join(5)
+    pusher.join(5)
+    assert overlaps == [1, 1]
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from nebuia_copilot_python.src.listener.scheduler import ListenerScheduler
+
+from tests.conftest import wait_until
+
+
+def test_many_jobs_share_a_single_worker():
+    scheduler = ListenerScheduler(workers=1)
+    runs = {key: 0 for key in range(50)}
+    threads = set()
+
+    def job(key):
+        def run():
+            runs[key] += 1
+            threads.add(threading.current_thread())
+        return run
+
+    scheduler.schedule_spread([(key, 0.05, job(key)) for key in runs], max_spread=0.05)
+    scheduler.start()
+    try:
+        assert wait_until(lambda: all(count >= 2 for count in runs.values()))
+    finally:
+        scheduler.stop(timeout=2)
+    assert len(threads) == 1
+
+
+def test_job_never_overlaps_itself_and_stops_when_cancelled():
+    scheduler = ListenerScheduler(workers=4)
+    active, overlaps, runs = [0], [], []
+
+    def slow():
+        active[0] += 1
+        overlaps.append(active[0])
+        time.sleep(0.03)
+        active[0] -= 1
+        runs.append(time.monotonic())
+
+    scheduler.schedule("slow", 0.0, slow)
+    scheduler.start()
+    try:
+        assert wait_until(lambda: len(runs) >= 5)
+        assert scheduler.cancel("slow")
+        time.sleep(0.05)
+        count = len(runs)
+        time.sleep(0.1)
+        assert len(runs) == count
+    finally:
+        scheduler.stop(timeout=2)
+    assert max(overlaps) == 1
+
+
+def test_at_least_one_worker_is_required():
+    with pytest.raises(ValueError):
+        ListenerScheduler(workers=0)
@@ -0,0 +1,19 @@
+from nebuia_copilot_python.src.models import SearchParameters
+
+SEARCH = SearchParameters(batch="", param="flu", k=3, type_search="literal")
+
+
+def test_queued_brains_get_their_own_deadline(integrator, server):
+    server.profile.latency = 0.1
+    report = integrator._searcher.search_brains(SEARCH, ["a", "b", "c", "d"], deadline=0.25, max_brains_in_flight=1)
+    assert report.timed_out == [] and report.failed == {}
+    assert {hit.brain for hit in report.hits} <= {"a", "b", "c", "d"}
+    assert report.elapsed >= 0.4
+
+
+def test_slow_brains_time_out(integrator, server):
+    server.profile.latency = 0.5
+    report = integrator.search_in_brains(SEARCH, ["a", "b"], deadline=0.1)
+    assert sorted(report.timed_out) == ["a", "b"]
+    assert report.hits == []
+    assert report.elapsed < 0.4
@@ -0,0 +1,43 @@
+from nebuia_copilot_python.src.models import ResultsSearch, Search, SearchParameters
+from nebuia_copilot_python.src.search.cache import SearchCache, normalize_query
+
+
+def test_normalized_queries_share_an_entry_and_smaller_k_is_served(integrator, server):
+    integrator.enable_search_cache()
+    integrator.search_in_brain(SearchParameters(batch="brain", param="Fecha  de PAGÓ", k=5, type_search="literal"))
+    requests_before = server.requests
+    results = integrator.search_in_brain(SearchParameters(batch="brain", param="fecha de pago", k=3, type_search="literal"))
+    assert len(results) == 3
+    assert server.requests == requests_before
+
+
+def test_failed_document_search_is_not_cached(integrator, server):
+    integrator.enable_search_cache()
+    search = Search(uuid="doc", matches="total", max_results=5)
+    server.profile.error_rate = 1.0
+    assert integrator.search_in_document(search).hits == []
+    server.profile.error_rate = 0.0
+    assert len(integrator.search_in_document(search).hits) == 5
+
+
+def test_cached_document_search_keeps_response_metadata(integrator, server):
+    integrator.enable_search_cache()
+    first = integrator.search_in_document(Search(uuid="doc", matches="total", max_results=5))
+    cached = integrator.search_in_document(Search(uuid="doc", matches="total", max_results=3))
+    assert len(cached.hits) == 3
+    assert cached.estimatedTotalHits == first.estimatedTotalHits
+    assert cached.processingTimeMs == first.processingTimeMs
+
+
+def test_empty_brain_search_keeps_the_uncached_return_type(integrator):
+    integrator.enable_search_cache()
+    results = integrator.search_in_brain(SearchParameters(batch="brain", param="nothing", k=0, type_search="literal"))
+    assert isinstance(results, ResultsSearch) and results.results == []
+
+
+def test_cache_never_stores_empty_results():
+    cache = SearchCache()
+    key = SearchCache.key("brain", "b", "q")
+    cache.put(key, 5, [])
+    assert cache.get(key, 5) is None
+    assert normalize_query(" Ñandú  ROJO ") == "nandu rojo"
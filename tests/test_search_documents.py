@@ -0,0 +1,27 @@
+import pytest
+
+from nebuia_copilot_python.src.models import StatusDocument
+
+
+def test_hits_are_merged_by_relevance_across_documents(integrator, server):
+    uuids = server.seed_documents(4, StatusDocument.COMPLETE)
+    hits = integrator.search_in_documents("total", uuids=uuids, top_k=5)
+    assert len(hits) == 5
+    assert [hit.relevance for hit in hits] == sorted((hit.relevance for hit in hits), reverse=True)
+    assert {hit.uuid for hit in hits} <= set(uuids)
+
+
+def test_max_results_stops_early(integrator, server):
+    uuids = server.seed_documents(20, StatusDocument.COMPLETE)
+    requests_before = server.requests
+    hits = integrator.search_in_documents("total", uuids=uuids, max_results=3, per_document=3)
+    assert len(hits) == 3
+    assert server.requests - requests_before < 20
+
+
+def test_zero_results_requested(integrator, server):
+    uuids = server.seed_documents(2, StatusDocument.COMPLETE)
+    assert integrator.search_in_documents("total", uuids=uuids, top_k=0) == []
+    assert integrator.search_in_documents("total", uuids=uuids, max_results=0) == []
+    with pytest.raises(ValueError):
+        integrator.search_in_documents("total", uuids=uuids, top_k=-1)
@@ -0,0 +1,22 @@
+from nebuia_copilot_python.src.models import Result, SearchParameters
+from nebuia_copilot_python.src.search.searcher import merge_results
+
+
+def _result(uuid, score, source=1):
+    return Result(uuid=uuid, content=uuid, name=None, source=source, coincidences=0, score=score)
+
+
+def test_merge_keeps_the_best_copy_of_each_result():
+    merged = merge_results([[_result("a", 0.2), _result("b", 0.5)],
+                            [_result("a", 0.9), _result("a", 0.1, source=2)]], top_k=2)
+    assert [(result.uuid, result.score) for result in merged] == [("a", 0.9), ("b", 0.5)]
+
+
+def test_many_searches_match_the_sequential_merge(integrator):
+    searches = [SearchParameters(batch="brain", param=param, k=4, type_search=kind)
+                for param, kind in (("flu", "semantic"), ("fever", "literal"), ("cough", "semantic"))]
+    # search_in_brain returns the list of results itself
+    sequential = merge_results([integrator.search_in_brain(search) for search in searches], top_k=5)
+    concurrent = integrator.search_in_brain_many(searches, top_k=5).results
+    assert concurrent == sequential
+    assert [result.score for result in concurrent] == sorted((result.score for result in concurrent), reverse=True)
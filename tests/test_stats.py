@@ -0,0 +1,26 @@
+from nebuia_copilot_python.src.models import StatusDocument
+from nebuia_copilot_python.src.tracing import CallbackTracer
+
+
+def test_stats_are_off_by_default(integrator, api_client):
+    integrator.get_documents_by_status(StatusDocument.COMPLETE)
+    assert api_client.tracer is None
+    assert integrator.stats() == {}
+
+
+def test_enabled_stats_and_tracer_both_see_every_call(integrator, api_client):
+    integrator.enable_stats()
+    spans = []
+    integrator.set_tracer(CallbackTracer(on_end=spans.append))
+    for _ in range(3):
+        integrator.get_documents_by_status(StatusDocument.COMPLETE)
+
+    stats = integrator.stats(reset=True)["get_documents_by_status"]
+    assert stats["calls"] == 3 and stats["errors"] == 0
+    assert stats["latency"]["count"] == 3
+    assert len(spans) == 3
+    assert integrator.stats() == {}
+
+    integrator.disable_stats()
+    integrator.set_tracer(None)
+    assert api_client.tracer is None
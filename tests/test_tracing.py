@@ -0,0 +1,47 @@
+import pytest
+import requests
+
+from nebuia_copilot_python.src.models import BatchType, File, StatusDocument
+from nebuia_copilot_python.src.tracing import PHASES, CallbackTracer
+
+
+@pytest.fixture
+def spans(integrator):
+    collected = []
+    integrator.set_tracer(CallbackTracer(on_end=collected.append))
+    yield collected
+    integrator.set_tracer(None)
+
+
+def test_span_phases_add_up_to_the_call(integrator, server, spans):
+    server.seed_documents(3, StatusDocument.COMPLETE)
+    integrator.get_documents_by_status(StatusDocument.COMPLETE)
+    span = spans[-1]
+    assert span.name == "get_documents_by_status"
+    assert span.status_code == 200 and span.requests == 1 and span.response_bytes > 0
+    assert set(span.phases) == set(PHASES)
+    assert sum(span.phases.values()) == pytest.approx(span.duration, rel=0.05, abs=1e-4)
+
+
+def test_nested_calls_get_a_parent_span(integrator, spans):
+    _, batch_id = integrator.create_batch("traced", BatchType.EXECUTION)
+    integrator.append_to_batch(batch_id, [File(b"%PDF-1.4", "mock", "file.pdf")])
+    upload = next(span for span in spans if span.name == "_upload_file")
+    assert upload.parent is not None and upload.parent.name == "append_job"
+    assert upload.request_bytes > 0
+
+
+def test_failed_calls_record_the_error(integrator, server, spans):
+    server.stop()
+    with pytest.raises(requests.RequestException):
+        integrator.get_documents_by_status(StatusDocument.COMPLETE)
+    assert isinstance(spans[-1].error, requests.RequestException)
+
+
+def test_untraced_calls_skip_the_traced_path(integrator, api_client, monkeypatch):
+    calls = []
+    original = api_client.transport.request
+    monkeypatch.setattr(api_client.transport, "request",
+                        lambda method, url, **kwargs: calls.append(kwargs) or original(method, url, **kwargs))
+    integrator.get_documents_by_status(StatusDocument.COMPLETE)
+    assert "stream" not in calls[-1]
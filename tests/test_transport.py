@@ -0,0 +1,34 @@
+import json
+
+from nebuia_copilot_python.src.models import SearchParameters, StatusDocument
+from nebuia_copilot_python.src.transport import RecordingTransport, ReplayTransport
+
+
+def _search(integrator, param):
+    return integrator.search_in_brain(SearchParameters(batch="brain", param=param, k=3, type_search="literal"))
+
+
+def test_replay_tells_request_bodies_apart(integrator, server, tmp_path):
+    cassette = str(tmp_path / "traffic.jsonl.gz")
+    server.seed_documents(2, StatusDocument.COMPLETE)
+    with RecordingTransport(cassette) as recorder:
+        integrator.set_transport(recorder)
+        recorded = {param: _search(integrator, param) for param in ("flu", "fever")}
+        listing = integrator.get_documents_by_status(StatusDocument.COMPLETE)
+    server.stop()
+
+    integrator.set_transport(ReplayTransport(cassette, time_scale=0))
+    # replayed in the reverse order: each body gets its own response
+    for param in ("fever", "flu"):
+        assert _search(integrator, param) == recorded[param]
+    assert integrator.get_documents_by_status(StatusDocument.COMPLETE) == listing
+
+
+def test_cassette_separates_download_time(api_client, server, tmp_path):
+    cassette = tmp_path / "traffic.jsonl"
+    with RecordingTransport(str(cassette)) as recorder:
+        api_client.set_transport(recorder)
+        api_client.get_documents_by_status(StatusDocument.COMPLETE)
+    entry = json.loads(cassette.read_text())
+    assert entry["request_sha1"] is None
+    assert 0 <= entry["download"] <= entry["elapsed"]